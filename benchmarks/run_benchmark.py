@@ -0,0 +1,253 @@
+"""
+AI News Bot Benchmark - 로컬 스텁 서버로 수집 → 분석 → 전송 처리량 측정
+
+외부 네트워크 없이 합성 RSS/Atom 피드, Gemini, 텔레그램 스텁을 띄워
+단계별(수집/분석/전송) 실행 시간, 요청 지연 백분위수, 초당 처리 뉴스 수를 소스 수별로 보고한다.
+
+사용법:
+    python benchmarks/run_benchmark.py                          # 50, 500개 소스
+    python benchmarks/run_benchmark.py --sources 50 500 5000    # 5000개는 오래 걸리므로 직접 지정
+    python benchmarks/run_benchmark.py --sources 50 --flows     # run_realtime/batch/daily 전체 흐름 포함
+    python benchmarks/run_benchmark.py --gemini-429 0.05 --real-limits
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from stub_servers import FeedServer, GeminiStub, TelegramStub
+
+CATEGORIES = ["official", "research", "media", "community", "korean"]
+
+
+class RequestRecorder:
+    """공유 세션의 response 훅으로 요청별 지연을 단계(feed/gemini/telegram)로 나눠 기록"""
+
+    def __init__(self, gemini_port: int, telegram_port: int):
+        self.gemini_port = gemini_port
+        self.telegram_port = telegram_port
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def hook(self, response, *args, **kwargs):
+        port = response.request.url.split("/")[2].rsplit(":", 1)[-1]
+        if port == str(self.gemini_port):
+            kind = "gemini"
+        elif port == str(self.telegram_port):
+            kind = "telegram"
+        else:
+            kind = "feed"
+        self.samples[kind].append(response.elapsed.total_seconds() * 1000)
+
+    def take(self) -> Dict[str, List[float]]:
+        samples, self.samples = self.samples, defaultdict(list)
+        return samples
+
+
+def lift_limits(config):
+    """스텁은 요금제 한도가 없으므로 처리량 측정을 막는 한도/예산을 해제 (--real-limits면 그대로)"""
+    config.GEMINI_REQUESTS_PER_MINUTE = 1_000_000
+    config.GEMINI_TOKENS_PER_MINUTE = 10 ** 12
+    config.ANALYSIS_TIME_BUDGET = 0
+    config.ANALYSIS_CALL_BUDGET = 0
+    config.GEMINI_DAILY_CALL_CAP = 0
+    config.GEMINI_WEEKLY_CALL_CAP = 0
+    config.GEMINI_DAILY_TOKEN_CAP = 0
+    config.GEMINI_SCORE_REQUESTS_PER_MINUTE = 1_000_000
+    config.GEMINI_SCORE_DAILY_CALL_CAP = 0
+    config.TELEGRAM_GLOBAL_PER_SECOND = 1_000_000
+    config.TELEGRAM_PER_CHAT_INTERVAL = 0
+    config.TELEGRAM_GROUP_PER_MINUTE = 1_000_000
+
+
+def make_sources(feeds: FeedServer, count: int, hosts: int):
+    from config import NewsSource
+
+    return [
+        NewsSource(
+            name=f"Bench {i}",
+            url=feeds.url_for(i, hosts),
+            source_type="rss",
+            base_trust=5 + i % 6,
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+        for i in range(count)
+    ]
+
+
+@contextlib.contextmanager
+def fresh_workdir():
+    """실행마다 빈 data/ 디렉토리 (seen 상태, 캐시가 결과에 영향을 주지 않도록)"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="ainews-bench-") as tmp:
+        os.chdir(tmp)
+        try:
+            yield tmp
+        finally:
+            os.chdir(cwd)
+
+
+@contextlib.contextmanager
+def quiet(verbose: bool):
+    if verbose:
+        yield
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+
+
+def stage_row(stage: str, seconds: float, items: int, samples: List[float]) -> dict:
+    # src 모듈은 config가 스텁 주소를 읽은 뒤에 import
+    from run_metrics import percentile
+
+    return {
+        "stage": stage,
+        "seconds": round(seconds, 3),
+        "items": items,
+        "items_per_sec": round(items / seconds, 1) if seconds > 0 else 0.0,
+        "requests": len(samples),
+        "p50_ms": round(percentile(samples, 50), 1),
+        "p95_ms": round(percentile(samples, 95), 1),
+        "p99_ms": round(percentile(samples, 99), 1),
+    }
+
+
+def bench_stages(sources, recorder: RequestRecorder, verbose: bool) -> List[dict]:
+    """NewsCollector.collect_all → AIAnalyzer.analyze_batch → TelegramBot.send_batch_news"""
+    from news_collector import NewsCollector
+    from ai_analyzer import AIAnalyzer
+    from telegram_bot import TelegramBot
+
+    rows = []
+    with fresh_workdir(), quiet(verbose):
+        collector = NewsCollector(cache_dir="data")
+        recorder.take()
+
+        started = time.perf_counter()
+        items = collector.collect_all(sources)
+        rows.append(stage_row("collect", time.perf_counter() - started, len(items), recorder.take()["feed"]))
+
+        analyzer = AIAnalyzer(cache_dir="data", mode="bench")
+        started = time.perf_counter()
+        selected, _ = analyzer.triage(items)
+        analyzed = analyzer.analyze_batch(selected)
+        rows.append(stage_row("analyze", time.perf_counter() - started, len(analyzed), recorder.take()["gemini"]))
+
+        bot = TelegramBot(cache_dir="data")
+        started = time.perf_counter()
+        bot.send_batch_news(analyzed, "벤치마크")
+        rows.append(stage_row("send", time.perf_counter() - started, len(analyzed), recorder.take()["telegram"]))
+
+        collector.close()
+    return rows
+
+
+def bench_flows(sources, items_per_feed: int, recorder: RequestRecorder, verbose: bool) -> List[dict]:
+    """main.run_realtime / run_batch / run_daily 전체 흐름 (건수는 받아온 피드 항목 수)"""
+    import config
+    import main
+
+    config.NEWS_SOURCES[:] = sources
+    rows = []
+    for name, run in (("run_realtime", main.run_realtime), ("run_batch", main.run_batch), ("run_daily", main.run_daily)):
+        with fresh_workdir(), quiet(verbose):
+            recorder.take()
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+        samples = recorder.take()
+        all_samples = samples["feed"] + samples["gemini"] + samples["telegram"]
+        rows.append(stage_row(name, elapsed, len(samples["feed"]) * items_per_feed, all_samples))
+    return rows
+
+
+def print_table(title: str, rows: List[dict]):
+    print(f"\n{title}")
+    print(f"  {'stage':<13}{'sec':>9}{'items':>8}{'items/s':>10}{'reqs':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    for row in rows:
+        print(
+            f"  {row['stage']:<13}{row['seconds']:>9.2f}{row['items']:>8}{row['items_per_sec']:>10.1f}"
+            f"{row['requests']:>8}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI News Bot offline benchmark")
+    parser.add_argument("--sources", type=int, nargs="+", default=[50, 500], help="측정할 소스 수 (5000 등 큰 값은 직접 지정)")
+    parser.add_argument("--hosts", type=int, default=0, help="피드를 나눠 둘 호스트 수 (0이면 소스마다 다른 호스트)")
+    parser.add_argument("--items-per-feed", type=int, default=10, help="피드당 뉴스 수")
+    parser.add_argument("--feed-latency", type=float, default=50, help="피드 응답 지연 평균 (ms)")
+    parser.add_argument("--feed-jitter", type=float, default=50, help="피드 응답 지연 편차 (ms)")
+    parser.add_argument("--atom-ratio", type=float, default=0.2, help="Atom 피드 비율")
+    parser.add_argument("--gemini-latency", type=float, default=300, help="Gemini 응답 지연 (ms)")
+    parser.add_argument("--gemini-429", type=float, default=0.0, help="Gemini 429 응답 비율 (0-1)")
+    parser.add_argument("--telegram-latency", type=float, default=50, help="텔레그램 응답 지연 (ms)")
+    parser.add_argument("--flows", action="store_true", help="run_realtime/batch/daily 전체 흐름도 측정")
+    parser.add_argument("--real-limits", action="store_true", help="config의 호출/할당량/전송 한도를 그대로 적용")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--verbose", action="store_true", help="봇 출력 표시")
+    args = parser.parse_args()
+
+    feeds = FeedServer(args.items_per_feed, args.feed_latency, args.feed_jitter, args.atom_ratio).start()
+    gemini = GeminiStub(args.gemini_latency, args.gemini_429).start()
+    telegram = TelegramStub(args.telegram_latency).start()
+
+    # config는 import 시점에 환경 변수를 읽으므로 다른 모듈보다 먼저 설정
+    os.environ.update({
+        "GEMINI_API_KEY": "bench",
+        "TELEGRAM_BOT_TOKEN": "bench",
+        "TELEGRAM_CHAT_ID": "1",
+        "GEMINI_API_BASE": gemini.base_url,
+        "TELEGRAM_API_BASE": telegram.base_url,
+    })
+    import config
+    if not args.real_limits:
+        lift_limits(config)
+
+    from http_client import get_session
+    recorder = RequestRecorder(gemini.port, telegram.port)
+    get_session().hooks["response"].append(recorder.hook)
+
+    print("🏁 오프라인 벤치마크")
+    print(
+        f"   피드 {args.items_per_feed}개/소스, 지연 {args.feed_latency:.0f}±{args.feed_jitter:.0f}ms | "
+        f"Gemini {args.gemini_latency:.0f}ms, 429 {args.gemini_429:.0%} | 텔레그램 {args.telegram_latency:.0f}ms | "
+        f"한도 {'config 그대로' if args.real_limits else '해제'}"
+    )
+
+    results = []
+    try:
+        for count in args.sources:
+            sources = make_sources(feeds, count, args.hosts or count)
+            rows = bench_stages(sources, recorder, args.verbose)
+            if args.flows:
+                rows += bench_flows(sources, args.items_per_feed, recorder, args.verbose)
+            print_table(f"📊 소스 {count}개", rows)
+            results.append({"sources": count, "stages": rows})
+    finally:
+        feeds.stop()
+        gemini.stop()
+        telegram.stop()
+
+    print(
+        f"\n   스텁 요청: 피드 {feeds.requests}회, Gemini {gemini.requests}회 (429 {gemini.throttled}회), "
+        f"텔레그램 메시지 {telegram.messages}개"
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 {args.json} 저장")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Benchmark Stub Servers - 실제 피드/Gemini/텔레그램 대신 쓰는 로컬 HTTP 서버
+
+    FeedServer     : 소스별 합성 RSS/Atom 피드 (피드 크기, 응답 지연 설정)
+    GeminiStub     : generateContent 흉내 (응답 지연, 429 주입)
+    TelegramStub   : sendMessage / getMe 수신 (응답 지연)
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape
+
+# 합성 제목용 어휘 (주제 틀만 정하고, 기사마다 고유한 코드명/요약 단어로 근접 중복을 피함)
+_SUBJECTS = [
+    "OpenAI", "Anthropic", "Google DeepMind", "Meta AI", "Mistral", "NVIDIA", "Microsoft",
+    "Hugging Face", "Stability AI", "Cohere", "xAI", "Apple", "Amazon", "Baidu", "Alibaba",
+    "researchers", "a startup", "the EU", "regulators", "an open-source team",
+]
+_VERBS = [
+    "releases", "announces", "open-sources", "benchmarks", "acquires", "delays", "previews",
+    "publishes", "updates", "launches", "cuts prices for", "partners on", "investigates",
+]
+_OBJECTS = [
+    "a new model", "GPT-5", "an agent framework", "a reasoning benchmark", "a vision encoder",
+    "inference chips", "a safety report", "a coding assistant", "a speech model", "an API",
+    "a training dataset", "a robotics policy", "a long-context model", "a fine-tuning service",
+]
+_DETAILS = [
+    "for enterprises", "with 1M context", "on mobile", "in Europe", "for researchers",
+    "with lower latency", "after criticism", "ahead of schedule", "for education",
+    "with tool use", "in beta", "at half the cost", "for healthcare", "under new license",
+]
+_SYLLABLES = [
+    "ka", "lo", "mi", "ru", "te", "vo", "zan", "bel", "dor", "fi",
+    "gu", "hen", "ji", "nor", "pa", "qui", "sol", "tam", "ux", "wey",
+]
+
+
+def _rng(*seed) -> random.Random:
+    return random.Random(zlib.crc32(repr(seed).encode()))
+
+
+def _codename(number: int) -> str:
+    """번호를 음절로 바꾼 고유 이름 (번호가 다르면 이름도 다름)"""
+    syllables = []
+    while True:
+        number, digit = divmod(number, len(_SYLLABLES))
+        syllables.append(_SYLLABLES[digit])
+        if not number:
+            break
+    return "".join(syllables).capitalize()
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(3))
+
+
+class _StubServer:
+    """ThreadingHTTPServer를 백그라운드 스레드로 띄우는 공통 부분"""
+
+    def __init__(self, handler_cls, host: str = "127.0.0.1"):
+        handler = type(handler_cls.__name__, (handler_cls,), {"stub": self})
+        ThreadingHTTPServer.request_queue_size = 256
+        self.server = ThreadingHTTPServer((host, 0), handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self):
+        with self.lock:
+            self.requests += 1
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로 Nagle + delayed ACK로 응답마다 ~40ms가 더해지지 않게 함
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+
+# === RSS / Atom ===
+
+class _FeedHandler(_QuietHandler):
+    def do_GET(self):
+        stub: FeedServer = self.stub
+        stub.count()
+
+        # /feed/<번호>.xml (RSS) 또는 /feed/<번호>.atom (Atom)
+        path = urlparse(self.path).path
+        try:
+            name = path.rsplit("/", 1)[1]
+            index = int(name.split(".")[0])
+        except (IndexError, ValueError):
+            self._send(404, b"not found", "text/plain")
+            return
+
+        time.sleep(stub.latency_for(index))
+        body = stub.render(index, atom=name.endswith(".atom"))
+        self._send(200, body, "application/atom+xml" if name.endswith(".atom") else "application/rss+xml")
+
+
+class FeedServer(_StubServer):
+    """소스 번호별로 항상 같은 내용을 돌려주는 합성 피드 서버
+
+    모든 인터페이스(0.0.0.0)에 바인딩하므로 127.0.x.y 주소로 소스마다 다른 호스트를 흉내낼 수 있다.
+    """
+
+    def __init__(self, items_per_feed: int = 10, latency_ms: float = 50, jitter_ms: float = 50,
+                 atom_ratio: float = 0.2):
+        super().__init__(_FeedHandler, host="")
+        self.items_per_feed = items_per_feed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.atom_ratio = atom_ratio
+        self.generated_at = datetime.now(timezone.utc)
+
+    def url_for(self, index: int, hosts: int) -> str:
+        """index번 소스의 URL (hosts개 루프백 주소에 나눠 배치)"""
+        host_index = index % max(1, hosts)
+        host = f"127.0.{host_index // 254}.{host_index % 254 + 1}"
+        ext = "atom" if _rng("atom", index).random() < self.atom_ratio else "xml"
+        return f"http://{host}:{self.port}/feed/{index}.{ext}"
+
+    def latency_for(self, index: int) -> float:
+        return max(0.0, self.latency_ms + random.uniform(-1, 1) * self.jitter_ms) / 1000
+
+    def _entries(self, index: int):
+        rng = _rng("feed", index)
+        for n in range(self.items_per_feed):
+            # 고유명사 코드명은 제목 비교에서, 요약의 임의 단어는 SimHash 비교에서 다른 기사로 구분됨
+            codename = _codename(index * self.items_per_feed + n)
+            title = (
+                f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} "
+                f"{codename} {rng.choice(_DETAILS)}"
+            )
+            summary = f"{codename}: " + " ".join(_pseudo_word(rng) for _ in range(20))
+            published = self.generated_at - timedelta(minutes=rng.randint(0, 360))
+            yield f"https://example.com/s{index}/post-{n}", title, summary, published
+
+    def render(self, index: int, atom: bool = False) -> bytes:
+        entries = list(self._entries(index))
+        if atom:
+            body = "".join(
+                f"<entry><title>{escape(title)}</title><link href=\"{link}\"/>"
+                f"<id>{link}</id><updated>{published.isoformat()}</updated>"
+                f"<summary>{escape(summary)}</summary></entry>"
+                for link, title, summary, published in entries
+            )
+            xml = (
+                f"<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+                f"<feed xmlns=\"http://www.w3.org/2005/Atom\"><title>Bench {index}</title>{body}</feed>"
+            )
+        else:
+            body = "".join(
+                f"<item><title>{escape(title)}</title><link>{link}</link><guid>{link}</guid>"
+                f"<pubDate>{format_datetime(published)}</pubDate>"
+                f"<description>{escape(summary)}</description></item>"
+                for link, title, summary, published in entries
+            )
+            xml = (
+                f"<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+                f"<rss version=\"2.0\"><channel><title>Bench {index}</title>{body}</channel></rss>"
+            )
+        return xml.encode("utf-8")
+
+
+# === Gemini generateContent ===
+
+class _GeminiHandler(_QuietHandler):
+    def do_POST(self):
+        stub: GeminiStub = self.stub
+        stub.count()
+        body = self._read_json()
+        time.sleep(stub.latency_ms / 1000)
+
+        if stub.throttle_ratio and random.random() < stub.throttle_ratio:
+            with stub.lock:
+                stub.throttled += 1
+            error = json.dumps({"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}).encode()
+            self._send(429, error, "application/json", {"Retry-After": str(stub.retry_after)})
+            return
+
+        prompt = body["contents"][0]["parts"][0]["text"]
+        text = stub.reply(prompt, body.get("generationConfig", {}).get("responseSchema"))
+        tokens_in = len(prompt) // 4
+        tokens_out = len(text) // 4
+        data = json.dumps({
+            "candidates": [{"content": {"parts": [{"text": text}]}}],
+            "usageMetadata": {
+                "promptTokenCount": tokens_in,
+                "candidatesTokenCount": tokens_out,
+                "totalTokenCount": tokens_in + tokens_out,
+            },
+        }, ensure_ascii=False).encode("utf-8")
+        self._send(200, data, "application/json")
+
+
+class GeminiStub(_StubServer):
+    """프롬프트의 id별로 결정적인 점수와 한국어 흉내 요약을 돌려주는 generateContent"""
+
+    SUMMARY = "벤치마크용 합성 요약입니다. 실제 분석 결과가 아니며 길이 검증을 통과하도록 충분히 깁니다."
+
+    def __init__(self, latency_ms: float = 300, throttle_ratio: float = 0.0, retry_after: int = 1):
+        super().__init__(_GeminiHandler)
+        self.latency_ms = latency_ms
+        self.throttle_ratio = throttle_ratio
+        self.retry_after = retry_after
+        self.throttled = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1beta"
+
+    @staticmethod
+    def score_for(key: str) -> int:
+        # 대부분 5-7점, 일부만 8점 이상 (실제 분포와 비슷하게)
+        return _rng("score", key).choices(range(1, 11), weights=[2, 4, 8, 10, 16, 18, 16, 12, 8, 6])[0]
+
+    def reply(self, prompt: str, schema: Optional[dict]) -> str:
+        ids = []
+        for line in prompt.splitlines():
+            line = line.strip()
+            if line.startswith("{") and '"id"' in line:
+                try:
+                    ids.append(str(json.loads(line)["id"]))
+                except (ValueError, KeyError):
+                    pass
+
+        is_array = (schema or {}).get("type") == "ARRAY" or (schema is None and "JSON 배열" in prompt)
+        if is_array:
+            properties = (schema or {}).get("items", {}).get("properties", {})
+            score_only = "korean_title" not in properties if schema else "korean_title" not in prompt
+            if score_only:
+                return json.dumps([{"id": i, "importance_score": self.score_for(i)} for i in ids])
+            return json.dumps([
+                {"id": i, "korean_title": f"합성 제목 {i[:8]}", "korean_summary": self.SUMMARY,
+                 "importance_score": self.score_for(i), "reason": "벤치마크"}
+                for i in ids
+            ], ensure_ascii=False)
+
+        if schema is not None or "importance_score" in prompt:
+            return json.dumps({
+                "korean_title": "합성 제목", "korean_summary": self.SUMMARY,
+                "importance_score": self.score_for(prompt), "reason": "벤치마크",
+            }, ensure_ascii=False)
+
+        return f"제목: 합성 번역 제목\n요약: {self.SUMMARY}"
+
+
+# === Telegram Bot API ===
+
+class _TelegramHandler(_QuietHandler):
+    def _reply(self, result: dict):
+        self.stub.count()
+        time.sleep(self.stub.latency_ms / 1000)
+        self._send(200, json.dumps({"ok": True, "result": result}).encode(), "application/json")
+
+    def do_GET(self):
+        if self.path.endswith("/getMe"):
+            self._reply({"id": 1, "is_bot": True, "username": "bench_bot"})
+        else:
+            self._send(404, b"{}", "application/json")
+
+    def do_POST(self):
+        body = self._read_json()
+        if self.path.endswith("/sendMessage"):
+            with self.stub.lock:
+                self.stub.messages += 1
+                self.stub.characters += len(body.get("text", ""))
+            self._reply({"message_id": self.stub.messages})
+        else:
+            self._send(404, b"{}", "application/json")
+
+
+class TelegramStub(_StubServer):
+    """보낸 메시지 수만 세는 텔레그램 Bot API"""
+
+    def __init__(self, latency_ms: float = 50):
+        super().__init__(_TelegramHandler)
+        self.latency_ms = latency_ms
+        self.messages = 0
+        self.characters = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
@@ -4,12 +4,72 @@ AI Analyzer - Gemini API를 사용한 뉴스 분석 및 요약
 import requests
 import json
 import re
+import threading
 import time
-from typing import List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
 from dataclasses import dataclass
 
-from config import GEMINI_API_KEY, Priority, HIGH_IMPORTANCE_KEYWORDS
+from config import (
+    GEMINI_API_KEY, Priority, ANALYSIS_BATCH_SIZE,
+    GEMINI_REQUESTS_PER_MINUTE, GEMINI_TOKENS_PER_MINUTE,
+    GEMINI_MAX_CONCURRENCY, GEMINI_MAX_RETRIES, GEMINI_STRUCTURED_OUTPUT,
+    TRIAGE_MIN_SCORE, TRIAGE_CATEGORY_ADJUST, TRIAGE_STALE_HOURS, TRIAGE_STALE_PENALTY,
+    ANALYSIS_TIME_BUDGET, ANALYSIS_CALL_BUDGET, QUOTA_RESERVED_MIN_TRUST,
+    GEMINI_TIMEOUT, GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_WINDOW, GEMINI_BREAKER_RESET,
+    GEMINI_API_BASE, GEMINI_MODEL, MODEL_CASCADE, GEMINI_SCORE_MODEL, CASCADE_MIN_SCORE,
+    CASCADE_SCORE_BATCH_SIZE, GEMINI_SCORE_REQUESTS_PER_MINUTE,
+)
 from news_collector import NewsItem
+from analysis_cache import AnalysisCache
+from keyword_rules import RULE_ENGINE
+from rate_limiter import RateLimiter, parse_retry_after
+from http_client import get_session
+from quota_budget import QuotaBudget
+from circuit_breaker import CircuitBreaker
+from run_metrics import METRICS
+
+# 프롬프트나 점수 기준을 바꾸면 올려서 기존 분석 캐시를 무효화
+PROMPT_VERSION = "v1"
+
+IMPORTANCE_CRITERIA = """**중요도 기준**:
+- 9-10: 주요 AI 기업의 새 모델 출시, 획기적인 연구 발표, 중요 정책/규제
+- 7-8: 주목할 만한 기술 발전, 주요 인물의 중요 발언
+- 5-6: 일반적인 업계 뉴스, 흥미로운 연구
+- 3-4: 사소한 업데이트, 일상적인 뉴스
+- 1-2: 광고성, 반복적인 내용"""
+
+# Gemini responseSchema (OpenAPI 스키마 부분집합)
+ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "korean_title": {"type": "STRING"},
+        "korean_summary": {"type": "STRING"},
+        "importance_score": {"type": "INTEGER"},
+        "reason": {"type": "STRING"}
+    },
+    "required": ["korean_title", "korean_summary", "importance_score", "reason"]
+}
+
+SCORE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"id": {"type": "STRING"}, "importance_score": {"type": "INTEGER"}},
+        "required": ["id", "importance_score"]
+    }
+}
+
+BATCH_ANALYSIS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"id": {"type": "STRING"}, **ANALYSIS_SCHEMA["properties"]},
+        "required": ["id"] + ANALYSIS_SCHEMA["required"]
+    }
+}
 
 
 @dataclass
@@ -24,56 +84,165 @@ class AnalyzedNews:
 
 
 class AIAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_dir: str = "data", mode: str = "manual"):
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다")
         
         self.api_key = GEMINI_API_KEY
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.api_key}"
+        self.api_url = self._model_url(GEMINI_MODEL)
+        self.score_model = GEMINI_SCORE_MODEL or GEMINI_MODEL
+        self.score_api_url = self._model_url(self.score_model)
+        self.cache = AnalysisCache(cache_dir=cache_dir, prompt_version=PROMPT_VERSION)
+        self.session = get_session()
+        self.budget = QuotaBudget(cache_dir=cache_dir, mode=mode)
+        self.breaker = CircuitBreaker(GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_WINDOW, GEMINI_BREAKER_RESET)
+        self.rate_limiter = RateLimiter(
+            GEMINI_REQUESTS_PER_MINUTE,
+            GEMINI_TOKENS_PER_MINUTE,
+            GEMINI_MAX_CONCURRENCY
+        )
+        # 점수 전용 모델이 따로 있으면 분당/일일 한도도 모델별이므로 따로 계산
+        self.separate_score_quota = self.score_model != GEMINI_MODEL
+        self.score_rate_limiter = RateLimiter(
+            GEMINI_SCORE_REQUESTS_PER_MINUTE,
+            GEMINI_TOKENS_PER_MINUTE,
+            GEMINI_MAX_CONCURRENCY
+        ) if self.separate_score_quota else self.rate_limiter
+        # 느린 경로(JSON 복구, 재번역, 기본값) 발생 횟수
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        # analyze_batch 실행 예산 (시간/호출 수)과 예산 초과로 이월된 뉴스
+        self._deadline: Optional[float] = None
+        self._call_limit: Optional[int] = None
+        self.deferred: List[NewsItem] = []
+        # MODEL_CASCADE에서 점수만 평가된 뉴스 (전송 전에 complete()로 전체 분석)
+        self.score_only: Set[str] = set()
     
-    def _check_keyword_importance(self, text: str) -> int:
-        """키워드 기반 중요도 보너스"""
-        text_lower = text.lower()
-        bonus = 0
-        
-        for keyword in HIGH_IMPORTANCE_KEYWORDS:
-            if keyword.lower() in text_lower:
-                bonus += 1
-        
-        return min(bonus, 3)
+    def _model_url(self, model: str) -> str:
+        return f"{GEMINI_API_BASE}/models/{model}:generateContent?key={self.api_key}"
     
-    def _call_gemini(self, prompt: str) -> Optional[str]:
-        """Gemini API 호출"""
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def _check_keyword_importance(self, news: NewsItem) -> float:
+        """키워드 규칙 기반 중요도 보너스 (최대 3)"""
+        result = RULE_ENGINE.evaluate(
+            f"{news.title} {news.summary}",
+            news.source_name,
+            news.category
+        )
+        return min(result.boost, 3)
+    
+    def _call_gemini(
+        self,
+        prompt: str,
+        max_output_tokens: int = 1000,
+        response_schema: Optional[dict] = None,
+        tier: str = "full",
+        item_ids: Optional[List[str]] = None,
+        reserved: bool = False
+    ) -> Optional[str]:
+        """Gemini API 호출 (response_schema가 있으면 JSON 구조화 출력, tier="score"면 점수 전용 모델)
+        
+        item_ids는 실행 지표에서 호출 지연/토큰을 뉴스별로 나눠 기록할 때 사용
+        reserved=True(실시간 알림 후보만 담은 호출)만 할당량 예약분을 쓸 수 있음
+        """
         payload = {
             "contents": [
                 {"parts": [{"text": prompt}]}
             ],
             "generationConfig": {
                 "temperature": 0.2,
-                "maxOutputTokens": 1000
+                "maxOutputTokens": max_output_tokens
             }
         }
         
-        try:
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=60
-            )
+        if response_schema and GEMINI_STRUCTURED_OUTPUT:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = response_schema
+        
+        quota_tier = "score" if tier == "score" and self.separate_score_quota else "full"
+        rate_limiter = self.score_rate_limiter if quota_tier == "score" else self.rate_limiter
+        
+        # 한도에 닿았으면 호출하지 않음 (개별 재분석/번역 경로도 예약분을 건드리지 않도록 여기서 확인)
+        if not self.budget.allow(reserved=reserved, tier=quota_tier):
+            self._count('quota_blocked')
+            return None
+        
+        # 토큰 수는 대략 4자당 1토큰 + 최대 출력으로 추정 후 응답의 usageMetadata로 보정
+        estimated_tokens = len(prompt) // 4 + max_output_tokens
+        
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            # 장애로 회로가 열려 있으면 타임아웃을 기다리지 않고 바로 포기
+            if not self.breaker.allow():
+                self._count('circuit_open')
+                return None
             
-            if response.status_code == 200:
-                data = response.json()
-                return data["candidates"][0]["content"]["parts"][0]["text"].strip()
-            else:
+            rate_limiter.acquire(estimated_tokens)
+            self._count('api_calls')
+            self._count(f'{tier}_calls')
+            self._count(f'{quota_tier}_quota_calls')
+            used_tokens = None
+            throttled = False
+            status = "error"
+            usage = None
+            started = time.perf_counter()
+            
+            try:
+                response = self.session.post(
+                    self.score_api_url if tier == "score" else self.api_url,
+                    json=payload,
+                    timeout=GEMINI_TIMEOUT
+                )
+                
+                status = "ok" if response.status_code == 200 else str(response.status_code)
+                
+                # 5xx만 장애로 보고, 그 밖의 응답(429 포함)은 서버가 살아있는 것으로 간주
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                
+                # 429는 할당량에 잡히지 않으므로 기록하지 않음
+                if response.status_code == 200:
+                    data = response.json()
+                    usage = data.get("usageMetadata")
+                    used_tokens = (usage or {}).get("totalTokenCount")
+                    self.budget.record(usage, tier=quota_tier)
+                elif response.status_code != 429:
+                    self.budget.record(tier=quota_tier)
+                
+                if response.status_code == 200:
+                    return data["candidates"][0]["content"]["parts"][0]["text"].strip()
+                
+                if response.status_code in (429, 503) and attempt < GEMINI_MAX_RETRIES:
+                    throttled = True
+                    wait = min(60.0, parse_retry_after(response.headers.get("Retry-After"), 2.0 ** (attempt + 1)))
+                    print(f"    ⏳ Gemini API: {response.status_code}, {wait:.0f}초 후 재시도")
+                    rate_limiter.backoff(wait)
+                    continue
+                
                 print(f"    ⚠️ Gemini API: {response.status_code}")
                 return None
-                
-        except requests.exceptions.Timeout:
-            print(f"    ⚠️ Gemini API: 타임아웃")
-            return None
-        except Exception as e:
-            print(f"    ⚠️ Gemini API: {e}")
-            return None
+                    
+            except requests.exceptions.Timeout:
+                status = "timeout"
+                self.breaker.record_failure()
+                print(f"    ⚠️ Gemini API: 타임아웃")
+                return None
+            except requests.exceptions.RequestException as e:
+                self.breaker.record_failure()
+                print(f"    ⚠️ Gemini API: {e}")
+                return None
+            except Exception as e:
+                print(f"    ⚠️ Gemini API: {e}")
+                return None
+            finally:
+                rate_limiter.release(estimated_tokens, used_tokens, throttled)
+                METRICS.record_gemini(tier, time.perf_counter() - started, status, item_ids, usage)
+        
+        return None
     
     def _extract_json(self, text: str) -> Optional[dict]:
         """텍스트에서 JSON 추출 (여러 방법 시도)"""
@@ -131,8 +300,15 @@ class AIAnalyzer:
         
         return None
     
-    def _translate_to_korean(self, title: str, summary: str) -> Tuple[str, str]:
+    def _translate_to_korean(
+        self,
+        title: str,
+        summary: str,
+        news_id: Optional[str] = None,
+        reserved: bool = False
+    ) -> Tuple[str, str]:
         """제목과 요약을 한국어로 번역"""
+        self._count('translate_call')
         prompt = f"""다음 영어 텍스트를 한국어로 번역해주세요. 반드시 아래 형식으로만 응답하세요.
 
 제목: {title[:100]}
@@ -143,7 +319,7 @@ class AIAnalyzer:
 요약: [한국어 요약 2문장]"""
 
         try:
-            result = self._call_gemini(prompt)
+            result = self._call_gemini(prompt, item_ids=[news_id] if news_id else None, reserved=reserved)
             if result:
                 kr_title = title[:50]
                 kr_summary = summary[:200]
@@ -161,9 +337,64 @@ class AIAnalyzer:
         
         return title[:50], summary[:200]
     
+    def _get_priority(self, final_score: int) -> Priority:
+        """최종 점수로 우선순위 결정"""
+        if final_score >= 8:
+            return Priority.REALTIME
+        elif final_score >= 5:
+            return Priority.BATCH_6H
+        return Priority.DAILY
+    
+    def _final_score(self, news: NewsItem, base_score: int) -> int:
+        keyword_bonus = self._check_keyword_importance(news)
+        trust_bonus = (news.source_trust - 5) * 0.2
+        return min(10, max(1, int(base_score + keyword_bonus + trust_bonus)))
+    
+    def _build_analyzed(
+        self,
+        news: NewsItem,
+        base_score: int,
+        korean_title: str,
+        korean_summary: str,
+        reason: str,
+        route: str
+    ) -> AnalyzedNews:
+        """기본 점수에 키워드/신뢰도 보너스를 적용해 AnalyzedNews 생성 (route는 실행 지표용 분석 경로)"""
+        final_score = self._final_score(news, base_score)
+        METRICS.record_item(news.id, news.source_name, route, final_score, reason)
+        
+        return AnalyzedNews(
+            news_item=news,
+            korean_title=korean_title,
+            korean_summary=korean_summary,
+            importance_score=final_score,
+            priority=self._get_priority(final_score),
+            reason=reason
+        )
+    
+    def _analyze_cached(self, news: NewsItem) -> Optional[AnalyzedNews]:
+        """캐시된 분석 결과가 있으면 API 호출 없이 반환"""
+        cached = self.cache.get(news.title, news.summary)
+        if not cached:
+            return None
+        
+        return self._build_analyzed(
+            news,
+            cached['importance_score'],
+            cached['korean_title'],
+            cached['korean_summary'],
+            cached['reason'],
+            route="cache"
+        )
+    
     def analyze_single(self, news: NewsItem) -> Optional[AnalyzedNews]:
         """단일 뉴스 분석"""
         
+        cached = self._analyze_cached(news)
+        if cached:
+            print(f"    💾 캐시 사용")
+            return cached
+        
         prompt = f"""다음 AI/기술 뉴스를 분석해주세요.
 
 **원문 제목**: {news.title}
@@ -174,32 +405,36 @@ class AIAnalyzer:
 다음 형식의 JSON으로만 응답해주세요 (다른 텍스트 없이):
 {{"korean_title": "한국어로 번역한 핵심 제목 (30자 이내)", "korean_summary": "한국어로 요약 (2-3문장, 핵심 내용만)", "importance_score": 5, "reason": "중요도 판단 이유 (1문장)"}}
 
-**중요도 기준**:
-- 9-10: 주요 AI 기업의 새 모델 출시, 획기적인 연구 발표, 중요 정책/규제
-- 7-8: 주목할 만한 기술 발전, 주요 인물의 중요 발언
-- 5-6: 일반적인 업계 뉴스, 흥미로운 연구
-- 3-4: 사소한 업데이트, 일상적인 뉴스
-- 1-2: 광고성, 반복적인 내용
+{IMPORTANCE_CRITERIA}
 
 반드시 JSON 형식으로만 응답하세요. 줄바꿈 없이 한 줄로 응답하세요."""
 
         try:
-            text = self._call_gemini(prompt)
+            text = self._call_gemini(
+                prompt,
+                response_schema=ANALYSIS_SCHEMA,
+                item_ids=[news.id],
+                reserved=self._is_reserved([news])
+            )
             
             if not text:
                 return self._create_fallback(news)
             
+            # 구조화 출력은 그대로 파싱되어야 함 - 검증 통과 시 추가 호출 없음
+            validated = self._validate_result(self._parse_json_strict(text))
+            if validated:
+                self._count('structured')
+                base_score, korean_title, korean_summary, reason = validated
+                self.cache.put(news.title, news.summary, korean_title, korean_summary, base_score, reason)
+                return self._build_analyzed(news, base_score, korean_title, korean_summary, reason, route="structured")
+            
+            self._count('json_repair')
             result = self._extract_json(text)
             
             if not result:
                 print(f"    ⚠️ JSON 추출 실패, 번역 시도")
                 return self._create_fallback(news)
             
-            # 키워드 보너스 적용
-            keyword_bonus = self._check_keyword_importance(
-                f"{news.title} {news.summary}"
-            )
-            
             base_score = result.get('importance_score', 5)
             if not isinstance(base_score, int):
                 try:
@@ -207,63 +442,382 @@ class AIAnalyzer:
                 except:
                     base_score = 5
             
-            trust_bonus = (news.source_trust - 5) * 0.2
-            final_score = min(10, max(1, int(base_score + keyword_bonus + trust_bonus)))
-            
-            # 우선순위 결정
-            if final_score >= 8:
-                priority = Priority.REALTIME
-            elif final_score >= 5:
-                priority = Priority.BATCH_6H
-            else:
-                priority = Priority.DAILY
-            
             korean_title = result.get('korean_title', news.title)[:50]
             korean_summary = result.get('korean_summary', news.summary)[:200]
             
             # summary가 너무 짧으면 번역 재시도
             if len(korean_summary) < 30:
                 print(f"    ⚠️ 요약 너무 짧음, 번역 재시도")
-                _, korean_summary = self._translate_to_korean(news.title, news.summary)
+                _, korean_summary = self._translate_to_korean(news.title, news.summary, news.id)
             
-            return AnalyzedNews(
-                news_item=news,
-                korean_title=korean_title,
-                korean_summary=korean_summary,
-                importance_score=final_score,
-                priority=priority,
-                reason=result.get('reason', '')[:100]
-            )
+            reason = result.get('reason', '')[:100]
+            self.cache.put(news.title, news.summary, korean_title, korean_summary, base_score, reason)
+            
+            return self._build_analyzed(news, base_score, korean_title, korean_summary, reason, route="json_repair")
             
         except Exception as e:
             print(f"    ❌ 분석 실패: {e}")
             return self._create_fallback(news)
     
+    def _create_local_fallback(self, news: NewsItem, reason: str) -> AnalyzedNews:
+        """네트워크 호출 없이 원문 그대로 로컬 점수만 매김"""
+        self._count('local_fallback')
+        return self._build_analyzed(news, 5, news.title[:50], news.summary[:200], reason, route="local_fallback")
+    
     def _create_fallback(self, news: NewsItem) -> AnalyzedNews:
         """분석 실패 시 번역 후 기본값 생성"""
-        keyword_bonus = self._check_keyword_importance(f"{news.title} {news.summary}")
-        base_score = 5 + keyword_bonus
-        trust_bonus = (news.source_trust - 5) * 0.2
-        final_score = min(10, max(1, int(base_score + trust_bonus)))
+        # 장애 중에는 번역 호출도 실패할 것이므로 기다리지 않음
+        if self.breaker.is_open():
+            return self._create_local_fallback(news, "로컬 추정 (Gemini 장애)")
         
-        if final_score >= 8:
-            priority = Priority.REALTIME
-        elif final_score >= 5:
-            priority = Priority.BATCH_6H
-        else:
-            priority = Priority.DAILY
+        # 번역 호출도 할당량 예약분은 실시간 알림 후보에게만
+        reserved = self._is_reserved([news])
+        if not self.budget.allow(reserved=reserved):
+            return self._create_local_fallback(news, "로컬 추정 (할당량 절약)" if not reserved else "로컬 추정 (할당량 소진)")
         
+        self._count('fallback')
         # 번역 시도
-        kr_title, kr_summary = self._translate_to_korean(news.title, news.summary)
+        kr_title, kr_summary = self._translate_to_korean(news.title, news.summary, news.id, reserved=reserved)
         
-        return AnalyzedNews(
-            news_item=news,
-            korean_title=kr_title,
-            korean_summary=kr_summary,
-            importance_score=final_score,
-            priority=priority,
-            reason="자동 분류"
+        return self._build_analyzed(news, 5, kr_title, kr_summary, "자동 분류", route="fallback")
+    
+    def _extract_json_array(self, text: str) -> Optional[list]:
+        """텍스트에서 JSON 배열 추출"""
+        text = re.sub(r'```json\s*', '', text)
+        text = re.sub(r'```\s*', '', text)
+        text = text.strip()
+        
+        try:
+            result = json.loads(text)
+            return result if isinstance(result, list) else None
+        except:
+            pass
+        
+        start = text.find('[')
+        end = text.rfind(']')
+        if start != -1 and end > start:
+            try:
+                result = json.loads(text[start:end+1])
+                return result if isinstance(result, list) else None
+            except:
+                pass
+        
+        return None
+    
+    def _parse_json_strict(self, text: str):
+        """구조화 출력 파싱 (복구 시도 없음)"""
+        try:
+            return json.loads(text)
+        except:
+            return None
+    
+    def _validate_result(self, entry) -> Optional[Tuple[int, str, str, str]]:
+        """분석 결과 검증 (기본 점수, 제목, 요약, 이유)"""
+        if not isinstance(entry, dict):
+            return None
+        
+        korean_title = entry.get('korean_title')
+        korean_summary = entry.get('korean_summary')
+        if not isinstance(korean_title, str) or not korean_title.strip():
+            return None
+        if not isinstance(korean_summary, str) or len(korean_summary.strip()) < 30:
+            return None
+        
+        try:
+            base_score = int(entry.get('importance_score'))
+        except:
+            return None
+        if not 1 <= base_score <= 10:
+            return None
+        
+        reason = entry.get('reason', '')
+        if not isinstance(reason, str):
+            reason = ''
+        
+        return base_score, korean_title.strip()[:50], korean_summary.strip()[:200], reason[:100]
+    
+    def _analyze_chunk(self, chunk: List[NewsItem]) -> Tuple[List[AnalyzedNews], List[NewsItem]]:
+        """여러 뉴스를 한 번의 요청으로 분석 (성공 목록, 개별 분석이 필요한 목록)"""
+        items = [
+            {
+                "id": news.id,
+                "title": news.title,
+                "summary": news.summary,
+                "source": f"{news.source_name} (신뢰도: {news.source_trust}/10)",
+                "category": news.category
+            }
+            for news in chunk
+        ]
+        items_text = "\n".join(json.dumps(item, ensure_ascii=False) for item in items)
+        
+        prompt = f"""다음 AI/기술 뉴스 {len(chunk)}개를 각각 분석해주세요.
+
+{items_text}
+
+각 뉴스마다 아래 형식의 객체를 만들어 JSON 배열로만 응답해주세요 (다른 텍스트 없이):
+[{{"id": "입력의 id 그대로", "korean_title": "한국어로 번역한 핵심 제목 (30자 이내)", "korean_summary": "한국어로 요약 (2-3문장, 핵심 내용만)", "importance_score": 5, "reason": "중요도 판단 이유 (1문장)"}}]
+
+{IMPORTANCE_CRITERIA}
+
+반드시 입력된 모든 id에 대해 하나씩, JSON 배열 형식으로만 응답하세요."""
+
+        text = self._call_gemini(
+            prompt,
+            max_output_tokens=400 * len(chunk),
+            response_schema=BATCH_ANALYSIS_SCHEMA,
+            item_ids=[news.id for news in chunk],
+            reserved=self._is_reserved(chunk)
+        )
+        entries = self._parse_json_strict(text) if text else None
+        if text and not isinstance(entries, list):
+            self._count('json_repair')
+            entries = self._extract_json_array(text)
+        
+        by_id = {}
+        for entry in entries or []:
+            if isinstance(entry, dict) and entry.get('id') is not None:
+                by_id[str(entry['id'])] = entry
+        
+        analyzed = []
+        failed = []
+        for news in chunk:
+            validated = self._validate_result(by_id.get(news.id))
+            if not validated:
+                failed.append(news)
+                continue
+            
+            base_score, korean_title, korean_summary, reason = validated
+            self.cache.put(news.title, news.summary, korean_title, korean_summary, base_score, reason)
+            analyzed.append(self._build_analyzed(news, base_score, korean_title, korean_summary, reason, route="batch"))
+        
+        return analyzed, failed
+    
+    def _score_chunk(self, chunk: List[NewsItem]) -> Tuple[List[AnalyzedNews], List[NewsItem]]:
+        """점수 전용 모델로 중요도만 평가 (기준 미달 결과, 전체 분석할 목록)
+        
+        기준 미달 뉴스는 원문 제목/요약 그대로 두고 캐시하지 않으며,
+        점수를 받지 못한 뉴스는 전체 분석으로 넘긴다.
+        """
+        items_text = "\n".join(
+            json.dumps({"id": news.id, "title": news.title, "source": news.source_name}, ensure_ascii=False)
+            for news in chunk
+        )
+        
+        prompt = f"""다음 AI/기술 뉴스 {len(chunk)}개의 중요도만 평가해주세요.
+
+{items_text}
+
+{IMPORTANCE_CRITERIA}
+
+[{{"id": "입력의 id 그대로", "importance_score": 5}}] 형식의 JSON 배열로만 응답하세요."""
+
+        text = self._call_gemini(
+            prompt,
+            max_output_tokens=30 * len(chunk),
+            response_schema=SCORE_SCHEMA,
+            tier="score",
+            item_ids=[news.id for news in chunk],
+            reserved=self._is_reserved(chunk)
         )
+        entries = self._parse_json_strict(text) if text else None
+        if text and not isinstance(entries, list):
+            entries = self._extract_json_array(text)
+        
+        scores = {}
+        for entry in entries or []:
+            if isinstance(entry, dict) and entry.get('id') is not None:
+                try:
+                    scores[str(entry['id'])] = int(entry.get('importance_score'))
+                except:
+                    pass
+        
+        below = []
+        contenders = []
+        for news in chunk:
+            base_score = scores.get(news.id)
+            if base_score is None or not 1 <= base_score <= 10:
+                contenders.append(news)
+                continue
+            
+            if self._final_score(news, base_score) >= CASCADE_MIN_SCORE:
+                contenders.append(news)
+            else:
+                self._count('score_only')
+                with self._stats_lock:
+                    self.score_only.add(news.id)
+                below.append(self._build_analyzed(
+                    news, base_score, news.title[:50], news.summary[:200], "점수만 평가 (요약 생략)", route="score_only"
+                ))
+        
+        return below, contenders
+    
+    def triage_score(self, news: NewsItem) -> float:
+        """LLM 호출 없이 계산하는 임시 점수 (_create_fallback과 같은 공식 + 카테고리/최신성 보정)"""
+        keyword_bonus = self._check_keyword_importance(news)
+        trust_bonus = (news.source_trust - 5) * 0.2
+        score = 5 + keyword_bonus + trust_bonus
+        score += TRIAGE_CATEGORY_ADJUST.get(news.category, 0)
+        
+        stale_cutoff = datetime.now(timezone.utc) - timedelta(hours=TRIAGE_STALE_HOURS)
+        published_dt = news.published_dt
+        if published_dt and published_dt.tzinfo is None:
+            published_dt = published_dt.replace(tzinfo=timezone.utc)
+        if not published_dt or published_dt < stale_cutoff:
+            score -= TRIAGE_STALE_PENALTY
+        
+        return score
+    
+    def should_analyze(self, news: NewsItem) -> bool:
+        """사전 선별 통과 여부 (TRIAGE_MIN_SCORE가 0 이하면 항상 통과)"""
+        return TRIAGE_MIN_SCORE <= 0 or self.triage_score(news) >= TRIAGE_MIN_SCORE
+    
+    def triage(self, news_list: List[NewsItem]) -> Tuple[List[NewsItem], List[NewsItem]]:
+        """분석할 뉴스와 건너뛸 뉴스로 분리 (TRIAGE_MIN_SCORE 기준)"""
+        if TRIAGE_MIN_SCORE <= 0:
+            return news_list, []
+        
+        selected = []
+        skipped = []
+        for news in news_list:
+            if self.should_analyze(news):
+                selected.append(news)
+            else:
+                skipped.append(news)
+        
+        print(f"🔎 사전 선별: {len(selected)}개 분석, {len(skipped)}개 제외 (기준 {TRIAGE_MIN_SCORE})")
+        
+        return selected, skipped
+    
+    def _budget_exhausted(self) -> bool:
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return True
+        if self._call_limit is not None and self.stats['full_quota_calls'] >= self._call_limit:
+            return True
+        return False
+    
+    def _is_reserved(self, news_list: List[NewsItem]) -> bool:
+        """모두 실시간 알림 후보(고신뢰 소스)인 호출만 할당량 예약분 사용"""
+        return bool(news_list) and all(n.source_trust >= QUOTA_RESERVED_MIN_TRUST for n in news_list)
+    
+    def start_budget(self):
+        """실행 예산(시간/호출 수) 시작 - 넘으면 남은 뉴스는 deferred로 이월 (analyze_batch, 스트리밍 분석 단계)
+        
+        호출 수는 전체 분석 모델 한도를 쓰는 호출만 센다 (별도 점수 모델 호출은 제외).
+        """
+        self.deferred = []
+        self._deadline = time.monotonic() + ANALYSIS_TIME_BUDGET if ANALYSIS_TIME_BUDGET > 0 else None
+        self._call_limit = self.stats['full_quota_calls'] + ANALYSIS_CALL_BUDGET if ANALYSIS_CALL_BUDGET > 0 else None
+    
+    def end_budget(self):
+        self._deadline = None
+        self._call_limit = None
+    
+    def _defer(self, news_list: List[NewsItem]):
+        with self._stats_lock:
+            self.deferred.extend(news_list)
+    
+    def _analyze_chunk_with_fallback(self, chunk: List[NewsItem]) -> List[AnalyzedNews]:
+        """묶음 분석 후 검증 실패 항목만 개별 분석 (예산을 넘기면 이월)"""
+        if self._budget_exhausted():
+            self._defer(chunk)
+            return []
+        
+        # 회로가 열려 있으면 남은 뉴스는 네트워크 없이 바로 처리
+        if self.breaker.is_open():
+            return [self._create_local_fallback(n, "로컬 추정 (Gemini 장애)") for n in chunk]
+        
+        # 일/주 할당량이 예약분만 남았으면 실시간 후보가 아닌 뉴스는 로컬 점수로 처리
+        if not self.budget.allow(reserved=False):
+            reserved = [n for n in chunk if self._is_reserved([n])]
+            local = [self._create_local_fallback(n, "로컬 추정 (할당량 절약)") for n in chunk if n not in reserved]
+            if not reserved or not self.budget.allow(reserved=True):
+                return local + [self._create_local_fallback(n, "로컬 추정 (할당량 소진)") for n in reserved]
+            return local + self._analyze_chunk_remote(reserved)
+        
+        return self._analyze_chunk_remote(chunk)
+    
+    def _analyze_chunk_remote(self, chunk: List[NewsItem]) -> List[AnalyzedNews]:
+        """Gemini 묶음 분석 + 누락 항목 개별 분석"""
+        analyzed = []
+        if len(chunk) > 1:
+            full, failed = self._analyze_chunk(chunk)
+            analyzed.extend(full)
+            for result in full:
+                print(f"    → {result.news_item.title[:40]}... 중요도: {result.importance_score}/10 ({result.priority.value})")
+        else:
+            failed = chunk
+        
+        for i, news in enumerate(failed):
+            if self._budget_exhausted():
+                self._defer(failed[i:])
+                break
+            if self.breaker.is_open():
+                analyzed.extend(self._create_local_fallback(n, "로컬 추정 (Gemini 장애)") for n in failed[i:])
+                break
+            if len(chunk) > 1:
+                self._count('batch_retry')
+                print(f"    ⚠️ 묶음 응답 누락, 개별 분석: {news.title[:40]}...")
+            result = self.analyze_single(news)
+            if result:
+                analyzed.append(result)
+                print(f"    → {news.title[:40]}... 중요도: {result.importance_score}/10 ({result.priority.value})")
+        
+        return analyzed
+    
+    def _score_pass(self, pending: List[NewsItem], executor: ThreadPoolExecutor) -> Tuple[List[AnalyzedNews], List[NewsItem]]:
+        """MODEL_CASCADE: 모든 뉴스를 큰 묶음으로 점수만 평가한 뒤 기준 이상인 뉴스를 모아 반환
+        
+        묶음마다 점수 → 전체 두 번 호출하면 요청 수가 늘어나므로, 통과한 뉴스를 모아서
+        ANALYSIS_BATCH_SIZE 묶음으로 다시 나눠 전체 분석한다. (입력 순서 유지)
+        """
+        size = max(1, CASCADE_SCORE_BATCH_SIZE)
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        below = []
+        passed = set()
+        for scored, contenders in executor.map(self._score_chunk, chunks):
+            below.extend(scored)
+            passed.update(news.id for news in contenders)
+            for result in scored:
+                print(f"    → {result.news_item.title[:40]}... 중요도: {result.importance_score}/10 (점수만)")
+        return below, [news for news in pending if news.id in passed]
+    
+    def analyze_chunk(self, chunk: List[NewsItem]) -> List[AnalyzedNews]:
+        """캐시 조회 후 나머지를 한 묶음으로 분석 (스트리밍 파이프라인용, 정렬 없음)
+        
+        지연이 중요한 실시간 경로라 모델 단계(점수 → 전체 두 번 호출)는 쓰지 않는다.
+        """
+        analyzed = []
+        pending = []
+        for news in chunk:
+            cached = self._analyze_cached(news)
+            if cached:
+                analyzed.append(cached)
+            else:
+                pending.append(news)
+        
+        if pending:
+            analyzed.extend(self._analyze_chunk_with_fallback(pending))
+        return analyzed
+    
+    def complete(self, analyzed_list: List[AnalyzedNews]) -> List[AnalyzedNews]:
+        """전송할 뉴스 중 점수만 평가된 항목을 전체 분석으로 교체 (원문 제목/자리표시 이유로 전송되지 않도록, 순서 유지)"""
+        pending = [a.news_item for a in analyzed_list if a.news_item.id in self.score_only]
+        if not pending:
+            return analyzed_list
+        
+        print(f"\n🪜 전송 전 전체 분석: 점수만 평가된 뉴스 {len(pending)}개")
+        size = max(1, ANALYSIS_BATCH_SIZE)
+        full = {}
+        for i in range(0, len(pending), size):
+            for result in self._analyze_chunk_remote(pending[i:i + size]):
+                # 장애/할당량으로 로컬 추정이 나오면 점수 평가 결과가 더 정확하므로 유지
+                if not result.reason.startswith("로컬 추정"):
+                    full[result.news_item.id] = result
+        self.score_only.difference_update(full)
+        self.cache.save()
+        self.budget.save()
+        
+        return [full.get(a.news_item.id, a) for a in analyzed_list]
     
     def analyze_batch(self, news_list: List[NewsItem]) -> List[AnalyzedNews]:
         """여러 뉴스 일괄 분석"""
@@ -271,18 +825,63 @@ class AIAnalyzer:
         
         print(f"\n🤖 {len(news_list)}개 뉴스 AI 분석 중... (Gemini)\n")
         
-        for i, news in enumerate(news_list):
-            print(f"  [{i+1}/{len(news_list)}] {news.title[:40]}...")
-            result = self.analyze_single(news)
-            if result:
-                analyzed.append(result)
-                print(f"    → 중요도: {result.importance_score}/10 ({result.priority.value})")
-            time.sleep(0.3)
+        pending = []
+        for news in news_list:
+            cached = self._analyze_cached(news)
+            if cached:
+                analyzed.append(cached)
+            else:
+                pending.append(news)
+        
+        if analyzed:
+            print(f"  💾 캐시 적중 {len(analyzed)}개")
+        
+        # 예상 중요도(신뢰도, 카테고리, 키워드, 최신성) 높은 순으로 예산 안에서 분석
+        pending.sort(key=self.triage_score, reverse=True)
+        self.score_only = set()
+        self.start_budget()
+        
+        # 실제 호출 속도와 동시성은 rate_limiter가 조절
+        with ThreadPoolExecutor(max_workers=max(1, GEMINI_MAX_CONCURRENCY)) as executor:
+            if MODEL_CASCADE and pending:
+                below, pending = self._score_pass(pending, executor)
+                analyzed.extend(below)
+            
+            if ANALYSIS_BATCH_SIZE > 1:
+                chunks = [pending[i:i + ANALYSIS_BATCH_SIZE] for i in range(0, len(pending), ANALYSIS_BATCH_SIZE)]
+            else:
+                chunks = [[news] for news in pending]
+            
+            for results in executor.map(self._analyze_chunk_with_fallback, chunks):
+                analyzed.extend(results)
+        
+        self.end_budget()
+        
+        if self.deferred:
+            print(f"\n⏳ 분석 예산 초과: {len(self.deferred)}개 뉴스 다음 실행으로 이월")
         
         # 중요도순 정렬
         analyzed.sort(key=lambda x: x.importance_score, reverse=True)
         
-        print(f"\n✅ {len(analyzed)}개 뉴스 분석 완료\n")
+        self.cache.save()
+        self.budget.save()
+        
+        print(f"\n✅ {len(analyzed)}개 뉴스 분석 완료 (캐시 적중 {self.cache.hits}개)")
+        print(
+            f"📈 느린 경로: JSON 복구 {self.stats['json_repair']}회, "
+            f"개별 재분석 {self.stats['batch_retry']}회, "
+            f"번역 호출 {self.stats['translate_call']}회, "
+            f"기본값 {self.stats['fallback']}회, "
+            f"로컬 추정 {self.stats['local_fallback']}회, "
+            f"회로 차단 {self.stats['circuit_open']}회"
+        )
+        if MODEL_CASCADE:
+            print(
+                f"🪜 모델 단계: 점수 {self.score_model} {self.stats['score_calls']}회 → "
+                f"전체 {GEMINI_MODEL} {self.stats['full_calls']}회 "
+                f"(기준 {CASCADE_MIN_SCORE}점 미만 {self.stats['score_only']}개 요약 생략)"
+            )
+        print(f"💰 Gemini 사용량: {self.budget.summary()}\n")
         
         return analyzed
     
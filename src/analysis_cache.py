@@ -0,0 +1,71 @@
+"""
+Analysis Cache - Gemini 분석 결과 디스크 캐시
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from config import ANALYSIS_CACHE_TTL_HOURS, ANALYSIS_CACHE_MAX_ENTRIES
+
+
+class AnalysisCache:
+    """제목 + 요약 + 프롬프트 버전 해시를 키로 하는 분석 결과 캐시"""
+    
+    def __init__(self, cache_dir: str = "data", prompt_version: str = "v1"):
+        self.cache_file = Path(cache_dir) / "analysis_cache.json"
+        self.prompt_version = prompt_version
+        self.entries = self._load()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def _load(self) -> dict:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+    
+    def make_key(self, title: str, summary: str) -> str:
+        raw = f"{self.prompt_version}\n{title.strip()}\n{summary.strip()}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+    
+    def get(self, title: str, summary: str) -> Optional[dict]:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=ANALYSIS_CACHE_TTL_HOURS)
+        with self.lock:
+            entry = self.entries.get(self.make_key(title, summary))
+            if not entry or entry.get('cached_at', '') <= cutoff.isoformat():
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            return entry
+    
+    def put(self, title: str, summary: str, korean_title: str, korean_summary: str,
+            importance_score: int, reason: str):
+        """Gemini 기본 점수 저장 (키워드/신뢰도 보너스는 조회 시 다시 계산)"""
+        with self.lock:
+            self.entries[self.make_key(title, summary)] = {
+                'korean_title': korean_title,
+                'korean_summary': korean_summary,
+                'importance_score': importance_score,
+                'reason': reason,
+                'cached_at': datetime.now(timezone.utc).isoformat(),
+            }
+    
+    def save(self):
+        """만료 항목 제거 및 최대 개수 초과분(오래된 순) 정리 후 저장"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=ANALYSIS_CACHE_TTL_HOURS)).isoformat()
+        with self.lock:
+            alive = [(k, v) for k, v in self.entries.items() if v.get('cached_at', '') > cutoff]
+            alive.sort(key=lambda kv: kv[1]['cached_at'], reverse=True)
+            self.entries = dict(alive[:ANALYSIS_CACHE_MAX_ENTRIES])
+            
+            self.cache_file.parent.mkdir(exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
@@ -0,0 +1,358 @@
+"""
+Cassette - 실행 중 오간 HTTP 요청/응답을 기록(--record)하고 네트워크 없이 재생(--replay)
+
+공유 세션(http_client.get_session)의 어댑터만 바꿔 끼우므로 NewsCollector / AIAnalyzer / TelegramBot은 그대로 동작한다.
+카세트(gzip JSON)에는 응답과 함께 실행 시작 시점의 data/ 상태 파일과 시각을 담아 두고,
+재생할 때는 data/replay/에 그 상태를 풀어 같은 seen 상태, 캐시, 시계로 다시 실행한다.
+재생 중에는 레이트 리미터와 재시도 대기를 실제로 기다리지 않는다 (ReplayTime).
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config import GEMINI_API_KEY, TELEGRAM_BOT_TOKEN, CASSETTE_REPLAY_DIR
+from http_client import get_session
+
+CASSETTE_VERSION = 1
+
+# 실행 결과물이라 재생 시작 상태로 쓰지 않는 파일
+_OUTPUT_SUFFIXES = (".gz", ".jsonl", ".prom", ".tmp")
+_OUTPUT_FILES = {".gitkeep", "freshness_report.json"}
+
+# 본문은 이미 풀려 있으므로 재생 응답에 다시 붙이지 않는 헤더
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _redact(text: str) -> str:
+    """API 키/봇 토큰과 key= 쿼리 값을 지움 (URL이 그대로 들어가는 예외 메시지에도 적용)"""
+    for secret in (TELEGRAM_BOT_TOKEN, GEMINI_API_KEY):
+        if secret:
+            text = text.replace(secret, "<redacted>")
+    return re.sub(r"([?&]key=)[^&\s'\"]+", r"\1<redacted>", text)
+
+
+def _normalize_url(url: str) -> str:
+    """비밀 값을 지운 URL (카세트에 남기지 않고, 다른 키로도 재생 가능)"""
+    parts = urlsplit(_redact(url))
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "key"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _body_bytes(body) -> bytes:
+    if body is None:
+        return b""
+    return body.encode("utf-8") if isinstance(body, str) else bytes(body)
+
+
+def _body_text(body: bytes) -> Optional[str]:
+    return body.decode("utf-8", errors="replace") if body else None
+
+
+class RecordingAdapter(BaseAdapter):
+    """기존 어댑터로 요청을 보내고 응답(또는 예외)을 카세트에 추가"""
+    
+    def __init__(self, inner: BaseAdapter, cassette: "Cassette"):
+        super().__init__()
+        self.inner = inner
+        self.cassette = cassette
+    
+    def send(self, request, **kwargs):
+        try:
+            response = self.inner.send(request, **kwargs)
+        except requests.RequestException as e:
+            self.cassette.add(request, error=e)
+            raise
+        self.cassette.add(request, response=response)
+        return response
+    
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """네트워크 대신 카세트에서 응답을 찾아 돌려줌"""
+    
+    def __init__(self, cassette: "Cassette"):
+        super().__init__()
+        self.cassette = cassette
+    
+    def send(self, request, **kwargs):
+        record = self.cassette.match(request)
+        
+        if record.get("error"):
+            error_cls = getattr(requests.exceptions, record["error"]["type"], requests.ConnectionError)
+            raise error_cls(record["error"]["message"], request=request)
+        
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.reason = record["reason"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = base64.b64decode(record["body"])
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+    
+    def close(self):
+        pass
+
+
+class ReplayTime:
+    """재생 중 src 모듈의 time 대신 쓰는 시계: sleep은 기다리지 않고 monotonic()/time()만 그만큼 앞당김
+    
+    응답은 카세트에서 바로 나오므로 토큰 버킷, 429/flood control 재시도 대기, 전송 간격을 실제로 기다릴 이유가 없다.
+    (sleep을 아예 없애면 토큰 버킷이 실제 시간으로 채워질 때까지 바쁜 대기를 하므로 시계를 같이 넘긴다)
+    """
+    
+    def __init__(self):
+        self.skipped = 0.0
+        self.lock = threading.Lock()
+    
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            with self.lock:
+                self.skipped += seconds
+    
+    def monotonic(self) -> float:
+        return time.monotonic() + self.skipped
+    
+    def time(self) -> float:
+        return time.time() + self.skipped
+    
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class Cassette:
+    """with Cassette(path, "record"|"replay", mode): ... 구간의 HTTP 트래픽 기록/재생"""
+    
+    def __init__(self, path: str, action: str, mode: str):
+        self.path = Path(path).resolve()
+        self.action = action
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.session = get_session()
+        self.original_adapters = dict(self.session.adapters)
+        
+        self.recorded_at: Optional[str] = None
+        self.state: Dict[str, str] = {}
+        self.interactions: List[dict] = []
+        
+        # 재생용: (method, url)별 아직 쓰지 않은 기록 순번, 요청별 일치 결과
+        self.pending: Dict[tuple, List[int]] = defaultdict(list)
+        self.replayed: List[dict] = []
+        self.cwd: Optional[str] = None
+        self.replay_time = ReplayTime()
+        self.patched: List[tuple] = []
+    
+    # === 기록 ===
+    
+    def add(self, request, response=None, error: Optional[Exception] = None):
+        body = _body_bytes(request.body)
+        record = {
+            "method": request.method,
+            "url": _normalize_url(request.url),
+            "body_sha1": hashlib.sha1(body).hexdigest(),
+            "request_body": _body_text(body),
+        }
+        if error is not None:
+            record["error"] = {"type": type(error).__name__, "message": _redact(str(error))}
+        else:
+            record.update(
+                status=response.status_code,
+                reason=response.reason,
+                headers={k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+                body=base64.b64encode(response.content).decode("ascii"),
+                elapsed=round(response.elapsed.total_seconds(), 4) if response.elapsed else None,
+            )
+        with self.lock:
+            self.interactions.append(record)
+    
+    def _snapshot_state(self, data_dir: Path) -> Dict[str, str]:
+        """실행 시작 시점의 data/ 상태 파일 (seen 상태, 피드/분석 캐시, 할당량, outbox 등)"""
+        state = {}
+        if not data_dir.exists():
+            return state
+        for path in sorted(data_dir.iterdir()):
+            if not path.is_file() or path.name in _OUTPUT_FILES or path.suffix in _OUTPUT_SUFFIXES:
+                continue
+            if path.resolve() == self.path:
+                continue
+            state[path.name] = base64.b64encode(path.read_bytes()).decode("ascii")
+        return state
+    
+    def _save(self):
+        data = {
+            "version": CASSETTE_VERSION,
+            "mode": self.mode,
+            "recorded_at": self.recorded_at,
+            "state": self.state,
+            "interactions": self.interactions,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
+    
+    # === 재생 ===
+    
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"지원하지 않는 카세트 버전: {data.get('version')}")
+        
+        self.recorded_at = data["recorded_at"]
+        self.state = data["state"]
+        self.interactions = data["interactions"]
+        for index, record in enumerate(self.interactions):
+            self.pending[(record["method"], record["url"])].append(index)
+        
+        if data["mode"] != self.mode:
+            print(f"⚠️ 카세트는 {data['mode']} 모드로 기록됨 (현재 {self.mode})")
+    
+    def match(self, request) -> dict:
+        """같은 요청(메서드, URL, 본문)의 기록 우선, 없으면 같은 URL의 다음 기록 (본문이 달라진 요청)"""
+        body = _body_bytes(request.body)
+        body_sha1 = hashlib.sha1(body).hexdigest()
+        url = _normalize_url(request.url)
+        
+        with self.lock:
+            candidates = self.pending.get((request.method, url), [])
+            index = next((i for i in candidates if self.interactions[i]["body_sha1"] == body_sha1), None)
+            result = "matched"
+            if index is None and candidates:
+                index = candidates[0]
+                result = "body_changed"
+            
+            entry = {"method": request.method, "url": url, "result": result if index is not None else "missing"}
+            if index is None or result == "body_changed":
+                entry["request_body"] = _body_text(body)
+            if result == "body_changed":
+                entry["recorded_body"] = self.interactions[index]["request_body"]
+            self.replayed.append(entry)
+            
+            if index is None:
+                raise requests.ConnectionError(f"카세트에 없는 요청: {request.method} {url}", request=request)
+            candidates.remove(index)
+            return self.interactions[index]
+    
+    def _shift_clock(self):
+        """src 모듈의 datetime.now()를 기록 시각 기준으로 (뉴스 나이 필터, 캐시 만료, 할당량 날짜를 기록 때와 같게)
+        
+        time은 ReplayTime으로 바꿔 레이트 리미터와 재시도 대기를 건너뛴다 (건너뛴 시간은 datetime.now()에도 반영).
+        """
+        offset = datetime.fromisoformat(self.recorded_at) - datetime.now(timezone.utc)
+        replay_time = self.replay_time
+        
+        class ReplayDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + offset + timedelta(seconds=replay_time.skipped)
+        
+        src_dir = Path(__file__).resolve().parent
+        for module in list(sys.modules.values()):
+            module_file = getattr(module, "__file__", None)
+            if module is sys.modules[__name__] or not module_file or Path(module_file).resolve().parent != src_dir:
+                continue
+            for name, original, replacement in (("datetime", datetime, ReplayDatetime), ("time", time, replay_time)):
+                if getattr(module, name, None) is original:
+                    setattr(module, name, replacement)
+                    self.patched.append((module, name, original))
+    
+    def _restore_clock(self):
+        for module, name, original in self.patched:
+            setattr(module, name, original)
+        self.patched = []
+    
+    def _report(self) -> dict:
+        remaining = set()
+        for indices in self.pending.values():
+            remaining.update(indices)
+        unused = [
+            {"method": r["method"], "url": r["url"], "request_body": r["request_body"]}
+            for i, r in enumerate(self.interactions) if i in remaining
+        ]
+        return {
+            "cassette": str(self.path),
+            "mode": self.mode,
+            "recorded_at": self.recorded_at,
+            "results": dict(Counter(entry["result"] for entry in self.replayed)),
+            "skipped_wait_seconds": round(self.replay_time.skipped, 1),
+            "requests": self.replayed,
+            "unused": unused,
+        }
+    
+    # === 컨텍스트 ===
+    
+    def _mount(self, adapter_for):
+        for prefix, adapter in self.original_adapters.items():
+            self.session.mount(prefix, adapter_for(adapter))
+    
+    def __enter__(self):
+        if self.action == "record":
+            self.recorded_at = datetime.now(timezone.utc).isoformat()
+            self.state = self._snapshot_state(Path("data"))
+            self._mount(lambda adapter: RecordingAdapter(adapter, self))
+            print(f"📼 카세트 기록 시작: {self.path}")
+            return self
+        
+        self._load()
+        
+        # 운영 data/ 대신 재생 전용 디렉토리에서 기록 당시 상태로 실행
+        workdir = Path(CASSETTE_REPLAY_DIR).resolve()
+        if workdir.exists():
+            shutil.rmtree(workdir)
+        (workdir / "data").mkdir(parents=True)
+        for name, content in self.state.items():
+            (workdir / "data" / name).write_bytes(base64.b64decode(content))
+        
+        self.cwd = os.getcwd()
+        os.chdir(workdir)
+        self._shift_clock()
+        self._mount(lambda adapter: ReplayAdapter(self))
+        print(f"📼 카세트 재생 시작: {self.path} ({self.recorded_at} 기록, 요청 {len(self.interactions)}개)")
+        return self
+    
+    def __exit__(self, *exc):
+        for prefix, adapter in self.original_adapters.items():
+            self.session.mount(prefix, adapter)
+        
+        if self.action == "record":
+            self._save()
+            print(f"📼 카세트 저장: {self.path} (요청 {len(self.interactions)}개, 상태 파일 {len(self.state)}개)")
+            return False
+        
+        self._restore_clock()
+        report = self._report()
+        with open("replay_report.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.chdir(self.cwd)
+        
+        results = report["results"]
+        print(
+            f"📼 카세트 재생 완료: 일치 {results.get('matched', 0)}개, 본문 변경 {results.get('body_changed', 0)}개, "
+            f"기록 없음 {results.get('missing', 0)}개, 미사용 기록 {len(report['unused'])}개 "
+            f"→ {Path(CASSETTE_REPLAY_DIR) / 'replay_report.json'}"
+        )
+        return False
@@ -0,0 +1,78 @@
+"""
+Circuit Breaker - 외부 API 장애 시 호출을 끊고 주기적으로 복구 여부만 확인
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """최근 window초 안의 연속 실패가 threshold에 닿으면 열림
+    
+    열린 뒤 reset_timeout초가 지나면 반열림 상태로 한 번에 한 건만 시험 호출(probe)을 보내고,
+    성공하면 닫고 실패하면 다시 reset_timeout만큼 연다.
+    """
+    
+    def __init__(self, threshold: int, window: float, reset_timeout: float):
+        self.threshold = max(1, threshold)
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = deque()
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """호출 가능 여부 (반열림 상태에서는 시험 호출 한 건만 허용)"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                print("    🔌 Gemini 회로 반열림: 복구 확인 시도")
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+    
+    def is_open(self) -> bool:
+        """호출하지 않고 상태만 확인 (반열림 전환 시각이 지났으면 False)"""
+        with self.lock:
+            if self.state == OPEN:
+                return time.monotonic() - self.opened_at < self.reset_timeout
+            return self.state == HALF_OPEN and self.probing
+    
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                print("    🔌 Gemini 회로 닫힘: 복구 확인")
+            self.state = CLOSED
+            self.failures.clear()
+            self.probing = False
+    
+    def record_failure(self):
+        with self.lock:
+            now = time.monotonic()
+            self.probing = False
+            
+            if self.state == HALF_OPEN:
+                self._open(now)
+                return
+            
+            self.failures.append(now)
+            while self.failures and now - self.failures[0] > self.window:
+                self.failures.popleft()
+            
+            if self.state == CLOSED and len(self.failures) >= self.threshold:
+                self._open(now)
+    
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.failures.clear()
+        print(f"    🔌 Gemini 회로 열림: {self.reset_timeout:.0f}초 동안 로컬 추정으로 대체")
@@ -4,12 +4,17 @@ AI News Telegram Bot - Configuration
 import os
 from dataclasses import dataclass
 from enum import Enum
+from typing import List, Optional
 
 # === API Keys ===
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
+# === API Endpoints (벤치마크/로컬 테스트 시 스텁 서버로 교체) ===
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org")
+
 # === Priority Levels ===
 class Priority(Enum):
     REALTIME = "realtime"
@@ -24,6 +29,7 @@ class NewsSource:
     source_type: str
     base_trust: int
     category: str
+    timeout: Optional[float] = None  # 소스별 읽기 타임아웃 (None이면 FEED_READ_TIMEOUT)
 
 # === News Sources (총 51개) ===
 NEWS_SOURCES = [
@@ -397,8 +403,125 @@ EXCLUDE_KEYWORDS = [
     "sponsor", "advertisement", "promoted", "job posting",
 ]
 
+# === Keyword Rules ===
+@dataclass
+class KeywordRule:
+    action: str                           # "include" | "exclude" | "boost"
+    keywords: List[str]
+    sources: Optional[List[str]] = None   # 적용할 소스 이름 (None이면 전체)
+    categories: Optional[List[str]] = None  # 적용할 카테고리 (None이면 전체)
+    weight: float = 1.0                   # boost 규칙의 키워드당 가산점
+    whole_word: bool = False              # False면 어간 매칭 ("launch" → "launched")
+
+KEYWORD_RULES = [
+    KeywordRule(action="boost", keywords=HIGH_IMPORTANCE_KEYWORDS),
+    KeywordRule(action="exclude", keywords=EXCLUDE_KEYWORDS),
+]
+
 # === Settings ===
 MAX_NEWS_PER_BATCH = 10
 SUMMARY_MAX_LENGTH = 300
 CACHE_HOURS = 48
+STATE_BACKEND = "sqlite"       # seen 상태 저장소: "sqlite" (data/state.db) 또는 "json" (data/seen_news.json)
 MAX_NEWS_AGE_HOURS = 24
+
+# === Collection Settings ===
+MAX_FETCH_WORKERS = 8          # 동시 피드 수집 워커 수 (1이면 순차 수집)
+MAX_FETCHES_PER_HOST = 2       # 호스트별 동시 요청 제한 (rsshub, reddit 등)
+HTTP_POOL_CONNECTIONS = 64     # 커넥션 풀을 유지할 호스트 수
+HTTP_POOL_MAXSIZE = 16         # 호스트별 keep-alive 연결 수 (동시 워커 수 이상)
+HTTP_RETRIES = 2               # 연결 실패 / 5xx(GET) 재시도 횟수
+HTTP_RETRY_BACKOFF = 0.5       # 재시도 대기 배수 (초)
+HTTP_RETRY_AFTER_MAX = 10      # 재시도 시 따를 Retry-After 상한 (초)
+FEED_CONNECT_TIMEOUT = 5       # 피드 연결 타임아웃 (초)
+FEED_READ_TIMEOUT = 15         # 피드 읽기 타임아웃 (초)
+FEED_FETCH_DEADLINE = 30       # 피드 하나의 전체 수신 제한 시간 (초), 본문이 느리게 흘러와도 끊음
+COLLECTION_DEADLINE = 90       # 전체 수집 제한 시간 (초), 초과 시 도착한 피드만 사용
+NEAR_DUPLICATE_DETECTION = True  # 여러 소스의 같은 기사를 하나로 묶음
+SIMHASH_MAX_DISTANCE = 3       # 같은 기사로 볼 SimHash 해밍 거리
+SIMHASH_BANDS = 4              # LSH 밴드 수 (SIMHASH_MAX_DISTANCE보다 커야 누락 없음)
+TITLE_JACCARD_MIN = 0.6        # 정규화한 제목 단어 Jaccard가 이 이상이면 같은 기사 (요약이 다른 HN/Reddit/재작성 기사용)
+TITLE_MIN_TOKENS = 3           # 제목 단어가 이보다 적으면 제목 비교 안 함 ("GPT-5 released" 같은 짧은 제목 오탐 방지)
+TITLE_TOKEN_MAX_POSTINGS = 200 # 이보다 많은 제목에 나온 단어("ai", "model")는 제목 후보 검색에 쓰지 않음 (조회 비용 제한)
+
+# === Analysis Settings ===
+ANALYSIS_CACHE_TTL_HOURS = 24 * 7   # Gemini 분석 결과 캐시 유지 시간
+ANALYSIS_CACHE_MAX_ENTRIES = 5000   # 캐시 최대 항목 수 (초과 시 오래된 것부터 제거)
+ANALYSIS_TIME_BUDGET = 600          # 실행당 분석 제한 시간 (초), 넘으면 남은 뉴스는 다음 실행으로 이월
+ANALYSIS_CALL_BUDGET = 60           # 실행당 Gemini 호출 한도 (0이면 무제한)
+ANALYSIS_BATCH_SIZE = 8             # 한 번의 Gemini 요청에 묶을 뉴스 수 (1이면 개별 분석)
+GEMINI_REQUESTS_PER_MINUTE = 10    # Gemini 분당 요청 한도 (요금제에 맞게 조정)
+GEMINI_TOKENS_PER_MINUTE = 250000   # Gemini 분당 토큰 한도
+GEMINI_MAX_CONCURRENCY = 4          # 동시 Gemini 요청 상한 (429/503 시 자동으로 줄어듦)
+GEMINI_MAX_RETRIES = 3              # 429/503 재시도 횟수
+GEMINI_STRUCTURED_OUTPUT = True     # responseSchema로 JSON 응답 강제 (파싱 실패/재번역 호출 감소)
+GEMINI_MODEL = "gemini-2.5-flash"   # 한국어 제목/요약까지 생성하는 전체 분석 모델
+
+# 모델 단계: 가벼운 모델로 점수만 먼저 매기고, 배치 기준을 넘는 뉴스만 전체 분석
+MODEL_CASCADE = True
+GEMINI_SCORE_MODEL = "gemini-2.5-flash-lite"  # 점수 전용 모델 (빈 문자열이면 GEMINI_MODEL에 짧은 프롬프트)
+CASCADE_MIN_SCORE = 5               # 보너스 포함 최종 점수가 이 이상이면 전체 분석 (배치 전송 기준)
+CASCADE_SCORE_BATCH_SIZE = 40       # 점수 요청 하나에 묶을 뉴스 수 (제목만 보내므로 전체 분석 묶음보다 크게)
+GEMINI_SCORE_REQUESTS_PER_MINUTE = 15  # 점수 전용 모델 분당 요청 한도 (모델별 한도라 전체 분석과 따로 계산)
+GEMINI_SCORE_DAILY_CALL_CAP = 1000  # 점수 전용 모델 일일 호출 한도 (0이면 무제한)
+
+# === Triage Settings (LLM 호출 전 로컬 선별) ===
+# 임시 점수 = 기본값 5 + 키워드 보너스 + 신뢰도 보너스 + 카테고리/최신성 보정 (_create_fallback과 같은 공식)
+TRIAGE_MIN_SCORE = 5.0              # 이보다 낮은 뉴스는 Gemini 분석 생략 (낮출수록 재현율↑, 비용↑, 0이면 끔)
+TRIAGE_CATEGORY_ADJUST = {
+    "community": -1.0,
+}
+TRIAGE_STALE_HOURS = 12             # 이보다 오래된(또는 날짜 없는) 뉴스는 감점
+TRIAGE_STALE_PENALTY = 0.5
+
+# === Daemon Settings (--mode daemon) ===
+DAEMON_REALTIME_INTERVAL_MINUTES = 30   # realtime.yml과 같은 주기
+DAEMON_BATCH_INTERVAL_MINUTES = 60      # batch.yml과 같은 주기
+DAEMON_DAILY_HOUR_UTC = 0               # daily.yml과 같은 시각 (KST 09:00)
+DAEMON_CHECKPOINT_MINUTES = 10          # 상태/캐시 저장 주기
+
+# === Telegram Delivery Settings ===
+TELEGRAM_GLOBAL_PER_SECOND = 30     # 봇 전체 초당 메시지 한도
+TELEGRAM_PER_CHAT_INTERVAL = 1.0    # 같은 채팅으로 보내는 최소 간격 (초)
+TELEGRAM_GROUP_PER_MINUTE = 20      # 그룹/채널 분당 메시지 한도
+TELEGRAM_MAX_RETRIES = 5            # 429/5xx/네트워크 오류 재시도 횟수
+TELEGRAM_MAX_RETRY_AFTER = 120      # 이보다 긴 retry_after는 기다리지 않고 다음 실행으로 미룸
+
+# === Streaming Pipeline Settings (--streaming) ===
+PIPELINE_QUEUE_SIZE = 32            # 단계 사이 큐 크기 (가득 차면 앞 단계가 대기)
+PIPELINE_BATCH_WAIT = 2.0           # 분석 묶음을 채우려고 기다리는 최대 시간 (초)
+
+# === Gemini Quota Budget ===
+GEMINI_DAILY_CALL_CAP = 250         # 일일 호출 한도 (0이면 무제한)
+GEMINI_WEEKLY_CALL_CAP = 1500       # 최근 7일 호출 한도 (0이면 무제한)
+GEMINI_DAILY_TOKEN_CAP = 0          # 일일 토큰 한도 (0이면 무제한)
+QUOTA_REALTIME_RESERVE = 0.2        # 실시간 알림 후보 전용으로 남겨둘 한도 비율
+QUOTA_RESERVED_MIN_TRUST = 9        # 이 신뢰도 이상 소스의 뉴스를 실시간 알림 후보로 간주
+QUOTA_DAY_UTC_OFFSET_HOURS = -8     # 할당량 날짜 기준 (Gemini는 태평양 시간 자정에 초기화)
+
+# === Gemini Circuit Breaker ===
+GEMINI_TIMEOUT = 30                 # Gemini 요청 타임아웃 (초)
+GEMINI_BREAKER_THRESHOLD = 3        # 이 횟수만큼 연속 실패(타임아웃/5xx/연결 오류)하면 회로 열림
+GEMINI_BREAKER_WINDOW = 120         # 실패를 세는 구간 (초)
+GEMINI_BREAKER_RESET = 60           # 회로가 열린 뒤 시험 호출까지 대기 (초)
+
+# === Run Metrics ===
+METRICS_ENABLED = True              # 실행별 지표를 data/run_metrics.jsonl, data/metrics_<mode>.prom에 기록
+METRICS_HISTORY_RUNS = 336          # run_metrics.jsonl에 남길 최근 실행 수 (30분 주기 기준 7일)
+
+# === Freshness Tracking (게시 → 수집 → 분석 → 전송) ===
+FRESHNESS_RETENTION_DAYS = 7        # data/freshness.json에 생애 주기 기록을 남길 기간
+FRESHNESS_MIN_SAMPLES = 5           # 소스 지연 원인을 판단할 최소 뉴스 수
+FRESHNESS_POLL_MINUTES = DAEMON_REALTIME_INTERVAL_MINUTES  # 수집 주기 (게시→수집 지연이 이보다 길면 피드 반영 지연)
+FRESHNESS_POLL_SHARE = 0.5          # 게시→수집 지연이 전체 게시→전송 지연에서 이 비율 이상이면 수집 주기가 원인
+
+# === Profiling (--profile) ===
+PROFILE_SAMPLE_INTERVAL_MS = 5      # 스택 샘플링 간격 (모든 스레드, 벽시계 기준)
+PROFILE_TRACEMALLOC = True          # tracemalloc으로 단계별 최대 메모리와 할당 위치 기록 (실행이 2-3배 느려짐)
+PROFILE_TRACEMALLOC_FRAMES = 10     # 할당 위치마다 저장할 스택 깊이
+PROFILE_TOP_N = 15                  # 요약에 출력할 함수/할당 위치 수
+PROFILE_KEEP_RUNS = 20              # data/profiles/에 남길 최근 프로파일 실행 수
+
+# === Record / Replay (--record, --replay) ===
+CASSETTE_FILE = "data/cassette.json.gz"  # 기본 카세트 경로 (피드/Gemini/텔레그램 응답 + 시작 시점 data/ 상태)
+CASSETTE_REPLAY_DIR = "data/replay"      # 재생 실행의 작업 디렉토리 (운영 data/ 상태는 건드리지 않음)
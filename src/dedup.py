@@ -0,0 +1,310 @@
+"""
+Near-Duplicate Detector - SimHash + LSH와 제목 Jaccard로 여러 소스의 같은 기사 묶기
+
+SimHash(제목+요약)는 본문까지 거의 같은 사본을, 제목 Jaccard는 요약이 전혀 다른
+HN/Reddit 링크 글이나 제목만 조금 바꾼 재작성 기사를 잡는다.
+제목 비교는 숫자/고유명사/사건 단어가 서로 다르면 Jaccard가 높아도 다른 기사로 본다.
+("Llama 4 Scout" / "Llama 4 Maverick", "releases Gemini 3" / "delays Gemini 3")
+"""
+import hashlib
+import json
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from config import (
+    CACHE_HOURS, SIMHASH_MAX_DISTANCE, SIMHASH_BANDS,
+    TITLE_JACCARD_MIN, TITLE_MIN_TOKENS, TITLE_TOKEN_MAX_POSTINGS,
+)
+
+SIMHASH_BITS = 64
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "by",
+    "is", "are", "was", "be", "its", "it", "at", "as", "from", "this", "that",
+    "new", "how", "why", "what", "now", "just",
+}
+
+
+# 같은 발표를 소스마다 다르게 표현하는 동사/머리말 (제목 비교에서만 제외)
+TITLE_STOPWORDS = STOPWORDS | {
+    "introducing", "introduces", "announces", "announced", "announcing", "launches", "launched",
+    "launching", "releases", "released", "releasing", "unveils", "unveiled", "debuts", "says",
+    "our", "their", "yet", "here", "today", "show", "ask", "hn",
+}
+
+# 발표와 다른 사건을 나타내는 단어 (한쪽 제목에만 있으면 다른 기사)
+EVENT_WORDS = {
+    "delay", "delayed", "postpone", "postponed", "cancel", "cancelled", "canceled", "pause", "paused",
+    "halt", "halted", "ban", "banned", "sue", "sued", "lawsuit", "acquire", "acquired", "acquisition",
+    "buy", "recall", "recalled", "deprecate", "deprecated", "retire", "retired", "shut", "shutdown",
+    "kill", "killed", "leak", "leaked", "fire", "fired", "layoff", "hack", "hacked", "breach",
+    "outage", "fine", "fined", "probe", "investigate", "block", "blocked", "reject", "rejected",
+    "approve", "approved", "rollback", "rename", "renamed",
+}
+
+# HN/Reddit 머리말 ("Show HN:", "[N]", "[R]")과 " - TechCrunch" 같은 사이트 이름 꼬리
+_TITLE_PREFIX = re.compile(r"^\s*(?:(?:show|ask|launch|tell)\s+hn\s*:|\[[a-z]\])\s*", re.IGNORECASE)
+_TITLE_SUFFIX = re.compile(r"\s+[|\-–—]\s+(?:\S+\s*){1,3}$")
+
+
+def _tokenize(text: str) -> List[str]:
+    text = re.sub(r"[^\w\s-]", " ", text.lower())
+    return [t for t in text.split() if t not in STOPWORDS and len(t) > 1]
+
+
+def title_signature(title: str) -> Tuple[List[str], List[str]]:
+    """제목 비교용 (단어 집합, 고유명사 단어)
+    
+    머리말/사이트 이름/발표 동사를 빼고 복수형 s를 떼며 숫자는 유지한다.
+    고유명사는 첫 단어가 아닌데 대문자로 시작하는 단어 (Title Case 제목이면 더 많이 잡혀 더 엄격해짐).
+    """
+    title = _TITLE_SUFFIX.sub("", _TITLE_PREFIX.sub("", title))
+    tokens = set()
+    entities = set()
+    for position, word in enumerate(re.sub(r"[^\w\s.-]", " ", title).split()):
+        token = word.lower().strip(".-")
+        if not token or token in TITLE_STOPWORDS or (len(token) < 2 and not token.isdigit()):
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+        if position > 0 and word[0].isupper():
+            entities.add(token)
+    return sorted(tokens), sorted(entities)
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def same_title(tokens: Set[str], entities: Set[str], other_tokens: Set[str], other_entities: Set[str]) -> bool:
+    """제목 Jaccard가 기준 이상이고 숫자/고유명사/사건 단어가 어긋나지 않으면 같은 기사
+    
+    한쪽에만 고유명사/숫자가 있는 것은 허용하지만 ("Gemma 3" / "Google ... Gemma 3"),
+    양쪽에 서로 다른 고유명사나 숫자가 있거나 한쪽에만 사건 단어가 있으면 다른 기사다.
+    """
+    if min(len(tokens), len(other_tokens)) < TITLE_MIN_TOKENS or jaccard(tokens, other_tokens) < TITLE_JACCARD_MIN:
+        return False
+    only = tokens - other_tokens
+    other_only = other_tokens - tokens
+    if (only | other_only) & EVENT_WORDS:
+        return False
+    if any(_has_digit(t) for t in only) and any(_has_digit(t) for t in other_only):
+        return False
+    if (only & entities) and (other_only & other_entities):
+        return False
+    return True
+
+
+def _has_digit(token: str) -> bool:
+    return any(c.isdigit() for c in token)
+
+
+def simhash(title: str, summary: str) -> int:
+    """제목(가중치 2) + 요약 단어로 64비트 SimHash 계산"""
+    weights: Dict[str, int] = {}
+    for token in _tokenize(title):
+        weights[token] = weights.get(token, 0) + 2
+    for token in _tokenize(summary)[:80]:
+        weights[token] = weights.get(token, 0) + 1
+    
+    vector = [0] * SIMHASH_BITS
+    for token, weight in weights.items():
+        h = int.from_bytes(hashlib.md5(token.encode('utf-8')).digest()[:8], 'big')
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += weight if (h >> bit) & 1 else -weight
+    
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if vector[bit] > 0:
+            value |= 1 << bit
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """밴드 단위 LSH 인덱스 + 제목 단어 역색인 (실행 간 data/dedup_index.json으로 유지)
+    
+    해밍 거리 SIMHASH_MAX_DISTANCE 이하인 두 해시는 비둘기집 원리에 따라
+    SIMHASH_BANDS개 밴드 중 최소 하나가 일치하므로 후보로 찾을 수 있다.
+    제목 Jaccard가 기준 이상인 두 제목은 단어를 하나 이상 공유하므로 역색인으로 모두 찾는다.
+    """
+    
+    def __init__(self, cache_dir: str = "data"):
+        self.index_file = Path(cache_dir) / "dedup_index.json"
+        self.band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self.entries: Dict[str, dict] = self._load()
+        self.buckets: Dict[str, Set[str]] = {}
+        self._rebuild()
+    
+    def _load(self) -> dict:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+    
+    def _rebuild(self):
+        self.buckets = {}
+        for news_id, entry in self.entries.items():
+            self._add_to_buckets(news_id, entry)
+    
+    def _band_keys(self, value: int) -> List[str]:
+        mask = (1 << self.band_bits) - 1
+        return [f"{band}:{(value >> (band * self.band_bits)) & mask}" for band in range(SIMHASH_BANDS)]
+    
+    def _keys(self, value: int, tokens: List[str]) -> List[str]:
+        keys = self._band_keys(value)
+        if len(tokens) >= TITLE_MIN_TOKENS:
+            keys += [f"t:{token}" for token in tokens]
+        return keys
+    
+    def _add_to_buckets(self, news_id: str, entry: dict):
+        for key in self._keys(entry['simhash'], entry.get('title_tokens', [])):
+            self.buckets.setdefault(key, set()).add(news_id)
+    
+    def _title_candidates(self, tokens: List[str]) -> Set[str]:
+        """제목 Jaccard 후보 (prefix filtering)
+        
+        Jaccard >= J인 제목은 이 제목의 단어 중 ceil(J * n)개 이상을 공유하므로,
+        가장 드문 n - ceil(J * n) + 1개 단어의 목록만 보면 된다.
+        "ai", "model"처럼 TITLE_TOKEN_MAX_POSTINGS개보다 많은 제목에 나온 단어는 건너뛴다.
+        """
+        if len(tokens) < TITLE_MIN_TOKENS:
+            return set()
+        postings = sorted((self.buckets.get(f"t:{token}", set()) for token in tokens), key=len)
+        prefix = len(tokens) - math.ceil(TITLE_JACCARD_MIN * len(tokens)) + 1
+        candidates = set()
+        for ids in postings[:prefix]:
+            if len(ids) <= TITLE_TOKEN_MAX_POSTINGS:
+                candidates.update(ids)
+        return candidates
+    
+    def find(self, value: int, tokens: List[str], entities: List[str]) -> Optional[str]:
+        """같은 기사로 볼 가장 가까운 기존 항목 id (없으면 None)
+        
+        SimHash 거리가 기준 이하이거나 same_title이면 같은 기사로 보고,
+        그중 제목이 가장 비슷하고 SimHash가 가장 가까운 항목을 고른다.
+        """
+        title = set(tokens)
+        title_entities = set(entities)
+        best_id = None
+        best_key = None
+        candidates = self._title_candidates(tokens)
+        for key in self._band_keys(value):
+            candidates.update(self.buckets.get(key, ()))
+        
+        for news_id in candidates:
+            entry = self.entries[news_id]
+            distance = hamming(value, entry['simhash'])
+            other = set(entry.get('title_tokens', []))
+            matched = same_title(title, title_entities, other, set(entry.get('title_entities', [])))
+            if distance > SIMHASH_MAX_DISTANCE and not matched:
+                continue
+            key = (jaccard(title, other), -distance)
+            if best_key is None or key > best_key:
+                best_id, best_key = news_id, key
+        return best_id
+    
+    def add(self, news_id: str, value: int, tokens: List[str], entities: List[str], source_name: str, source_trust: int):
+        self.entries[news_id] = {
+            'simhash': value,
+            'title_tokens': tokens,
+            'title_entities': entities,
+            'source_name': source_name,
+            'source_trust': source_trust,
+            'seen_at': datetime.now(timezone.utc).isoformat(),
+            'current_run': True,
+        }
+        self._add_to_buckets(news_id, self.entries[news_id])
+    
+    def remove(self, news_id: str):
+        entry = self.entries.pop(news_id, None)
+        if entry is None:
+            return
+        for key in self._keys(entry['simhash'], entry.get('title_tokens', [])):
+            self.buckets.get(key, set()).discard(news_id)
+    
+    def start_run(self):
+        """새 수집 시작: 만료 항목 제거, 이전 실행 항목 표시 (데몬처럼 한 프로세스에서 반복 수집할 때도)"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=CACHE_HOURS)).isoformat()
+        self.entries = {
+            news_id: {**entry, 'current_run': False}
+            for news_id, entry in self.entries.items()
+            if entry.get('seen_at', '') > cutoff
+        }
+        self._rebuild()
+    
+    def save(self):
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=CACHE_HOURS)).isoformat()
+        alive = {
+            news_id: {k: v for k, v in entry.items() if k != 'current_run'}
+            for news_id, entry in self.entries.items()
+            if entry.get('seen_at', '') > cutoff
+        }
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            json.dump(alive, f, ensure_ascii=False)
+
+
+def cluster_near_duplicates(
+    items: list,
+    index: NearDuplicateIndex,
+    representatives: Optional[dict] = None,
+    stage_of: Optional[Callable[[str], Optional[str]]] = None
+) -> list:
+    """신뢰도 높은 소스를 대표로 남기고 나머지는 also_reported_by로 합침
+    
+    이전 실행의 같은 기사는 이미 전송됐거나, 분석됐고 신뢰도가 같거나 높을 때만 새 항목을 제외한다.
+    (사전 선별/이월로 분석되지 않았거나 신뢰도가 낮았던 사본은 새 사본으로 교체)
+    stage_of는 뉴스 id가 도달한 단계('analyzed', 'delivered' 등)를 돌려준다 (없으면 이전 항목은 모두 제외 기준).
+    반환 순서는 입력 순서를 따른다 (빠진 항목은 호출한 쪽에서 seen 처리해 매번 다시 비교하지 않게 한다).
+    스트리밍 수집처럼 여러 번 나눠 호출할 때는 같은 representatives dict를 넘긴다.
+    """
+    by_id = representatives if representatives is not None else {}
+    by_id.update({item.id: item for item in items})
+    keep = set()
+    
+    ranked = sorted(items, key=lambda x: x.source_trust, reverse=True)
+    for item in ranked:
+        value = simhash(item.title, item.summary)
+        tokens, entities = title_signature(item.title)
+        match_id = index.find(value, tokens, entities)
+        
+        # 아직 seen 처리되지 않은 같은 기사가 다시 수집된 경우
+        if match_id == item.id:
+            index.entries[match_id]['current_run'] = True
+            keep.add(item.id)
+            continue
+        
+        previous = index.entries[match_id] if match_id is not None else None
+        if previous is not None and not previous.get('current_run'):
+            stage = stage_of(match_id) if stage_of is not None else 'delivered'
+            handled = stage == 'delivered' or (
+                stage == 'analyzed' and previous.get('source_trust', 10) >= item.source_trust
+            )
+            if handled:
+                continue
+            index.remove(match_id)
+            match_id = None
+        
+        if match_id is None:
+            index.add(item.id, value, tokens, entities, item.source_name, item.source_trust)
+            keep.add(item.id)
+            continue
+        
+        representative = by_id.get(match_id)
+        if representative is not None:
+            if item.source_name != representative.source_name and item.source_name not in representative.also_reported_by:
+                representative.also_reported_by.append(item.source_name)
+    
+    return [item for item in items if item.id in keep]
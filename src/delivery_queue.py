@@ -0,0 +1,209 @@
+"""
+Delivery Queue - 텔레그램 flood control을 지키는 전송 대기열
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from config import (
+    TELEGRAM_GLOBAL_PER_SECOND, TELEGRAM_PER_CHAT_INTERVAL, TELEGRAM_GROUP_PER_MINUTE,
+    TELEGRAM_MAX_RETRIES, TELEGRAM_MAX_RETRY_AFTER,
+)
+from rate_limiter import TokenBucket
+from run_metrics import METRICS
+
+SENT = "sent"
+QUEUED = "queued"
+FAILED = "failed"
+
+
+class DeliveryQueue:
+    """sendMessage 요청을 순서대로 속도 제한에 맞춰 전송
+    
+    재시도 한도를 넘긴 메시지는 data/outbox.json에 보관했다가 다음 실행에서 먼저 보낸다.
+    """
+    
+    def __init__(self, session: requests.Session, url: str, cache_dir: str = "data"):
+        self.session = session
+        self.url = url
+        self.outbox_file = Path(cache_dir) / "outbox.json"
+        self.pending = deque(self._load())
+        self.failed_ids = set()
+        self.global_bucket = TokenBucket(TELEGRAM_GLOBAL_PER_SECOND * 60)
+        self.group_buckets: Dict[str, TokenBucket] = {}
+        self.last_sent: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        self.flushing = False
+        # 실제로 전송된 메시지마다 호출 (outbox에서 나중에 나간 메시지 포함)
+        self.on_sent: Optional[Callable[[dict], None]] = None
+        
+        if self.pending:
+            print(f"📮 지난 실행에서 못 보낸 메시지 {len(self.pending)}개 대기 중")
+    
+    def _load(self) -> list:
+        if self.outbox_file.exists():
+            try:
+                with open(self.outbox_file, 'r', encoding='utf-8') as f:
+                    messages = json.load(f)
+            except:
+                return []
+            # 실행마다 재시도 횟수를 새로 부여 (not_before는 유지해 flood wait를 지킴)
+            for message in messages:
+                message["attempts"] = 0
+            return messages
+        return []
+    
+    def _save(self):
+        if not self.pending and not self.outbox_file.exists():
+            return
+        self.outbox_file.parent.mkdir(exist_ok=True)
+        with open(self.outbox_file, 'w', encoding='utf-8') as f:
+            json.dump(list(self.pending), f, ensure_ascii=False)
+    
+    def _wait_for_slot(self, chat_id: str):
+        """전체 / 그룹 / 채팅별 전송 한도 대기"""
+        self.global_bucket.acquire(1)
+        
+        # 그룹/채널 chat_id는 음수
+        if chat_id.startswith("-"):
+            if chat_id not in self.group_buckets:
+                self.group_buckets[chat_id] = TokenBucket(TELEGRAM_GROUP_PER_MINUTE)
+            self.group_buckets[chat_id].acquire(1)
+        
+        last = self.last_sent.get(chat_id)
+        if last is not None:
+            wait = TELEGRAM_PER_CHAT_INTERVAL - (time.monotonic() - last)
+            if wait > 0:
+                time.sleep(wait)
+    
+    def _post(self, payload: dict) -> Tuple[str, Optional[float], str]:
+        """(결과: ok/retry/transient/permanent, 대기 초, 설명)"""
+        started = time.perf_counter()
+        status, retry_after, description = self._post_once(payload)
+        METRICS.record_send(time.perf_counter() - started, status, description)
+        return status, retry_after, description
+    
+    def _post_once(self, payload: dict) -> Tuple[str, Optional[float], str]:
+        try:
+            response = self.session.post(self.url, json=payload, timeout=30)
+        except Exception as e:
+            return "transient", None, str(e)
+        
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        
+        if result.get("ok"):
+            return "ok", None, ""
+        
+        description = result.get("description", f"HTTP {response.status_code}")
+        if response.status_code == 429:
+            retry_after = result.get("parameters", {}).get("retry_after", 1)
+            return "retry", float(retry_after), description
+        if response.status_code >= 500:
+            return "transient", None, description
+        return "permanent", None, description
+    
+    def _defer(self, message: dict, seconds: float):
+        """대기 요청을 outbox에 기록 (다음 submit/실행도 이 시각 전에는 보내지 않음)"""
+        with self.lock:
+            message["not_before"] = time.time() + seconds
+            self._save()
+    
+    def _pause(self, message: dict, seconds: float):
+        """짧은 대기는 잠금 없이 잠든다 (그 사이 submit은 outbox에만 넣고 바로 반환)"""
+        self._defer(message, seconds)
+        time.sleep(seconds)
+    
+    def flush(self):
+        """대기열을 순서대로 전송 (실패 시 남은 메시지는 outbox에 보관)"""
+        with self.lock:
+            # 다른 스레드가 전송 중이면 그쪽이 새 메시지까지 이어서 보냄
+            if self.flushing or not self.pending:
+                return
+            wait = self.pending[0].get("not_before", 0) - time.time()
+            if wait > 0:
+                print(f"📮 텔레그램 대기 요청으로 {wait:.0f}초 동안 전송 보류 ({len(self.pending)}개)")
+                self._save()
+                return
+            self.flushing = True
+        
+        try:
+            self._drain()
+        finally:
+            with self.lock:
+                self.flushing = False
+                self._save()
+    
+    def _drain(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return
+                message = self.pending[0]
+            chat_id = str(message["payload"].get("chat_id", ""))
+            self._wait_for_slot(chat_id)
+            
+            status, retry_after, description = self._post(message["payload"])
+            self.last_sent[chat_id] = time.monotonic()
+            
+            if status == "ok":
+                with self.lock:
+                    self.pending.popleft()
+                print("✅ 메시지 전송 성공")
+                if self.on_sent is not None:
+                    self.on_sent(message)
+                continue
+            
+            if status == "permanent":
+                with self.lock:
+                    self.pending.popleft()
+                    self.failed_ids.add(message["id"])
+                print(f"❌ 전송 실패: {description}")
+                continue
+            
+            message["attempts"] = message.get("attempts", 0) + 1
+            # 일시적 오류는 지수 백오프 + 지터
+            backoff = min(30.0, 2 ** message["attempts"]) * random.uniform(0.5, 1.5)
+            if message["attempts"] > TELEGRAM_MAX_RETRIES:
+                print(f"📮 재시도 한도 초과, 다음 실행에서 재전송: {description}")
+                self._defer(message, retry_after if status == "retry" else backoff)
+                return
+            
+            if status == "retry":
+                if retry_after > TELEGRAM_MAX_RETRY_AFTER:
+                    print(f"📮 {retry_after:.0f}초 대기 요청, 다음 실행에서 재전송")
+                    self._defer(message, retry_after)
+                    return
+                print(f"⏳ 텔레그램 flood control: {retry_after:.0f}초 대기")
+                self._pause(message, retry_after)
+            else:
+                print(f"⚠️ 전송 오류 ({description}), {backoff:.1f}초 후 재시도")
+                self._pause(message, backoff)
+    
+    def submit(self, payload: dict, news_ids: Optional[List[str]] = None, mode: Optional[str] = None) -> str:
+        """메시지를 대기열 끝에 넣고 전송 (sent / queued / failed)
+        
+        news_ids, mode는 outbox에도 함께 저장되어 실제 전송 시점에 on_sent로 전달된다.
+        """
+        message = {"id": uuid.uuid4().hex, "payload": payload, "attempts": 0}
+        if news_ids:
+            message.update(news_ids=list(news_ids), mode=mode)
+        with self.lock:
+            self.pending.append(message)
+        
+        self.flush()
+        
+        if message["id"] in self.failed_ids:
+            return FAILED
+        if any(m["id"] == message["id"] for m in self.pending):
+            return QUEUED
+        return SENT
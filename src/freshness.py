@@ -0,0 +1,190 @@
+"""
+Freshness Tracker - 뉴스별 게시 → 첫 수집 → 분석 → 전송 시각 기록과 지연 백분위수 집계
+"""
+import json
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config import (
+    FRESHNESS_RETENTION_DAYS, FRESHNESS_MIN_SAMPLES, FRESHNESS_POLL_MINUTES, FRESHNESS_POLL_SHARE,
+)
+from run_metrics import percentile
+
+
+def _minutes(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    """두 ISO 시각 사이 분 (게시 시각이 미래로 찍힌 피드는 0으로 처리)"""
+    if not start or not end:
+        return None
+    try:
+        delta = datetime.fromisoformat(end) - datetime.fromisoformat(start)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, delta.total_seconds() / 60)
+
+
+def _rollup(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        **{f"p{p}": round(percentile(values, p), 1) for p in (50, 95, 99)},
+    }
+
+
+class FreshnessTracker:
+    """data/freshness.json에 뉴스 id별 생애 주기 시각 저장
+    
+    published   : 피드에 적힌 게시 시각
+    first_seen  : 처음 수집한 시각 (이월/재수집돼도 최초 값 유지)
+    analyzed    : 분석 완료 시각
+    delivered   : 텔레그램 전송 시각과 전송 모드
+    """
+    
+    def __init__(self, cache_dir: str = "data"):
+        self.cache_dir = Path(cache_dir)
+        self.records_file = self.cache_dir / "freshness.json"
+        self.report_file = self.cache_dir / "freshness_report.json"
+        self.records: Dict[str, dict] = self._load()
+        self.lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, dict]:
+        if self.records_file.exists():
+            try:
+                with open(self.records_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+    
+    def _now(self) -> str:
+        return datetime.now(timezone.utc).isoformat()
+    
+    def seen(self, items: Iterable):
+        """수집된 NewsItem 기록 (이미 있는 id는 첫 수집 시각 유지)"""
+        with self.lock:
+            for item in items:
+                record = self.records.setdefault(item.id, {})
+                record.setdefault("source", item.source_name)
+                record.setdefault("published", item.published_dt.isoformat() if item.published_dt else None)
+                record.setdefault("first_seen", item.collected_at)
+    
+    def analyzed(self, news_ids: Iterable[str]):
+        now = self._now()
+        with self.lock:
+            for news_id in news_ids:
+                if news_id in self.records:
+                    self.records[news_id].setdefault("analyzed", now)
+    
+    def delivered(self, news_ids: Iterable[str], mode: str):
+        now = self._now()
+        with self.lock:
+            for news_id in news_ids:
+                record = self.records.get(news_id)
+                if record is not None and "delivered" not in record:
+                    record["delivered"] = now
+                    record["mode"] = mode
+    
+    def stage(self, news_id: str) -> Optional[str]:
+        """뉴스가 도달한 마지막 단계 ('delivered' / 'analyzed' / 'seen', 기록이 없으면 None)"""
+        with self.lock:
+            record = self.records.get(news_id)
+        if record is None:
+            return None
+        for stage in ("delivered", "analyzed"):
+            if stage in record:
+                return stage
+        return "seen"
+    
+    def report(self) -> dict:
+        """모드별 / 소스별 지연 백분위수 (분)와 지연 원인이 수집 쪽에 있는 소스"""
+        with self.lock:
+            records = list(self.records.values())
+        
+        by_mode = defaultdict(list)
+        by_source_total = defaultdict(list)
+        by_source_feed = defaultdict(list)
+        by_source_pipeline = defaultdict(list)
+        by_source_mode = defaultdict(lambda: defaultdict(list))
+        
+        for record in records:
+            # 게시 → 첫 수집: 피드 반영 지연 + 수집 주기 대기
+            feed_lag = _minutes(record.get("published"), record.get("first_seen"))
+            if feed_lag is not None:
+                by_source_feed[record["source"]].append(feed_lag)
+            
+            if "delivered" not in record:
+                continue
+            
+            total = _minutes(record.get("published"), record["delivered"])
+            if total is not None:
+                by_mode[record["mode"]].append(total)
+                by_source_total[record["source"]].append(total)
+                by_source_mode[record["source"]][record["mode"]].append(total)
+            # 첫 수집 → 전송: 분석/전송 대기 (이월 포함)
+            pipeline = _minutes(record.get("first_seen"), record["delivered"])
+            if pipeline is not None:
+                by_source_pipeline[record["source"]].append(pipeline)
+        
+        sources = {}
+        lagging = []
+        for source in sorted(set(by_source_feed) | set(by_source_total)):
+            feed = by_source_feed.get(source, [])
+            total = by_source_total.get(source, [])
+            sources[source] = {
+                "publish_to_delivery": _rollup(total),
+                "publish_to_first_seen": _rollup(feed),
+                "first_seen_to_delivery": _rollup(by_source_pipeline.get(source, [])),
+                "publish_to_delivery_by_mode": {
+                    mode: _rollup(values) for mode, values in sorted(by_source_mode[source].items())
+                },
+            }
+            
+            if len(feed) < FRESHNESS_MIN_SAMPLES:
+                continue
+            feed_p50 = percentile(feed, 50)
+            total_p50 = percentile(total, 50) if total else 0.0
+            
+            # 수집 주기만으로는 설명되지 않는 지연 = 피드 자체가 늦게 반영
+            if feed_p50 > FRESHNESS_POLL_MINUTES:
+                lagging.append({"source": source, "cause": "feed_lag", "publish_to_first_seen_p50": round(feed_p50, 1)})
+            elif total_p50 > 0 and feed_p50 / total_p50 >= FRESHNESS_POLL_SHARE:
+                lagging.append({"source": source, "cause": "polling", "publish_to_first_seen_p50": round(feed_p50, 1)})
+        
+        return {
+            "generated_at": self._now(),
+            "poll_minutes": FRESHNESS_POLL_MINUTES,
+            "modes": {mode: _rollup(values) for mode, values in sorted(by_mode.items())},
+            "sources": sources,
+            "lagging_sources": lagging,
+        }
+    
+    def save(self) -> dict:
+        """보존 기간이 지난 기록 정리 후 저장, 집계 결과는 freshness_report.json으로"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=FRESHNESS_RETENTION_DAYS)).isoformat()
+        with self.lock:
+            self.records = {
+                news_id: record for news_id, record in self.records.items()
+                if (record.get("first_seen") or "") >= cutoff
+            }
+            self.cache_dir.mkdir(exist_ok=True)
+            with open(self.records_file, 'w', encoding='utf-8') as f:
+                json.dump(self.records, f, ensure_ascii=False)
+        
+        report = self.report()
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+    
+    def print_summary(self, report: dict):
+        for mode, rollup in report["modes"].items():
+            print(
+                f"⏱️ 게시→전송 지연 [{mode}] p50 {rollup['p50']:.0f}분 / "
+                f"p95 {rollup['p95']:.0f}분 / p99 {rollup['p99']:.0f}분 ({rollup['count']}건)"
+            )
+        if report["lagging_sources"]:
+            causes = {"feed_lag": "피드 반영 지연", "polling": "수집 주기"}
+            print("🐢 지연 원인이 수집 쪽인 소스: " + ", ".join(
+                f"{s['source']} ({causes[s['cause']]}, 게시→수집 p50 {s['publish_to_first_seen_p50']:.0f}분)"
+                for s in report["lagging_sources"]
+            ))
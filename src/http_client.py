@@ -0,0 +1,67 @@
+"""
+HTTP Client - 수집기, 분석기, 봇이 함께 쓰는 keep-alive 세션
+"""
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+
+from config import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_RETRIES, HTTP_RETRY_BACKOFF, HTTP_RETRY_AFTER_MAX,
+)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class CappedRetry(Retry):
+    """Retry-After를 따르되 HTTP_RETRY_AFTER_MAX초까지만 대기 (urllib3 기본 상한은 6시간)"""
+    
+    def sleep_for_retry(self, response) -> bool:
+        retry_after = self.get_retry_after(response)
+        if retry_after:
+            time.sleep(min(retry_after, HTTP_RETRY_AFTER_MAX))
+            return True
+        return False
+
+
+def create_session() -> requests.Session:
+    """호스트별 커넥션 풀과 재시도 정책을 가진 세션 생성"""
+    session = requests.Session()
+    
+    # 연결 실패는 모든 메서드 재시도, 5xx 응답 재시도는 GET만 (POST는 호출 측에서 처리)
+    retry = CappedRetry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        read=False,
+        status=HTTP_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    # brotli 패키지가 설치되어 있으면 "br"도 포함됨
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+def get_session() -> requests.Session:
+    """프로세스 전체에서 공유하는 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
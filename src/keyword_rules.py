@@ -0,0 +1,146 @@
+"""
+Keyword Rules - Aho-Corasick 기반 포함/제외/가산 키워드 규칙 엔진
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from config import KeywordRule, KEYWORD_RULES
+
+
+class AhoCorasick:
+    """여러 키워드를 한 번의 텍스트 순회로 찾는 오토마톤"""
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append(index)
+        
+        # BFS로 실패 링크 구성
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+    
+    def search(self, text: str) -> List[Tuple[int, int]]:
+        """(시작 위치, 패턴 인덱스) 목록 반환"""
+        matches = []
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for index in self.output[node]:
+                matches.append((i - len(self.patterns[index]) + 1, index))
+        return matches
+
+
+@dataclass
+class RuleResult:
+    """뉴스 한 건에 대한 규칙 적용 결과"""
+    excluded: bool
+    boost: float
+    matched: List[str]
+
+
+def _is_word_char(char: str) -> bool:
+    # 한글은 조사가 붙으므로 영문/숫자에만 단어 경계를 적용
+    return char.isascii() and (char.isalnum() or char == '_')
+
+
+class RuleEngine:
+    """규칙 전체를 하나의 오토마톤으로 컴파일해 뉴스마다 한 번만 스캔"""
+    
+    def __init__(self, rules: List[KeywordRule]):
+        self.rules = rules
+        self.keywords: List[str] = []
+        keyword_index: Dict[str, int] = {}
+        # 키워드 인덱스 -> (규칙 인덱스, whole_word) 목록
+        self.keyword_rules: List[List[Tuple[int, bool]]] = []
+        
+        for rule_index, rule in enumerate(rules):
+            for keyword in rule.keywords:
+                keyword = keyword.lower().strip()
+                if not keyword:
+                    continue
+                if keyword not in keyword_index:
+                    keyword_index[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.keyword_rules.append([])
+                self.keyword_rules[keyword_index[keyword]].append((rule_index, rule.whole_word))
+        
+        self.automaton = AhoCorasick(self.keywords)
+    
+    def _rule_applies(self, rule: KeywordRule, source_name: str, category: str) -> bool:
+        if rule.sources and source_name not in rule.sources:
+            return False
+        if rule.categories and category not in rule.categories:
+            return False
+        return True
+    
+    def _matched_rules(self, text: str) -> Dict[int, Set[str]]:
+        """규칙 인덱스 -> 매칭된 키워드 집합"""
+        matched: Dict[int, Set[str]] = {}
+        for start, index in self.automaton.search(text):
+            keyword = self.keywords[index]
+            end = start + len(keyword)
+            # 단어 시작 경계는 항상 확인 ("agi"가 "magic"에 매칭되지 않도록)
+            if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(keyword[0]):
+                continue
+            ends_inside_word = end < len(text) and _is_word_char(text[end]) and _is_word_char(keyword[-1])
+            for rule_index, whole_word in self.keyword_rules[index]:
+                if whole_word and ends_inside_word:
+                    continue
+                matched.setdefault(rule_index, set()).add(keyword)
+        return matched
+    
+    def evaluate(self, text: str, source_name: str = "", category: str = "") -> RuleResult:
+        matched = self._matched_rules(text.lower())
+        
+        excluded = False
+        boost = 0.0
+        has_include_rule = False
+        included = False
+        matched_keywords: Set[str] = set()
+        
+        for rule_index, rule in enumerate(self.rules):
+            if not self._rule_applies(rule, source_name, category):
+                continue
+            keywords = matched.get(rule_index, set())
+            if rule.action == "include":
+                has_include_rule = True
+                included = included or bool(keywords)
+            elif rule.action == "exclude" and keywords:
+                excluded = True
+            elif rule.action == "boost":
+                boost += rule.weight * len(keywords)
+            matched_keywords |= keywords
+        
+        if has_include_rule and not included:
+            excluded = True
+        
+        return RuleResult(excluded=excluded, boost=boost, matched=sorted(matched_keywords))
+
+
+# 시작 시 한 번만 컴파일
+RULE_ENGINE = RuleEngine(KEYWORD_RULES)
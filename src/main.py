@@ -5,43 +5,70 @@ AI News Telegram Bot - Main Entry Point
     --mode realtime : 실시간 체크 (30분마다) - 중요도 8+ 즉시 전송
     --mode batch    : 6시간 배치 - 중요도 5-7 모아서 전송
     --mode daily    : 일일 요약 - 전체 요약 전송
+    --mode daemon   : 상주 실행 - 위 세 주기를 한 프로세스에서 처리
     --mode test     : 연결 테스트
+
+    --profile       : CPU/스택 샘플/단계 구간/메모리 프로파일을 data/profiles/에 저장
+    --record        : 피드/Gemini/텔레그램 응답과 시작 상태를 data/cassette.json.gz에 기록
+    --replay        : 기록된 카세트로 네트워크 없이 같은 실행 재현 (data/replay/)
 """
 import argparse
+import contextlib
+import signal
 import sys
 import os
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import List
 
 # 모듈 경로 설정
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from config import Priority, MAX_NEWS_PER_BATCH
+from config import (
+    Priority, MAX_NEWS_PER_BATCH,
+    DAEMON_REALTIME_INTERVAL_MINUTES, DAEMON_BATCH_INTERVAL_MINUTES,
+    DAEMON_DAILY_HOUR_UTC, DAEMON_CHECKPOINT_MINUTES, CASSETTE_FILE,
+)
 from news_collector import NewsCollector
-from ai_analyzer import AIAnalyzer
+from ai_analyzer import AIAnalyzer, AnalyzedNews
 from telegram_bot import TelegramBot
+from scheduler import CadenceScheduler
+from pipeline import run_streaming_realtime
+from run_metrics import METRICS
 
 
-def run_realtime():
-    """실시간 모드 - 중요 뉴스 즉시 전송"""
-    print("\n" + "="*50)
-    print("🚨 실시간 모드 실행")
-    print("="*50)
-    
-    collector = NewsCollector(cache_dir="data")
-    analyzer = AIAnalyzer()
-    bot = TelegramBot()
-    
+def collect_and_analyze(collector: NewsCollector, analyzer: AIAnalyzer) -> List[AnalyzedNews]:
+    """뉴스 수집 → 사전 선별 → AI 분석 (모든 모드 공통)"""
     # 뉴스 수집
-    news_items = collector.collect_all()
+    with METRICS.stage("collect"):
+        news_items = collector.collect_all()
     
     if not news_items:
         print("📭 새로운 뉴스가 없습니다")
-        return
+        return []
     
-    # AI 분석
-    analyzed = analyzer.analyze_batch(news_items)
+    # 사전 선별 (가망 없는 뉴스는 분석 없이 seen 처리)
+    with METRICS.stage("triage"):
+        news_items, skipped = analyzer.triage(news_items)
+        collector.mark_multiple_as_seen([n.id for n in skipped])
     
-    # 실시간 알림 (중요도 8 이상)
+    # AI 분석 (예산 안에서 중요해 보이는 순서로, 남은 뉴스는 다음 실행으로 이월)
+    with METRICS.stage("analyze"):
+        analyzed = analyzer.analyze_batch(news_items)
+    collector.defer(analyzer.deferred)
+    collector.freshness.analyzed(a.news_item.id for a in analyzed)
+    return analyzed
+
+
+def deliver_realtime(
+    collector: NewsCollector,
+    analyzer: AIAnalyzer,
+    bot: TelegramBot,
+    analyzed: List[AnalyzedNews]
+) -> List[AnalyzedNews]:
+    """중요도 8 이상 즉시 전송, 실시간으로 보내지 않은 나머지 반환"""
     realtime_news = analyzer.filter_by_priority(analyzed, Priority.REALTIME)
     
     if realtime_news:
@@ -55,33 +82,18 @@ def run_realtime():
         print("📭 실시간 전송할 중요 뉴스 없음")
     
     # 나머지 뉴스도 seen 처리 (다음 배치에서 처리)
-    all_ids = [a.news_item.id for a in analyzed if a.news_item.id not in [n.news_item.id for n in realtime_news]]
-    collector.mark_multiple_as_seen(all_ids)
+    realtime_ids = {n.news_item.id for n in realtime_news}
+    remaining = [a for a in analyzed if a.news_item.id not in realtime_ids]
+    collector.mark_multiple_as_seen([a.news_item.id for a in remaining])
+    
+    return remaining
 
 
-def run_batch():
-    """배치 모드 - 6시간마다 요약 전송"""
-    print("\n" + "="*50)
-    print("📢 6시간 배치 모드 실행")
-    print("="*50)
-    
-    collector = NewsCollector(cache_dir="data")
-    analyzer = AIAnalyzer()
-    bot = TelegramBot()
-    
-    # 뉴스 수집
-    news_items = collector.collect_all()
-    
-    if not news_items:
-        print("📭 새로운 뉴스가 없습니다")
-        return
-    
-    # AI 분석
-    analyzed = analyzer.analyze_batch(news_items)
-    
-    # 배치 전송 (중요도 5 이상)
+def deliver_batch(collector: NewsCollector, analyzer: AIAnalyzer, bot: TelegramBot, analyzed: List[AnalyzedNews]):
+    """중요도 5 이상 모아서 전송"""
     batch_news = [a for a in analyzed if a.importance_score >= 5]
     batch_news = batch_news[:MAX_NEWS_PER_BATCH]  # 최대 개수 제한
+    batch_news = analyzer.complete(batch_news)  # 점수만 평가된 뉴스는 전송 전에 전체 분석
     
     if batch_news:
         print(f"\n📢 {len(batch_news)}개 뉴스 배치 전송")
@@ -98,37 +110,164 @@ def run_batch():
     collector.mark_multiple_as_seen(all_ids)
 
 
+def deliver_daily(collector: NewsCollector, analyzer: AIAnalyzer, bot: TelegramBot, analyzed: List[AnalyzedNews]):
+    """하루 요약 전송 (최대 15개)"""
+    # 점수와 관계없이 상위 15개를 보내므로 점수만 평가된 뉴스는 전송 전에 전체 분석
+    top_news = analyzer.complete(analyzed[:15])
+    
+    if top_news:
+        print(f"\n📰 {len(top_news)}개 뉴스 일일 요약 전송")
+        bot.send_batch_news(top_news, "오늘의 AI 뉴스 요약", mode="daily")
+        
+        # 전송된 뉴스 표시
+        all_ids = [a.news_item.id for a in analyzed]
+        collector.mark_multiple_as_seen(all_ids)
+    else:
+        bot.send_message("📭 오늘의 AI 뉴스: 특별한 소식이 없습니다.")
+
+
+def run_realtime(streaming: bool = False):
+    """실시간 모드 - 중요 뉴스 즉시 전송"""
+    print("\n" + "="*50)
+    print("🚨 실시간 모드 실행" + (" (스트리밍)" if streaming else ""))
+    print("="*50)
+    
+    METRICS.start("realtime")
+    collector = NewsCollector(cache_dir="data")
+    analyzer = AIAnalyzer(cache_dir="data", mode="realtime")
+    bot = TelegramBot(freshness=collector.freshness)
+    
+    try:
+        if streaming:
+            # 수집/분석이 끝나기를 기다리지 않고 중요 뉴스부터 전송
+            run_streaming_realtime(collector, analyzer, bot)
+            return
+        
+        analyzed = collect_and_analyze(collector, analyzer)
+        if analyzed:
+            with METRICS.stage("deliver"):
+                deliver_realtime(collector, analyzer, bot, analyzed)
+    finally:
+        collector.freshness.print_summary(collector.freshness.save())
+        METRICS.write("data")
+
+
+def run_batch():
+    """배치 모드 - 6시간마다 요약 전송"""
+    print("\n" + "="*50)
+    print("📢 6시간 배치 모드 실행")
+    print("="*50)
+    
+    METRICS.start("batch")
+    collector = NewsCollector(cache_dir="data")
+    analyzer = AIAnalyzer(cache_dir="data", mode="batch")
+    bot = TelegramBot(freshness=collector.freshness)
+    
+    try:
+        analyzed = collect_and_analyze(collector, analyzer)
+        if analyzed:
+            with METRICS.stage("deliver"):
+                deliver_batch(collector, analyzer, bot, analyzed)
+    finally:
+        collector.freshness.print_summary(collector.freshness.save())
+        METRICS.write("data")
+
+
 def run_daily():
     """일일 모드 - 하루 요약 전송"""
     print("\n" + "="*50)
     print("📰 일일 요약 모드 실행")
     print("="*50)
     
+    METRICS.start("daily")
     collector = NewsCollector(cache_dir="data")
-    analyzer = AIAnalyzer()
-    bot = TelegramBot()
+    analyzer = AIAnalyzer(cache_dir="data", mode="daily")
+    bot = TelegramBot(freshness=collector.freshness)
     
-    # 뉴스 수집
-    news_items = collector.collect_all()
+    try:
+        analyzed = collect_and_analyze(collector, analyzer)
+        with METRICS.stage("deliver"):
+            deliver_daily(collector, analyzer, bot, analyzed)
+    finally:
+        collector.freshness.print_summary(collector.freshness.save())
+        METRICS.write("data")
+
+
+def run_daemon():
+    """데몬 모드 - 한 프로세스에서 실시간/배치/일일 주기를 모두 실행"""
+    print("\n" + "="*50)
+    print("🔁 데몬 모드 실행")
+    print("="*50)
     
-    if not news_items:
-        print("📭 새로운 뉴스가 없습니다")
-        bot.send_message("📭 오늘의 AI 뉴스: 특별한 소식이 없습니다.")
-        return
+    # 클라이언트, 캐시, 상태는 프로세스가 살아있는 동안 재사용
+    collector = NewsCollector(cache_dir="data")
+    analyzer = AIAnalyzer(cache_dir="data", mode="daemon")
+    bot = TelegramBot(freshness=collector.freshness)
     
-    # AI 분석
-    analyzed = analyzer.analyze_batch(news_items)
+    scheduler = CadenceScheduler(
+        {
+            "realtime": DAEMON_REALTIME_INTERVAL_MINUTES,
+            "batch": DAEMON_BATCH_INTERVAL_MINUTES,
+        },
+        daily_hour=DAEMON_DAILY_HOUR_UTC
+    )
     
-    # 전체 요약 전송 (최대 15개)
-    top_news = analyzed[:15]
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    last_checkpoint = time.monotonic()
     
-    if top_news:
-        print(f"\n📰 {len(top_news)}개 뉴스 일일 요약 전송")
-        bot.send_batch_news(top_news, "오늘의 AI 뉴스 요약")
-        
-        # 전송된 뉴스 표시
-        all_ids = [a.news_item.id for a in analyzed]
-        collector.mark_multiple_as_seen(all_ids)
+    def checkpoint():
+        collector.checkpoint()
+        analyzer.cache.save()
+        analyzer.budget.save()
+    
+    try:
+        while not stop.is_set():
+            # 체크포인트 주기를 넘기지 않도록 나눠서 대기
+            wait = min(scheduler.seconds_until_next(), DAEMON_CHECKPOINT_MINUTES * 60)
+            if stop.wait(wait):
+                break
+            
+            if time.monotonic() - last_checkpoint >= DAEMON_CHECKPOINT_MINUTES * 60:
+                checkpoint()
+                last_checkpoint = time.monotonic()
+            
+            due = scheduler.due()
+            if not due:
+                continue
+            
+            print(f"\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M')} 실행: {', '.join(due)}")
+            
+            # 할당량 사용량을 가장 자주 도는 주기 기준으로 기록
+            analyzer.budget.mode = "realtime" if "realtime" in due else due[0]
+            
+            METRICS.start(",".join(due))
+            try:
+                bot.flush_outbox()
+                
+                # 같은 시각에 도래한 작업은 수집/분석을 한 번만 수행
+                analyzed = collect_and_analyze(collector, analyzer)
+                
+                with METRICS.stage("deliver"):
+                    if "realtime" in due and analyzed:
+                        analyzed = deliver_realtime(collector, analyzer, bot, analyzed)
+                    if "batch" in due and analyzed:
+                        deliver_batch(collector, analyzer, bot, analyzed)
+                    if "daily" in due:
+                        deliver_daily(collector, analyzer, bot, analyzed)
+            except Exception as e:
+                print(f"❌ 실행 오류: {e}")
+            finally:
+                collector.freshness.print_summary(collector.freshness.report())
+                METRICS.write("data")
+            
+            scheduler.advance(due)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        checkpoint()
+        collector.close()
+        print("\n👋 데몬 종료")
 
 
 def run_test():
@@ -164,7 +303,7 @@ def run_test():
     print("\n3️⃣ AI 분석 테스트...")
     if items:
         try:
-            analyzer = AIAnalyzer()
+            analyzer = AIAnalyzer(cache_dir="data", mode="test")
             result = analyzer.analyze_single(items[0])
             if result:
                 print(f"✅ AI 분석 성공")
@@ -188,24 +327,71 @@ def main():
     parser = argparse.ArgumentParser(description="AI News Telegram Bot")
     parser.add_argument(
         "--mode",
-        choices=["realtime", "batch", "daily", "test"],
+        choices=["realtime", "batch", "daily", "daemon", "test"],
         default="test",
         help="실행 모드 선택"
     )
     
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="realtime 모드에서 수집→분석→전송을 스트리밍으로 처리"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="cProfile, 스택 샘플, 단계별 시간, tracemalloc 최대 메모리를 data/profiles/에 저장"
+    )
+    
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        nargs="?",
+        const=CASSETTE_FILE,
+        metavar="PATH",
+        help=f"HTTP 응답과 시작 상태를 카세트에 기록 (기본 {CASSETTE_FILE})"
+    )
+    cassette_group.add_argument(
+        "--replay",
+        nargs="?",
+        const=CASSETTE_FILE,
+        metavar="PATH",
+        help="기록된 카세트로 네트워크 없이 재실행"
+    )
+    
     args = parser.parse_args()
+    if (args.record or args.replay) and args.mode == "daemon":
+        parser.error("--record/--replay는 realtime, batch, daily, test 모드에서만 사용할 수 있습니다")
     
     # data 디렉토리 확인
     Path("data").mkdir(exist_ok=True)
     
-    if args.mode == "realtime":
-        run_realtime()
-    elif args.mode == "batch":
-        run_batch()
-    elif args.mode == "daily":
-        run_daily()
-    elif args.mode == "test":
-        run_test()
+    # 프로파일러는 --profile일 때만 import (꺼져 있으면 추가 비용 없음)
+    if args.profile:
+        from profiler import RunProfiler
+        profiling = RunProfiler(args.mode, cache_dir="data")
+    else:
+        profiling = contextlib.nullcontext()
+    
+    if args.record or args.replay:
+        from cassette import Cassette
+        cassette = Cassette(args.record or args.replay, "record" if args.record else "replay", args.mode)
+    else:
+        cassette = contextlib.nullcontext()
+    
+    # 재생 중 프로파일링도 되도록 카세트가 안쪽 (재생은 data/replay/에서 실행)
+    with profiling, cassette:
+        if args.mode == "realtime":
+            run_realtime(streaming=args.streaming)
+        elif args.mode == "batch":
+            run_batch()
+        elif args.mode == "daily":
+            run_daily()
+        elif args.mode == "daemon":
+            run_daemon()
+        elif args.mode == "test":
+            run_test()
 
 
 if __name__ == "__main__":
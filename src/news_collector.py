@@ -2,16 +2,36 @@
 News Collector - RSS 피드에서 뉴스 수집
 """
 import feedparser
+import requests
 import hashlib
 import json
+import queue
 import re
+import threading
+import time
+from itertools import chain
 from datetime import datetime, timedelta, timezone
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import urlparse
 from email.utils import parsedate_to_datetime
 
-from config import NEWS_SOURCES, NewsSource, CACHE_HOURS, MAX_NEWS_AGE_HOURS
+from config import (
+    NEWS_SOURCES, NewsSource, MAX_NEWS_AGE_HOURS,
+    MAX_FETCH_WORKERS, MAX_FETCHES_PER_HOST,
+    FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT, FEED_FETCH_DEADLINE, COLLECTION_DEADLINE,
+    NEAR_DUPLICATE_DETECTION,
+)
+from keyword_rules import RULE_ENGINE
+from dedup import NearDuplicateIndex, cluster_near_duplicates
+from state_store import create_state_store
+from url_canonicalizer import canonicalize_url
+from http_client import get_session
+from run_metrics import METRICS
+from freshness import FreshnessTracker
+
+USER_AGENT = "AI-News-Bot/1.0 (Personal Use)"
 
 
 @dataclass
@@ -27,44 +47,84 @@ class NewsItem:
     published: Optional[str]
     published_dt: Optional[datetime]
     collected_at: str
+    also_reported_by: List[str] = field(default_factory=list)
     
     def to_dict(self):
         d = asdict(self)
         if d.get('published_dt'):
             d['published_dt'] = d['published_dt'].isoformat()
         return d
+    
+    @classmethod
+    def from_dict(cls, d: dict) -> "NewsItem":
+        d = dict(d)
+        if d.get('published_dt'):
+            d['published_dt'] = datetime.fromisoformat(d['published_dt'])
+        return cls(**d)
 
 
 class NewsCollector:
     def __init__(self, cache_dir: str = "data"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
-        self.seen_file = self.cache_dir / "seen_news.json"
-        self.seen_ids = self._load_seen_ids()
+        self.state = create_state_store(self.cache_dir)
+        self.session = get_session()
+        self.feed_cache_file = self.cache_dir / "feed_cache.json"
+        self.deferred_file = self.cache_dir / "deferred.json"
+        self.feed_cache = self._load_feed_cache()
+        self._feed_cache_lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Semaphore] = {}
+        self._host_locks_guard = threading.Lock()
+        self.missed_sources: List[str] = []
+        self.dedup_index = NearDuplicateIndex(cache_dir=str(self.cache_dir)) if NEAR_DUPLICATE_DETECTION else None
+        self.freshness = FreshnessTracker(cache_dir=str(self.cache_dir))
     
-    def _load_seen_ids(self) -> dict:
-        if self.seen_file.exists():
+    def _load_feed_cache(self) -> dict:
+        """소스별 ETag / Last-Modified / 본문 해시 캐시 로드"""
+        if self.feed_cache_file.exists():
             try:
-                with open(self.seen_file, 'r', encoding='utf-8') as f:
+                with open(self.feed_cache_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except:
                 return {}
         return {}
     
-    def _save_seen_ids(self):
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=CACHE_HOURS)
-        cutoff_str = cutoff.isoformat()
-        
-        cleaned = {
-            k: v for k, v in self.seen_ids.items()
-            if v.get('seen_at', '') > cutoff_str
-        }
-        self.seen_ids = cleaned
-        
-        with open(self.seen_file, 'w', encoding='utf-8') as f:
-            json.dump(self.seen_ids, f, ensure_ascii=False, indent=2)
+    def _load_deferred(self) -> List[NewsItem]:
+        """이전 실행에서 분석 예산 부족으로 이월된 뉴스 (아직 seen이 아니고 최신인 것만)"""
+        if not self.deferred_file.exists():
+            return []
+        try:
+            with open(self.deferred_file, 'r', encoding='utf-8') as f:
+                items = [NewsItem.from_dict(d) for d in json.load(f)]
+        except:
+            return []
+        return [
+            item for item in items
+            if not self.state.contains(item.id) and self._is_recent(item.published_dt)
+        ]
+    
+    def defer(self, items: List[NewsItem]):
+        """분석하지 못한 뉴스를 다음 실행으로 이월 (seen 처리하지 않음)"""
+        with open(self.deferred_file, 'w', encoding='utf-8') as f:
+            json.dump([item.to_dict() for item in items], f, ensure_ascii=False)
+    
+    def _commit_feed_cache(self, url: str, validators: Optional[dict]):
+        """뉴스를 넘겨준 뒤에만 검증자/본문 해시 반영 (못 넘긴 피드가 다음 실행에 304/변경 없음으로 사라지지 않도록)"""
+        if validators is None:
+            return
+        with self._feed_cache_lock:
+            self.feed_cache[url] = validators
+    
+    def _save_feed_cache(self):
+        with self._feed_cache_lock:
+            with open(self.feed_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.feed_cache, f, ensure_ascii=False)
     
     def _generate_id(self, url: str) -> str:
+        return hashlib.md5(canonicalize_url(url).encode()).hexdigest()[:12]
+    
+    def _generate_legacy_id(self, url: str) -> str:
+        """정규화 도입 전 ID (원본 링크 해시) - 기존 seen 기록 이전용"""
         return hashlib.md5(url.encode()).hexdigest()[:12]
     
     def _parse_published_datetime(self, entry) -> Optional[datetime]:
@@ -109,25 +169,113 @@ class NewsCollector:
         clean = re.sub(r'\s+', ' ', clean).strip()
         return clean
     
+    def _fetch_feed(self, source: NewsSource, deadline: Optional[float] = None) -> Tuple[Optional[dict], Optional[dict]]:
+        """타임아웃과 조건부 GET을 적용해 피드를 받아 파싱 (파싱 결과 또는 변경 없으면 None, 새 검증자)
+        
+        (연결, 읽기) 타임아웃은 청크 사이 간격만 제한하므로, 본문은 스트리밍으로 받으며
+        FEED_FETCH_DEADLINE과 수집 마감(deadline, monotonic) 중 이른 시각을 넘기면 끊는다.
+        """
+        with self._feed_cache_lock:
+            cached = dict(self.feed_cache.get(source.url, {}))
+        
+        headers = {"User-Agent": USER_AGENT}
+        if cached.get('etag'):
+            headers["If-None-Match"] = cached['etag']
+        if cached.get('last_modified'):
+            headers["If-Modified-Since"] = cached['last_modified']
+        
+        fetch_deadline = time.monotonic() + FEED_FETCH_DEADLINE
+        if deadline is not None:
+            fetch_deadline = min(fetch_deadline, deadline)
+        read_timeout = min(source.timeout or FEED_READ_TIMEOUT, max(0.1, fetch_deadline - time.monotonic()))
+        started = time.perf_counter()
+        with self.session.get(
+            source.url,
+            headers=headers,
+            timeout=(FEED_CONNECT_TIMEOUT, read_timeout),
+            stream=True
+        ) as response:
+            content = self._read_body(response, fetch_deadline)
+        METRICS.record_fetch(
+            source.name,
+            seconds=round(time.perf_counter() - started, 4),
+            bytes=len(content),
+            http_status=response.status_code
+        )
+        
+        if response.status_code == 304:
+            return None, None
+        response.raise_for_status()
+        
+        # 검증자를 무시하는 서버는 본문 해시로 변경 여부 판단
+        body_hash = hashlib.sha1(content).hexdigest()
+        unchanged = body_hash == cached.get('body_hash')
+        
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_hash': body_hash,
+        }
+        
+        if unchanged:
+            return None, validators
+        return feedparser.parse(content, response_headers=dict(response.headers)), validators
+    
+    @staticmethod
+    def _read_body(response: requests.Response, deadline: float) -> bytes:
+        """마감 시각을 확인하며 본문을 청크 단위로 읽음"""
+        if not response._content_consumed and hasattr(response.raw, "read1"):
+            # 도착한 만큼만 읽으므로 한 바이트씩 흘러와도 마감 시각에 끊김 (urllib3 2.2+)
+            # (카세트 녹화/재생 응답은 본문을 이미 읽어 두었으므로 iter_content 사용)
+            stream = iter(lambda: response.raw.read1(64 * 1024, decode_content=True), b"")
+        else:
+            stream = response.iter_content(chunk_size=64 * 1024)
+        chunks = []
+        for chunk in stream:
+            if time.monotonic() >= deadline:
+                raise requests.exceptions.Timeout("피드 수신 제한 시간 초과")
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
     def collect_from_source(self, source: NewsSource) -> List[NewsItem]:
+        items, validators = self._collect_source(source)
+        self._commit_feed_cache(source.url, validators)
+        return items
+    
+    def _collect_source(self, source: NewsSource, deadline: Optional[float] = None) -> Tuple[List[NewsItem], Optional[dict]]:
+        """피드의 새 뉴스와 반영 대기 중인 검증자 (feed_cache는 호출한 쪽이 뉴스를 넘긴 뒤 갱신)"""
         items = []
+        validators = None
         
         try:
-            feedparser.USER_AGENT = "AI-News-Bot/1.0 (Personal Use)"
-            feed = feedparser.parse(source.url)
+            feed, validators = self._fetch_feed(source, deadline)
+            
+            if feed is None:
+                METRICS.record_fetch(source.name, status="unchanged", entries=0, new_items=0)
+                print(f"💤 {source.name}: 변경 없음")
+                return items, validators
             
             if feed.bozo and not feed.entries:
+                METRICS.record_fetch(source.name, status="error", entries=0, new_items=0, error="parse")
                 print(f"⚠️ {source.name}: 피드 파싱 실패")
-                return items
+                return items, validators
+            
+            migrated_ids = []
             
             for entry in feed.entries[:20]:
-                link = entry.get('link', '')
+                # feedburner 리다이렉트 링크 대신 원본 링크 사용
+                link = entry.get('feedburner_origlink') or entry.get('link', '')
                 if not link:
                     continue
                 
                 news_id = self._generate_id(link)
                 
-                if news_id in self.seen_ids:
+                if self.state.contains(news_id):
+                    continue
+                
+                # 원본 링크로 저장된 기존 seen 기록은 정규화 ID로 옮김
+                if self.state.contains(self._generate_legacy_id(entry.get('link', link))):
+                    migrated_ids.append(news_id)
                     continue
                 
                 published_dt = self._parse_published_datetime(entry)
@@ -136,11 +284,18 @@ class NewsCollector:
                 if not self._is_recent(published_dt):
                     continue
                 
+                title = entry.get('title', 'No Title')
+                summary = self._get_summary(entry)
+                
+                # 제외 키워드 / 포함 규칙 적용
+                if RULE_ENGINE.evaluate(f"{title} {summary}", source.name, source.category).excluded:
+                    continue
+                
                 item = NewsItem(
                     id=news_id,
-                    title=entry.get('title', 'No Title'),
+                    title=title,
                     link=link,
-                    summary=self._get_summary(entry),
+                    summary=summary,
                     source_name=source.name,
                     source_trust=source.base_trust,
                     category=source.category,
@@ -151,40 +306,203 @@ class NewsCollector:
                 
                 items.append(item)
             
+            if migrated_ids:
+                self.state.mark_seen(migrated_ids)
+            
+            METRICS.record_fetch(source.name, status="ok", entries=len(feed.entries), new_items=len(items))
             print(f"✅ {source.name}: {len(items)}개 새 뉴스")
             
+        except requests.exceptions.Timeout:
+            METRICS.record_fetch(source.name, status="timeout", error="timeout")
+            print(f"⏱️ {source.name}: 타임아웃")
+            return [], None
         except Exception as e:
+            METRICS.record_fetch(source.name, status="error", error=str(e)[:200])
             print(f"❌ {source.name}: 수집 실패 - {e}")
+            return [], None
         
-        return items
+        return items, validators
+    
+    def _get_host_lock(self, url: str) -> threading.Semaphore:
+        """호스트별 동시 요청 제한용 세마포어"""
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            if host not in self._host_locks:
+                self._host_locks[host] = threading.Semaphore(MAX_FETCHES_PER_HOST)
+            return self._host_locks[host]
     
-    def collect_all(self) -> List[NewsItem]:
+    def _collect_with_host_limit(self, source: NewsSource, deadline: Optional[float] = None) -> Tuple[List[NewsItem], Optional[dict]]:
+        with self._get_host_lock(source.url):
+            return self._collect_source(source, deadline)
+    
+    def _iter_source_results(self, sources: List[NewsSource]) -> Iterator[Tuple[int, List[NewsItem]]]:
+        """완료된 소스부터 (소스 인덱스, 뉴스 목록) 반환 - 제한 시간 초과 소스는 missed_sources에 기록
+        
+        제한 시간은 피드 요청에만 적용한다: 받는 쪽(분석 큐 대기 등)이 느려도 이미 받은 피드는 모두 넘기고,
+        각 피드의 검증자는 뉴스를 넘겨준 뒤에 feed_cache에 반영한다.
+        """
+        deadline = time.monotonic() + COLLECTION_DEADLINE
+        self.missed_sources = []
+        
+        try:
+            if MAX_FETCH_WORKERS <= 1:
+                for index, source in enumerate(sources):
+                    if time.monotonic() >= deadline:
+                        self.missed_sources.append(source.name)
+                        continue
+                    items, validators = self._collect_source(source, deadline)
+                    paused = time.monotonic()
+                    yield index, items
+                    # 받는 쪽에서 보낸 시간은 제한 시간에서 제외
+                    deadline += time.monotonic() - paused
+                    self._commit_feed_cache(source.url, validators)
+            else:
+                tasks: "queue.Queue[Tuple[int, NewsSource]]" = queue.Queue()
+                for index, source in enumerate(sources):
+                    tasks.put((index, source))
+                results: "queue.Queue[Tuple[int, Tuple[List[NewsItem], Optional[dict]]]]" = queue.Queue()
+                stop = threading.Event()
+                
+                def worker():
+                    while not stop.is_set():
+                        try:
+                            index, source = tasks.get_nowait()
+                        except queue.Empty:
+                            return
+                        results.put((index, self._collect_with_host_limit(source, deadline)))
+                
+                # 데몬 스레드라 제한 시간을 넘긴 요청이 인터프리터 종료를 막지 않음
+                for _ in range(min(MAX_FETCH_WORKERS, len(sources))):
+                    threading.Thread(target=worker, name="feed-fetch", daemon=True).start()
+                pending = set(range(len(sources)))
+                
+                try:
+                    while pending:
+                        # 제한 시간이 지나도 그때까지 끝난 피드는 모두 넘김
+                        try:
+                            index, (items, validators) = results.get(timeout=max(0.0, deadline - time.monotonic()))
+                        except queue.Empty:
+                            break
+                        pending.discard(index)
+                        yield index, items
+                        self._commit_feed_cache(sources[index].url, validators)
+                finally:
+                    self.missed_sources = [sources[index].name for index in sorted(pending)]
+                    # 제한 시간을 넘긴 소스는 기다리지 않음 (늦게 끝나도 검증자는 반영되지 않음)
+                    stop.set()
+        finally:
+            self._save_feed_cache()
+        
+        for name in self.missed_sources:
+            METRICS.record_fetch(name, status="missed", error="deadline")
+        
+        if self.missed_sources:
+            print(f"\n⏱️ 수집 제한 시간({COLLECTION_DEADLINE}초) 초과: {len(self.missed_sources)}개 소스 제외")
+            print(f"   {', '.join(self.missed_sources)}")
+    
+    def collect_all(self, sources: Optional[List[NewsSource]] = None) -> List[NewsItem]:
+        sources = NEWS_SOURCES if sources is None else sources
         all_items = []
         
-        print(f"\n📡 {len(NEWS_SOURCES)}개 소스에서 뉴스 수집 시작...\n")
+        print(f"\n📡 {len(sources)}개 소스에서 뉴스 수집 시작...\n")
+        
+        # 소스별 결과는 NEWS_SOURCES 순서대로 모음 (중복 제거 기준 유지)
+        results = [[] for _ in sources]
+        for index, items in self._iter_source_results(sources):
+            results[index] = items
+        
+        # 피드가 바뀌지 않아도 이월된 뉴스는 다시 분석 대상에 포함
+        deferred = self._load_deferred()
+        if deferred:
+            print(f"\n⏳ 이월된 뉴스 {len(deferred)}개 포함")
+            results.insert(0, deferred)
         
-        for source in NEWS_SOURCES:
-            items = self.collect_from_source(source)
-            all_items.extend(items)
+        # 여러 소스에 같은 링크가 있으면 먼저 등록된 소스만 유지
+        collected_ids = set()
+        for items in results:
+            for item in items:
+                if item.id in collected_ids:
+                    continue
+                collected_ids.add(item.id)
+                all_items.append(item)
+        
+        # 다른 소스의 같은 기사는 신뢰도 높은 대표만 남김
+        if self.dedup_index is not None:
+            before = len(all_items)
+            self.dedup_index.start_run()
+            clustered = cluster_near_duplicates(all_items, self.dedup_index, stage_of=self.freshness.stage)
+            self._mark_merged(all_items, clustered)
+            all_items = clustered
+            self.dedup_index.save()
+            if before != len(all_items):
+                print(f"\n🧬 유사 기사 {before - len(all_items)}개 병합")
         
         # 최신순 정렬
         all_items.sort(key=lambda x: x.published_dt or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
         
         print(f"\n📊 총 {len(all_items)}개 최신 뉴스 수집 완료\n")
         
+        self.freshness.seen(all_items)
         return all_items
     
+    def collect_stream(self, sources: Optional[List[NewsSource]] = None) -> Iterator[NewsItem]:
+        """소스가 끝나는 대로 새 뉴스를 바로 내보내는 수집 (스트리밍 파이프라인용)
+        
+        유사 기사 병합은 먼저 도착한 기사를 대표로 삼으므로 collect_all과 달리
+        신뢰도 순 대표 선정은 보장하지 않는다.
+        """
+        sources = NEWS_SOURCES if sources is None else sources
+        collected_ids = set()
+        representatives = {}
+        
+        print(f"\n📡 {len(sources)}개 소스에서 뉴스 스트리밍 수집 시작...\n")
+        
+        if self.dedup_index is not None:
+            self.dedup_index.start_run()
+        
+        # 이전 실행에서 이월된 뉴스를 먼저 내보냄 (collect_all과 같음)
+        deferred = self._load_deferred()
+        if deferred:
+            print(f"\n⏳ 이월된 뉴스 {len(deferred)}개 포함")
+        
+        for items in chain([deferred], (items for _, items in self._iter_source_results(sources))):
+            fresh = [item for item in items if item.id not in collected_ids]
+            collected_ids.update(item.id for item in fresh)
+            
+            if self.dedup_index is not None:
+                clustered = cluster_near_duplicates(fresh, self.dedup_index, representatives, stage_of=self.freshness.stage)
+                self._mark_merged(fresh, clustered)
+                fresh = clustered
+            
+            self.freshness.seen(fresh)
+            yield from fresh
+        
+        if self.dedup_index is not None:
+            self.dedup_index.save()
+    
+    def _mark_merged(self, items: List[NewsItem], kept: List[NewsItem]):
+        """대표에 합쳐졌거나 이미 처리된 기사의 사본은 seen 처리 (다음 실행에서 다시 받아 비교하지 않도록)"""
+        kept_ids = {item.id for item in kept}
+        merged = [item.id for item in items if item.id not in kept_ids]
+        if merged:
+            self.state.mark_seen(merged)
+    
     def mark_as_seen(self, news_id: str):
-        self.seen_ids[news_id] = {
-            'seen_at': datetime.now(timezone.utc).isoformat()
-        }
-        self._save_seen_ids()
+        self.state.mark_seen([news_id])
     
     def mark_multiple_as_seen(self, news_ids: List[str]):
-        now = datetime.now(timezone.utc).isoformat()
-        for news_id in news_ids:
-            self.seen_ids[news_id] = {'seen_at': now}
-        self._save_seen_ids()
+        self.state.mark_seen(news_ids)
+    
+    def checkpoint(self):
+        """장시간 실행 시 주기적으로 캐시/상태 저장"""
+        self._save_feed_cache()
+        if self.dedup_index is not None:
+            self.dedup_index.save()
+        self.state.checkpoint()
+        self.freshness.save()
+    
+    def close(self):
+        self.state.close()
 
 
 if __name__ == "__main__":
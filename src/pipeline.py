@@ -0,0 +1,200 @@
+"""
+Streaming Pipeline - 수집 → 분석 → 전송을 bounded queue로 연결한 실시간 파이프라인
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from config import (
+    Priority, ANALYSIS_BATCH_SIZE, GEMINI_MAX_CONCURRENCY,
+    PIPELINE_QUEUE_SIZE, PIPELINE_BATCH_WAIT,
+)
+from news_collector import NewsCollector
+from ai_analyzer import AIAnalyzer, AnalyzedNews
+from telegram_bot import TelegramBot
+from run_metrics import METRICS
+
+_DONE = object()
+_PUT_POLL = 0.5  # 큐가 찬 동안 중단 여부를 확인하는 주기 (초)
+
+
+class _Stopped(Exception):
+    """다음 단계가 중단되어 더 넘길 곳이 없음"""
+
+
+def _put(target: queue.Queue, item, stop: threading.Event):
+    """큐가 차면 대기하되, 다음 단계가 중단되면 (stop) 영원히 막히지 않고 _Stopped"""
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            target.put(item, timeout=_PUT_POLL)
+            return
+        except queue.Full:
+            continue
+
+
+def _finish(target: queue.Queue, stop: threading.Event):
+    """다음 단계에 종료 신호 전달 (다음 단계가 이미 중단됐으면 생략)"""
+    try:
+        _put(target, _DONE, stop)
+    except _Stopped:
+        pass
+
+
+def _collect_stage(
+    collector: NewsCollector,
+    analyzer: AIAnalyzer,
+    collected: queue.Queue,
+    analysis_done: threading.Event,
+    errors: list
+):
+    """수집 단계: 사전 선별을 통과한 뉴스를 바로 다음 단계로 전달 (큐가 차면 대기, 분석 단계가 끝나면 중단)"""
+    try:
+        skipped = []
+        with METRICS.stage("collect"):
+            for news in collector.collect_stream():
+                if not analyzer.should_analyze(news):
+                    skipped.append(news.id)
+                    continue
+                _put(collected, news, analysis_done)
+        collector.mark_multiple_as_seen(skipped)
+    except _Stopped:
+        pass
+    except Exception as e:
+        errors.append(e)
+    finally:
+        _finish(collected, analysis_done)
+
+
+def _analyze_stage(
+    analyzer: AIAnalyzer,
+    collected: queue.Queue,
+    analyzed: queue.Queue,
+    analysis_done: threading.Event,
+    delivery_done: threading.Event,
+    errors: list
+):
+    """분석 단계: ANALYSIS_BATCH_SIZE개가 모이거나 PIPELINE_BATCH_WAIT초가 지나면 묶음 분석"""
+    # 동시 분석 묶음 수를 제한해 수집 단계에 backpressure 전달
+    slots = threading.Semaphore(max(1, GEMINI_MAX_CONCURRENCY))
+    
+    def run(chunk):
+        try:
+            for result in analyzer.analyze_chunk(chunk):
+                _put(analyzed, result, delivery_done)
+        except _Stopped:
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            slots.release()
+    
+    def submit(executor, chunk):
+        slots.acquire()
+        executor.submit(run, chunk)
+    
+    # collect_and_analyze와 같은 실행 예산 (넘으면 남은 뉴스는 다음 실행으로 이월)
+    analyzer.start_budget()
+    try:
+        with METRICS.stage("analyze"), ThreadPoolExecutor(max_workers=max(1, GEMINI_MAX_CONCURRENCY)) as executor:
+            chunk = []
+            chunk_started = None
+            while True:
+                timeout = None
+                if chunk:
+                    timeout = max(0.0, PIPELINE_BATCH_WAIT - (time.monotonic() - chunk_started))
+                try:
+                    news = collected.get(timeout=timeout)
+                except queue.Empty:
+                    submit(executor, chunk)
+                    chunk = []
+                    continue
+                
+                if news is _DONE:
+                    break
+                
+                if not chunk:
+                    chunk_started = time.monotonic()
+                chunk.append(news)
+                if len(chunk) >= max(1, ANALYSIS_BATCH_SIZE):
+                    submit(executor, chunk)
+                    chunk = []
+            
+            if chunk:
+                submit(executor, chunk)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        # 수집 단계가 큐에서 막혀 있지 않도록 중단 알림
+        analysis_done.set()
+        analyzer.end_budget()
+        analyzer.cache.save()
+        analyzer.budget.save()
+        _finish(analyzed, delivery_done)
+
+
+def run_streaming_realtime(collector: NewsCollector, analyzer: AIAnalyzer, bot: TelegramBot) -> List[AnalyzedNews]:
+    """중요도 8 이상은 분석되는 즉시 전송, 나머지는 점수순으로 정렬해 반환 (seen 처리 완료)"""
+    collected = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    analyzed = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    analysis_done = threading.Event()
+    delivery_done = threading.Event()
+    errors = []
+    
+    stages = [
+        threading.Thread(target=_collect_stage, args=(collector, analyzer, collected, analysis_done, errors), daemon=True),
+        threading.Thread(
+            target=_analyze_stage, args=(analyzer, collected, analyzed, analysis_done, delivery_done, errors), daemon=True
+        ),
+    ]
+    for stage in stages:
+        stage.start()
+    
+    # 전송 단계: 도착 순서대로 즉시 처리 (실시간 알림은 순서 보장 불필요)
+    started = time.monotonic()
+    sent_count = 0
+    failed_count = 0
+    remaining = []
+    try:
+        with METRICS.stage("deliver"):
+            while True:
+                result = analyzed.get()
+                if result is _DONE:
+                    break
+                
+                collector.freshness.analyzed([result.news_item.id])
+                if result.priority != Priority.REALTIME:
+                    remaining.append(result)
+                    continue
+                
+                print(f"🚨 중요 뉴스 즉시 전송 (+{time.monotonic() - started:.1f}초)")
+                if bot.send_single_news(result):
+                    sent_count += 1
+                    collector.mark_as_seen(result.news_item.id)
+                else:
+                    # 전송 실패한 알림은 seen 처리하지 않음 (다음 실행에서 재시도)
+                    failed_count += 1
+    finally:
+        # 분석 단계가 전송 큐에서 막혀 있지 않도록 중단 알림
+        delivery_done.set()
+    
+    for stage in stages:
+        stage.join()
+    for error in errors:
+        print(f"❌ 파이프라인 오류: {error}")
+    
+    collector.defer(analyzer.deferred)
+    if analyzer.deferred:
+        print(f"\n⏳ 분석 예산 초과: {len(analyzer.deferred)}개 뉴스 다음 실행으로 이월")
+    
+    # 배치/일일 요약이 기대하는 순서 (중요도순)는 여기서만 맞춤
+    remaining.sort(key=lambda x: x.importance_score, reverse=True)
+    collector.mark_multiple_as_seen([a.news_item.id for a in remaining])
+    
+    print(f"\n✅ 실시간 알림 {sent_count}개 전송, 나머지 {len(remaining)}개 seen 처리")
+    if failed_count:
+        print(f"⚠️ 실시간 알림 {failed_count}개 전송 실패 (다음 실행에서 재시도)")
+    return remaining
@@ -0,0 +1,286 @@
+"""
+Run Profiler - --profile 실행의 CPU 프로파일, 단계별 벽시계 구간, 메모리 최대치 기록
+
+data/profiles/<mode>_<시각>.* 로 저장:
+    .pstats           : cProfile 결과 (모든 스레드 합산, snakeviz / flameprof / gprof2dot)
+    .collapsed        : 스택 샘플 (flamegraph.pl / inferno / speedscope)
+    .speedscope.json  : 스레드별 스택 샘플 + 단계(collect/analyze/deliver) 구간 (https://www.speedscope.app)
+    .memory.json      : 단계별 tracemalloc 최대 메모리와 최대치 시점의 할당 위치 상위
+"""
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    PROFILE_SAMPLE_INTERVAL_MS, PROFILE_TRACEMALLOC, PROFILE_TRACEMALLOC_FRAMES,
+    PROFILE_TOP_N, PROFILE_KEEP_RUNS,
+)
+from run_metrics import METRICS
+
+
+def _frame_name(code) -> str:
+    # collapsed 형식은 ;로 스택을 구분하므로 이름에서 제거
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _thread_group(name: str) -> str:
+    """ThreadPoolExecutor-0_3 → ThreadPoolExecutor, Thread-7 (run) → Thread (run) (같은 종류의 스레드는 합쳐서 표시)"""
+    return re.sub(r"[-_]\d+", "", name)
+
+
+class StackSampler:
+    """sys._current_frames()로 모든 스레드의 스택을 주기적으로 수집 (네트워크 대기도 포함)"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+    
+    def _run(self):
+        me = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                group = _thread_group(names.get(ident, str(ident)))
+                self.samples[(group, tuple(reversed(stack)))] += 1
+
+
+class RunProfiler:
+    """with RunProfiler("realtime"): ... 구간을 프로파일링하고 종료 시 data/profiles/에 저장"""
+    
+    def __init__(self, mode: str, cache_dir: str = "data"):
+        self.mode = mode
+        self.profile_dir = Path(cache_dir) / "profiles"
+        self.name = f"{mode}_{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        self.lock = threading.Lock()
+        self.profiles: List[cProfile.Profile] = []
+        self.sampler = StackSampler(PROFILE_SAMPLE_INTERVAL_MS / 1000)
+        self.spans: List[Tuple[str, str, float, float]] = []
+        self.memory: Dict[str, dict] = {}
+        self.peak_snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+        self.started = 0.0
+    
+    # === 수집 ===
+    
+    def _thread_bootstrap(self, frame, event, arg):
+        """새 스레드의 첫 이벤트에서 그 스레드 전용 cProfile 시작 (cProfile은 스레드별로만 동작)"""
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        profile.enable()
+    
+    def _on_stage(self, name: str, thread: str, started: float, ended: float):
+        with self.lock:
+            self.spans.append((name, thread, started, ended))
+        if not PROFILE_TRACEMALLOC:
+            return
+        
+        # 단계마다 최대치를 새로 잰다 (스트리밍 모드처럼 단계가 겹치면 겹친 구간 전체의 최대치)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with self.lock:
+            stage = self.memory.setdefault(name, {"peak_bytes": 0, "current_bytes": 0})
+            stage["peak_bytes"] = max(stage["peak_bytes"], peak)
+            stage["current_bytes"] = current
+            if peak > self.peak_bytes:
+                self.peak_bytes = peak
+                self.peak_snapshot = tracemalloc.take_snapshot()
+    
+    def __enter__(self):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if PROFILE_TRACEMALLOC:
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        METRICS.stage_listener = self._on_stage
+        self.sampler.start()
+        
+        main_profile = cProfile.Profile()
+        self.profiles.append(main_profile)
+        threading.setprofile(self._thread_bootstrap)
+        self.started = time.perf_counter()
+        main_profile.enable()
+        return self
+    
+    def __exit__(self, *exc):
+        self.profiles[0].disable()
+        ended = time.perf_counter()
+        threading.setprofile(None)
+        self.sampler.stop()
+        METRICS.stage_listener = None
+        
+        if PROFILE_TRACEMALLOC:
+            _, peak = tracemalloc.get_traced_memory()
+            if peak > self.peak_bytes:
+                self.peak_bytes = peak
+                self.peak_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        
+        try:
+            self.write(ended - self.started)
+        except Exception as e:
+            print(f"⚠️ 프로파일 저장 실패: {e}")
+        return False
+    
+    # === 저장 ===
+    
+    def _stats(self) -> Optional[pstats.Stats]:
+        stats = None
+        for profile in self.profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile, stream=io.StringIO())
+                else:
+                    stats.add(profile)
+            except TypeError:
+                # 아무 함수도 호출하지 않은 스레드
+                continue
+        return stats
+    
+    def _collapsed(self) -> str:
+        lines = [
+            ";".join((group,) + stack) + f" {count}"
+            for (group, stack), count in sorted(self.sampler.samples.items())
+        ]
+        return "\n".join(lines) + "\n"
+    
+    def _speedscope(self, wall_seconds: float) -> dict:
+        frames: List[dict] = []
+        index: Dict[str, int] = {}
+        
+        def frame_id(name: str) -> int:
+            if name not in index:
+                index[name] = len(frames)
+                frames.append({"name": name})
+            return index[name]
+        
+        profiles = []
+        interval = self.sampler.interval
+        by_group = defaultdict(list)
+        for (group, stack), count in self.sampler.samples.items():
+            by_group[group].append(([frame_id(name) for name in stack], count * interval))
+        for group, samples in sorted(by_group.items()):
+            profiles.append({
+                "type": "sampled",
+                "name": f"{group} (stack samples)",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weight for _, weight in samples), 6),
+                "samples": [stack for stack, _ in samples],
+                "weights": [round(weight, 6) for _, weight in samples],
+            })
+        
+        # 단계 구간은 스레드별 이벤트 타임라인으로
+        events_by_thread = defaultdict(list)
+        for name, thread, started, ended in self.spans:
+            frame = frame_id(f"stage:{name}")
+            events_by_thread[thread].append((started - self.started, 1, {"type": "O", "frame": frame}))
+            events_by_thread[thread].append((ended - self.started, 0, {"type": "C", "frame": frame}))
+        for thread, events in sorted(events_by_thread.items()):
+            # 같은 시각이면 닫기를 먼저, 같은 스레드 안의 단계는 with 블록이므로 항상 올바르게 중첩
+            events.sort(key=lambda e: (e[0], e[1]))
+            profiles.append({
+                "type": "evented",
+                "name": f"{thread} (stages)",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(wall_seconds, 6),
+                "events": [{**event, "at": round(max(0.0, at), 6)} for at, _, event in events],
+            })
+        
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "ai-news-bot profiler",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+    
+    def _memory_report(self) -> dict:
+        top = []
+        if self.peak_snapshot is not None:
+            for stat in self.peak_snapshot.statistics("lineno")[:PROFILE_TOP_N]:
+                frame = stat.traceback[0]
+                top.append({
+                    "location": f"{frame.filename}:{frame.lineno}",
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                })
+        return {
+            "peak_bytes": self.peak_bytes,
+            "stages": self.memory,
+            "top_allocations_at_peak": top,
+        }
+    
+    def _prune(self):
+        """최근 PROFILE_KEEP_RUNS개 실행의 파일만 유지 (0이면 모두 유지)"""
+        if not PROFILE_KEEP_RUNS:
+            return
+        runs = defaultdict(list)
+        for path in self.profile_dir.iterdir():
+            runs[path.name.split(".", 1)[0]].append(path)
+        for stem in sorted(runs, key=lambda s: s.split("_")[-1])[:-PROFILE_KEEP_RUNS]:
+            for path in runs[stem]:
+                path.unlink()
+    
+    def write(self, wall_seconds: float):
+        base = self.profile_dir / self.name
+        
+        stats = self._stats()
+        if stats is not None:
+            stats.dump_stats(f"{base}.pstats")
+        with open(f"{base}.collapsed", 'w', encoding='utf-8') as f:
+            f.write(self._collapsed())
+        with open(f"{base}.speedscope.json", 'w', encoding='utf-8') as f:
+            json.dump(self._speedscope(wall_seconds), f, ensure_ascii=False)
+        if PROFILE_TRACEMALLOC:
+            with open(f"{base}.memory.json", 'w', encoding='utf-8') as f:
+                json.dump(self._memory_report(), f, ensure_ascii=False, indent=2)
+        self._prune()
+        
+        self.print_summary(stats, wall_seconds)
+        print(f"🔬 프로파일 저장: {base}.{{pstats,collapsed,speedscope.json{',memory.json' if PROFILE_TRACEMALLOC else ''}}}")
+    
+    def print_summary(self, stats: Optional[pstats.Stats], wall_seconds: float):
+        print(f"\n🔬 프로파일 요약 ({wall_seconds:.1f}초)")
+        
+        stage_seconds = defaultdict(float)
+        for name, _, started, ended in self.spans:
+            stage_seconds[name] += ended - started
+        if stage_seconds:
+            print("   단계: " + ", ".join(f"{k} {v:.2f}s" for k, v in stage_seconds.items()))
+        
+        if stats is not None:
+            # 자기 시간 기준 (스레드 합산이라 누적 시간은 대기 중인 작업 스레드가 부풀림)
+            entries = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)
+            print("   자기 시간 상위 (tottime / cumtime / 호출 수):")
+            for (filename, line, func), (_, calls, tottime, cumtime, _) in entries[:PROFILE_TOP_N]:
+                print(f"     {tottime:8.3f}s {cumtime:8.3f}s {calls:>8}  {func} ({Path(filename).name}:{line})")
+        
+        if PROFILE_TRACEMALLOC:
+            print(f"   최대 메모리: {self.peak_bytes / 1024 / 1024:.1f}MB (tracemalloc)")
+            for name, stage in self.memory.items():
+                print(f"     {name}: 최대 {stage['peak_bytes'] / 1024 / 1024:.1f}MB")
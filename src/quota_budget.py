@@ -0,0 +1,114 @@
+"""
+Quota Budget - 모드별 Gemini 호출/토큰 사용량 기록 및 일/주 한도 관리
+"""
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from config import (
+    GEMINI_DAILY_CALL_CAP, GEMINI_WEEKLY_CALL_CAP, GEMINI_DAILY_TOKEN_CAP, GEMINI_SCORE_DAILY_CALL_CAP,
+    QUOTA_REALTIME_RESERVE, QUOTA_DAY_UTC_OFFSET_HOURS,
+)
+
+USAGE_HISTORY_DAYS = 14
+
+
+class QuotaBudget:
+    """data/gemini_usage.json에 날짜별 / 모드별 사용량 기록
+    
+    일일 한도의 QUOTA_REALTIME_RESERVE 비율은 실시간 알림 후보(reserved=True) 전용으로 남겨두고,
+    그 밖의 분석은 한도에 닿기 전에 로컬 점수로 전환한다.
+    점수 전용 모델(tier="score")은 모델별 한도라 "<모드>:score" 항목에 따로 기록하고
+    GEMINI_SCORE_DAILY_CALL_CAP으로만 제한한다.
+    """
+    
+    def __init__(self, cache_dir: str = "data", mode: str = "manual"):
+        self.usage_file = Path(cache_dir) / "gemini_usage.json"
+        self.mode = mode
+        self.usage = self._load()
+        self.lock = threading.Lock()
+    
+    def _load(self) -> dict:
+        if self.usage_file.exists():
+            try:
+                with open(self.usage_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+    
+    def _today(self) -> datetime:
+        # 할당량 초기화 시각 기준 날짜 (기본: 태평양 시간 자정)
+        return datetime.now(timezone.utc) + timedelta(hours=QUOTA_DAY_UTC_OFFSET_HOURS)
+    
+    def _day_total(self, day: str, key: str, tier: str = "full") -> int:
+        return sum(
+            m.get(key, 0) for mode, m in self.usage.get(day, {}).items()
+            if mode.endswith(":score") == (tier == "score")
+        )
+    
+    def daily_calls(self, tier: str = "full") -> int:
+        return self._day_total(self._today().strftime("%Y-%m-%d"), "calls", tier)
+    
+    def daily_tokens(self) -> int:
+        return self._day_total(self._today().strftime("%Y-%m-%d"), "tokens")
+    
+    def weekly_calls(self) -> int:
+        today = self._today()
+        days = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+        return sum(self._day_total(day, "calls") for day in days)
+    
+    def allow(self, reserved: bool = False, tier: str = "full") -> bool:
+        """새 Gemini 호출 허용 여부 (reserved=True면 예약분까지 사용 가능)"""
+        with self.lock:
+            if tier == "score":
+                return not GEMINI_SCORE_DAILY_CALL_CAP or self.daily_calls("score") < GEMINI_SCORE_DAILY_CALL_CAP
+            share = 1.0 if reserved else 1.0 - QUOTA_REALTIME_RESERVE
+            if GEMINI_DAILY_CALL_CAP and self.daily_calls() >= GEMINI_DAILY_CALL_CAP * share:
+                return False
+            if GEMINI_WEEKLY_CALL_CAP and self.weekly_calls() >= GEMINI_WEEKLY_CALL_CAP * share:
+                return False
+            if GEMINI_DAILY_TOKEN_CAP and self.daily_tokens() >= GEMINI_DAILY_TOKEN_CAP * share:
+                return False
+            return True
+    
+    def record(self, usage_metadata: Optional[dict] = None, tier: str = "full"):
+        """호출 1회와 usageMetadata 토큰 수 기록"""
+        usage_metadata = usage_metadata or {}
+        day = self._today().strftime("%Y-%m-%d")
+        mode = f"{self.mode}:score" if tier == "score" else self.mode
+        with self.lock:
+            entry = self.usage.setdefault(day, {}).setdefault(
+                mode, {"calls": 0, "prompt_tokens": 0, "output_tokens": 0, "tokens": 0}
+            )
+            entry["calls"] += 1
+            entry["prompt_tokens"] += usage_metadata.get("promptTokenCount", 0)
+            entry["output_tokens"] += usage_metadata.get("candidatesTokenCount", 0)
+            entry["tokens"] += usage_metadata.get("totalTokenCount", 0)
+    
+    def summary(self) -> str:
+        with self.lock:
+            text = f"오늘 {self.daily_calls()}"
+            if GEMINI_DAILY_CALL_CAP:
+                text += f"/{GEMINI_DAILY_CALL_CAP}"
+            text += f"회 ({self.daily_tokens():,} 토큰), 최근 7일 {self.weekly_calls()}"
+            if GEMINI_WEEKLY_CALL_CAP:
+                text += f"/{GEMINI_WEEKLY_CALL_CAP}"
+            text += "회"
+            score_calls = self.daily_calls("score")
+            if score_calls:
+                text += f", 점수 모델 오늘 {score_calls}"
+                if GEMINI_SCORE_DAILY_CALL_CAP:
+                    text += f"/{GEMINI_SCORE_DAILY_CALL_CAP}"
+                text += "회"
+            return text
+    
+    def save(self):
+        cutoff = (self._today() - timedelta(days=USAGE_HISTORY_DAYS)).strftime("%Y-%m-%d")
+        with self.lock:
+            self.usage = {day: modes for day, modes in self.usage.items() if day > cutoff}
+            self.usage_file.parent.mkdir(exist_ok=True)
+            with open(self.usage_file, 'w', encoding='utf-8') as f:
+                json.dump(self.usage, f, ensure_ascii=False, indent=2)
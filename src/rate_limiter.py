@@ -0,0 +1,114 @@
+"""
+Rate Limiter - Gemini 요청/토큰 토큰 버킷 및 적응형 동시성 제어
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class TokenBucket:
+    """분당 한도를 초당 속도로 채우는 토큰 버킷"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self, amount: float = 1):
+        """토큰이 찰 때까지 대기 후 차감 (용량보다 큰 요청은 용량으로 제한)"""
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def refund(self, amount: float):
+        """예상보다 적게 쓴 토큰 반환 (음수면 추가 차감)"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+    
+    def pause(self, seconds: float):
+        """Retry-After 동안 다른 요청도 대기시킴 (대기 후 한 건만 바로 가능)"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class AdaptiveConcurrency:
+    """AIMD 동시성 제한: 성공 시 조금씩 늘리고, 스로틀링 시 절반으로 줄임"""
+    
+    def __init__(self, initial: int, maximum: int):
+        self.maximum = max(1, maximum)
+        self.limit = float(min(max(1, initial), self.maximum))
+        self.in_flight = 0
+        self.cond = threading.Condition()
+    
+    def acquire(self):
+        with self.cond:
+            while self.in_flight >= int(self.limit):
+                self.cond.wait()
+            self.in_flight += 1
+    
+    def release(self, throttled: bool = False):
+        with self.cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self.cond.notify_all()
+
+
+class RateLimiter:
+    """요청 수(RPM) + 토큰 수(TPM) 버킷과 적응형 동시성을 묶은 제한기"""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(max(1, max_concurrency // 2), max_concurrency)
+    
+    def acquire(self, estimated_tokens: int):
+        self.concurrency.acquire()
+        self.requests.acquire(1)
+        self.tokens.acquire(estimated_tokens)
+    
+    def release(self, estimated_tokens: int, used_tokens: Optional[int] = None, throttled: bool = False):
+        if used_tokens is not None:
+            self.tokens.refund(estimated_tokens - used_tokens)
+        self.concurrency.release(throttled=throttled)
+    
+    def backoff(self, seconds: float):
+        self.requests.pause(seconds)
+    
+    @property
+    def current_concurrency(self) -> int:
+        return int(self.concurrency.limit)
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,282 @@
+"""
+Run Metrics - 실행별 단계 시간, 소스 수집, Gemini 호출, 점수 분포, 텔레그램 전송 기록
+
+실행이 끝나면 data/run_metrics.jsonl에 한 줄씩 추가하고,
+data/metrics_<mode>.prom에 Prometheus textfile collector 형식으로 마지막 실행 값을 쓴다.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import METRICS_ENABLED, METRICS_HISTORY_RUNS
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """nearest-rank 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _quantiles(values: List[float]) -> Dict[str, float]:
+    return {f"p{p}": round(percentile(values, p), 4) for p in (50, 95, 99)}
+
+
+def _prom_quantiles(quantiles: Dict[str, float]):
+    return [({"quantile": str(int(q[1:]) / 100)}, v) for q, v in quantiles.items()]
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class RunMetrics:
+    """한 번의 실행(start → write) 동안의 측정값 (스레드 안전)"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        # --profile일 때만 설정: stage 구간이 끝날 때마다 (name, thread, started, ended) 전달
+        self.stage_listener = None
+        self.reset("manual")
+    
+    def reset(self, mode: str):
+        with self.lock:
+            self.mode = mode
+            self.started_at = datetime.now(timezone.utc)
+            self.started = time.perf_counter()
+            self.stages: Dict[str, float] = defaultdict(float)
+            self.sources: Dict[str, dict] = {}
+            self.gemini_calls: List[dict] = []
+            self.items: Dict[str, dict] = {}
+            self.sends: List[dict] = []
+    
+    def start(self, mode: str):
+        """새 실행 시작 (데몬은 주기마다 호출)"""
+        self.reset(mode)
+    
+    @contextmanager
+    def stage(self, name: str):
+        """with METRICS.stage("collect"): ... 구간 시간 누적"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self.lock:
+                self.stages[name] += ended - started
+            if self.stage_listener is not None:
+                self.stage_listener(name, threading.current_thread().name, started, ended)
+    
+    def record_fetch(self, source_name: str, **fields):
+        """소스별 수집 결과 (seconds, bytes, status, entries, new_items, error 등) 병합"""
+        if not METRICS_ENABLED:
+            return
+        with self.lock:
+            self.sources.setdefault(source_name, {}).update(fields)
+    
+    def record_gemini(
+        self,
+        tier: str,
+        seconds: float,
+        status: str,
+        item_ids: Optional[List[str]] = None,
+        usage: Optional[dict] = None
+    ):
+        """Gemini 호출 1회 (지연과 토큰은 묶음 안의 뉴스에 균등 배분)"""
+        if not METRICS_ENABLED:
+            return
+        usage = usage or {}
+        call = {
+            "tier": tier,
+            "seconds": round(seconds, 4),
+            "status": status,
+            "items": len(item_ids or []),
+            "prompt_tokens": usage.get("promptTokenCount", 0),
+            "output_tokens": usage.get("candidatesTokenCount", 0),
+        }
+        with self.lock:
+            self.gemini_calls.append(call)
+            for news_id in item_ids or []:
+                item = self.items.setdefault(news_id, {"gemini_seconds": 0.0, "tokens": 0.0, "calls": 0})
+                item["gemini_seconds"] += seconds / len(item_ids)
+                item["tokens"] += usage.get("totalTokenCount", 0) / len(item_ids)
+                item["calls"] += 1
+    
+    def record_item(self, news_id: str, source_name: str, route: str, score: int, reason: str = ""):
+        """뉴스 한 건의 최종 분석 경로(batch/structured/json_repair/fallback/...)와 점수"""
+        if not METRICS_ENABLED:
+            return
+        with self.lock:
+            item = self.items.setdefault(news_id, {"gemini_seconds": 0.0, "tokens": 0.0, "calls": 0})
+            item.update(source=source_name, route=route, score=score)
+            if route in ("fallback", "local_fallback"):
+                item["fallback_reason"] = reason
+    
+    def record_send(self, seconds: float, status: str, description: str = ""):
+        """텔레그램 sendMessage 1회"""
+        if not METRICS_ENABLED:
+            return
+        with self.lock:
+            self.sends.append({"seconds": round(seconds, 4), "status": status, "description": description})
+    
+    def report(self) -> dict:
+        """JSON 한 줄로 남길 실행 요약"""
+        with self.lock:
+            analyzed = {k: v for k, v in self.items.items() if "route" in v}
+            scores = Counter(v["score"] for v in analyzed.values())
+            gemini_seconds = [c["seconds"] for c in self.gemini_calls]
+            send_seconds = [s["seconds"] for s in self.sends]
+            
+            return {
+                "mode": self.mode,
+                "started_at": self.started_at.isoformat(),
+                "duration_seconds": round(time.perf_counter() - self.started, 3),
+                "stages": {k: round(v, 3) for k, v in self.stages.items()},
+                "sources": self.sources,
+                "gemini": {
+                    "calls": len(self.gemini_calls),
+                    "by_tier": dict(Counter(c["tier"] for c in self.gemini_calls)),
+                    "by_status": dict(Counter(c["status"] for c in self.gemini_calls)),
+                    "latency_seconds": _quantiles(gemini_seconds),
+                    "latency_sum_seconds": round(sum(gemini_seconds), 4),
+                    "prompt_tokens": sum(c["prompt_tokens"] for c in self.gemini_calls),
+                    "output_tokens": sum(c["output_tokens"] for c in self.gemini_calls),
+                },
+                "items": [
+                    {
+                        "id": news_id,
+                        "source": item["source"],
+                        "route": item["route"],
+                        "score": item["score"],
+                        "gemini_seconds": round(item["gemini_seconds"], 4),
+                        "tokens": round(item["tokens"]),
+                        **({"fallback_reason": item["fallback_reason"]} if "fallback_reason" in item else {}),
+                    }
+                    for news_id, item in analyzed.items()
+                ],
+                "routes": dict(Counter(v["route"] for v in analyzed.values())),
+                "score_distribution": {str(s): scores.get(s, 0) for s in range(1, 11)},
+                "telegram": {
+                    "sends": len(self.sends),
+                    "by_status": dict(Counter(s["status"] for s in self.sends)),
+                    "latency_seconds": _quantiles(send_seconds),
+                    "latency_sum_seconds": round(sum(send_seconds), 4),
+                    "failures": [s["description"] for s in self.sends if s["status"] != "ok"],
+                },
+            }
+    
+    def _prometheus(self, report: dict) -> str:
+        mode = report["mode"]
+        lines = []
+        
+        def metric(name: str, help_text: str, kind: str, samples, suffixed=()):
+            """suffixed: histogram/summary의 (_bucket/_sum/_count 접미사, 샘플) 목록"""
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, suffix_samples in [("", samples), *suffixed]:
+                for labels, value in suffix_samples:
+                    label_text = ",".join(f'{k}="{_label(v)}"' for k, v in {"mode": mode, **labels}.items())
+                    lines.append(f"{name}{suffix}{{{label_text}}} {value}")
+        
+        def summary(name: str, help_text: str, quantiles: Dict[str, float], total: float, count: int):
+            metric(name, help_text, "summary", _prom_quantiles(quantiles), [
+                ("_sum", [({}, total)]),
+                ("_count", [({}, count)]),
+            ])
+        
+        metric("ainews_run_timestamp_seconds", "Run start time", "gauge",
+               [({}, int(datetime.fromisoformat(report["started_at"]).timestamp()))])
+        metric("ainews_run_duration_seconds", "Run wall time", "gauge",
+               [({}, report["duration_seconds"])])
+        metric("ainews_stage_duration_seconds", "Wall time per pipeline stage", "gauge",
+               [({"stage": k}, v) for k, v in report["stages"].items()])
+        
+        sources = report["sources"]
+        metric("ainews_fetch_duration_seconds", "Feed fetch latency per source", "gauge",
+               [({"source": k}, v.get("seconds", 0)) for k, v in sources.items()])
+        metric("ainews_fetch_bytes", "Feed body size per source", "gauge",
+               [({"source": k}, v.get("bytes", 0)) for k, v in sources.items()])
+        metric("ainews_fetch_entries", "Feed entries per source", "gauge",
+               [({"source": k}, v.get("entries", 0)) for k, v in sources.items()])
+        metric("ainews_fetch_new_items", "New items per source", "gauge",
+               [({"source": k}, v.get("new_items", 0)) for k, v in sources.items()])
+        metric("ainews_fetch_failed", "1 if the source failed this run", "gauge",
+               [({"source": k}, int(v.get("status") in ("error", "timeout", "missed"))) for k, v in sources.items()])
+        
+        gemini = report["gemini"]
+        metric("ainews_gemini_calls", "Gemini calls by status", "gauge",
+               [({"status": k}, v) for k, v in gemini["by_status"].items()])
+        summary("ainews_gemini_latency_seconds", "Gemini call latency",
+                gemini["latency_seconds"], gemini["latency_sum_seconds"], gemini["calls"])
+        metric("ainews_gemini_tokens", "Gemini tokens used", "gauge",
+               [({"kind": "prompt"}, gemini["prompt_tokens"]), ({"kind": "output"}, gemini["output_tokens"])])
+        
+        metric("ainews_items_analyzed", "Analyzed items by route", "gauge",
+               [({"route": k}, v) for k, v in report["routes"].items()])
+        
+        # 점수는 1-10 정수이므로 le="1".."10" 누적 버킷
+        cumulative = 0
+        score_sum = 0
+        buckets = []
+        for score, count in report["score_distribution"].items():
+            cumulative += count
+            score_sum += int(score) * count
+            buckets.append(({"le": score}, cumulative))
+        buckets.append(({"le": "+Inf"}, cumulative))
+        metric("ainews_importance_score", "Final importance score distribution", "histogram", [], [
+            ("_bucket", buckets),
+            ("_sum", [({}, score_sum)]),
+            ("_count", [({}, cumulative)]),
+        ])
+        
+        telegram = report["telegram"]
+        metric("ainews_telegram_sends", "Telegram sendMessage calls by status", "gauge",
+               [({"status": k}, v) for k, v in telegram["by_status"].items()])
+        summary("ainews_telegram_latency_seconds", "Telegram send latency",
+                telegram["latency_seconds"], telegram["latency_sum_seconds"], telegram["sends"])
+        
+        return "\n".join(lines) + "\n"
+    
+    def write(self, cache_dir: str = "data"):
+        """run_metrics.jsonl에 추가 (최근 METRICS_HISTORY_RUNS개 유지) + metrics_<mode>.prom 갱신"""
+        if not METRICS_ENABLED:
+            return
+        
+        report = self.report()
+        data_dir = Path(cache_dir)
+        data_dir.mkdir(exist_ok=True)
+        
+        history_file = data_dir / "run_metrics.jsonl"
+        lines = []
+        if history_file.exists():
+            with open(history_file, 'r', encoding='utf-8') as f:
+                lines = [line for line in f.read().splitlines() if line.strip()]
+        lines.append(json.dumps(report, ensure_ascii=False))
+        with open(history_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines[-METRICS_HISTORY_RUNS:]) + "\n")
+        
+        # textfile collector가 쓰다 만 파일을 읽지 않도록 임시 파일 후 교체
+        prom_file = data_dir / f"metrics_{report['mode'].replace(',', '_')}.prom"
+        tmp_file = prom_file.with_suffix(".prom.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(self._prometheus(report))
+        os.replace(tmp_file, prom_file)
+        
+        gemini = report["gemini"]
+        print(
+            f"📏 실행 지표: {report['duration_seconds']:.1f}초 "
+            f"({', '.join(f'{k} {v:.1f}s' for k, v in report['stages'].items())}), "
+            f"Gemini {gemini['calls']}회 p95 {gemini['latency_seconds']['p95']:.2f}s, "
+            f"전송 {report['telegram']['sends']}회"
+        )
+
+
+METRICS = RunMetrics()
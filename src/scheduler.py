@@ -0,0 +1,58 @@
+"""
+Scheduler - 데몬 모드용 실행 주기 관리
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+
+def next_interval_run(now: datetime, minutes: int) -> datetime:
+    """정각 기준으로 정렬된 다음 실행 시각 (예: 30분 → :00, :30)"""
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    elapsed = (now - midnight).total_seconds()
+    step = minutes * 60
+    return midnight + timedelta(seconds=(elapsed // step + 1) * step)
+
+
+def next_daily_run(now: datetime, hour: int) -> datetime:
+    """다음 hour시 정각 (UTC)"""
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return target
+
+
+class CadenceScheduler:
+    """realtime / batch / daily 주기를 한 프로세스에서 관리
+    
+    같은 시각에 여러 작업이 도래하면 due()가 함께 돌려주므로
+    호출 측에서 수집/분석을 한 번만 수행할 수 있다.
+    """
+    
+    def __init__(self, intervals: Dict[str, int], daily_hour: Optional[int] = None):
+        self.intervals = intervals
+        self.daily_hour = daily_hour
+        now = datetime.now(timezone.utc)
+        self.next_runs: Dict[str, datetime] = {}
+        for name in intervals:
+            self._schedule(name, now)
+        if daily_hour is not None:
+            self._schedule("daily", now)
+    
+    def _schedule(self, name: str, now: datetime):
+        if name == "daily":
+            self.next_runs[name] = next_daily_run(now, self.daily_hour)
+        else:
+            self.next_runs[name] = next_interval_run(now, self.intervals[name])
+    
+    def due(self, now: Optional[datetime] = None) -> List[str]:
+        now = now or datetime.now(timezone.utc)
+        return [name for name, at in self.next_runs.items() if at <= now]
+    
+    def advance(self, names: List[str], now: Optional[datetime] = None):
+        now = now or datetime.now(timezone.utc)
+        for name in names:
+            self._schedule(name, now)
+    
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        return max(0.0, (min(self.next_runs.values()) - now).total_seconds())
@@ -0,0 +1,143 @@
+"""
+State Store - 이미 본 뉴스 ID 저장소 (JSON / SQLite)
+"""
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, List
+
+from config import CACHE_HOURS, STATE_BACKEND
+
+
+class StateStore(ABC):
+    """seen 상태 저장소 인터페이스 (구현하지 않은 메서드가 있으면 생성 시점에 TypeError)"""
+    
+    @abstractmethod
+    def contains(self, news_id: str) -> bool:
+        ...
+    
+    @abstractmethod
+    def mark_seen(self, news_ids: Iterable[str]):
+        ...
+    
+    @abstractmethod
+    def all_ids(self) -> List[str]:
+        ...
+    
+    def checkpoint(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def _cutoff(self) -> str:
+        return (datetime.now(timezone.utc) - timedelta(hours=CACHE_HOURS)).isoformat()
+
+
+class JsonStateStore(StateStore):
+    """기존 seen_news.json 방식 (매 저장마다 전체 파일 재작성)"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.seen_ids = self._load()
+        self.lock = threading.Lock()
+    
+    def _load(self) -> dict:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+    
+    def contains(self, news_id: str) -> bool:
+        return news_id in self.seen_ids
+    
+    def mark_seen(self, news_ids: Iterable[str]):
+        now = datetime.now(timezone.utc).isoformat()
+        cutoff = self._cutoff()
+        with self.lock:
+            for news_id in news_ids:
+                self.seen_ids[news_id] = {'seen_at': now}
+            self.seen_ids = {
+                k: v for k, v in self.seen_ids.items()
+                if v.get('seen_at', '') > cutoff
+            }
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.seen_ids, f, ensure_ascii=False, indent=2)
+    
+    def all_ids(self) -> List[str]:
+        return list(self.seen_ids)
+
+
+class SqliteStateStore(StateStore):
+    """WAL 모드 SQLite 저장소 (seen_at 인덱스로 만료 정리)"""
+    
+    def __init__(self, path: Path, legacy_json: Path = None):
+        self.path = path
+        is_new = not path.exists()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY, seen_at TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_at ON seen (seen_at)")
+        self.conn.commit()
+        
+        # 기존 seen_news.json이 있으면 처음 한 번만 가져옴
+        if is_new and legacy_json is not None and legacy_json.exists():
+            self._import_json(legacy_json)
+    
+    def _import_json(self, legacy_json: Path):
+        try:
+            with open(legacy_json, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except:
+            return
+        
+        rows = [(k, v.get('seen_at', '')) for k, v in legacy.items() if isinstance(v, dict)]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO seen (id, seen_at) VALUES (?, ?)", rows)
+        print(f"📦 seen_news.json에서 {len(rows)}개 ID 이전")
+    
+    def contains(self, news_id: str) -> bool:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM seen WHERE id = ? AND seen_at > ?",
+                (news_id, self._cutoff())
+            ).fetchone()
+        return row is not None
+    
+    def mark_seen(self, news_ids: Iterable[str]):
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(news_id, now) for news_id in news_ids]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO seen (id, seen_at) VALUES (?, ?)", rows)
+            self.conn.execute("DELETE FROM seen WHERE seen_at <= ?", (self._cutoff(),))
+    
+    def all_ids(self) -> List[str]:
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT id FROM seen")]
+    
+    def checkpoint(self):
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    
+    def close(self):
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+
+
+def create_state_store(cache_dir: Path) -> StateStore:
+    """STATE_BACKEND 설정에 맞는 저장소 생성"""
+    json_path = cache_dir / "seen_news.json"
+    if STATE_BACKEND == "sqlite":
+        return SqliteStateStore(cache_dir / "state.db", legacy_json=json_path)
+    return JsonStateStore(json_path)
@@ -1,16 +1,17 @@
 """
 Telegram Bot - 텔레그램으로 뉴스 전송
 """
-import requests
 from typing import List, Optional
 from datetime import datetime
 
-from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, Priority
+from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_API_BASE, Priority
 from ai_analyzer import AnalyzedNews
+from http_client import get_session
+from delivery_queue import DeliveryQueue, SENT, QUEUED
 
 
 class TelegramBot:
-    def __init__(self):
+    def __init__(self, cache_dir: str = "data", freshness=None):
         if not TELEGRAM_BOT_TOKEN:
             raise ValueError("TELEGRAM_BOT_TOKEN이 설정되지 않았습니다")
         if not TELEGRAM_CHAT_ID:
@@ -18,7 +19,25 @@ class TelegramBot:
         
         self.token = TELEGRAM_BOT_TOKEN
         self.chat_id = TELEGRAM_CHAT_ID
-        self.base_url = f"https://api.telegram.org/bot{self.token}"
+        self.base_url = f"{TELEGRAM_API_BASE}/bot{self.token}"
+        self.session = get_session()
+        self.queue = DeliveryQueue(self.session, f"{self.base_url}/sendMessage", cache_dir=cache_dir)
+        
+        # 전송 시각은 outbox에 들어간 시점이 아니라 실제로 나간 시점으로 기록
+        self.freshness = freshness
+        self.queue.on_sent = self._record_delivery
+        
+        # 새 알림이 없는 실행에서도 지난 실행의 outbox부터 비움
+        self.flush_outbox()
+    
+    def _record_delivery(self, message: dict):
+        if self.freshness is not None and message.get("news_ids"):
+            self.freshness.delivered(message["news_ids"], message.get("mode") or "unknown")
+    
+    def flush_outbox(self):
+        """outbox에 남은 메시지 전송 (시작 시, 데몬은 매 주기마다)"""
+        if self.queue.pending:
+            self.queue.flush()
     
     def _get_priority_emoji(self, priority: Priority) -> str:
         """우선순위별 이모지"""
@@ -34,17 +53,27 @@ class TelegramBot:
         empty = "○" * (10 - score)
         return f"{filled}{empty}"
     
+    def _format_source(self, news: AnalyzedNews) -> str:
+        """출처 표시 (같은 기사를 보도한 다른 소스 포함)"""
+        source = news.news_item.source_name
+        others = news.news_item.also_reported_by
+        if others:
+            source += f" 외 {len(others)}곳"
+        return source
+    
     def _format_single_news(self, news: AnalyzedNews) -> str:
         """단일 뉴스 포맷팅"""
         emoji = self._get_priority_emoji(news.priority)
         bar = self._get_importance_bar(news.importance_score)
+        others = news.news_item.also_reported_by
+        also = f"\n📎 함께 보도: {', '.join(others)}" if others else ""
         
         message = f"""{emoji} <b>{news.korean_title}</b>
 
 {news.korean_summary}
 
 ⭐ 중요도: {news.importance_score}/10 [{bar}]
-📌 출처: {news.news_item.source_name}
+📌 출처: {news.news_item.source_name}{also}
 🔗 <a href="{news.news_item.link}">원문 보기</a>"""
         
         return message
@@ -63,16 +92,20 @@ class TelegramBot:
             item = f"""
 {i}. {emoji} <b>{news.korean_title}</b>
    {news.korean_summary[:100]}...
-   ⭐ {news.importance_score}/10 | 📌 {news.news_item.source_name}
+   ⭐ {news.importance_score}/10 | 📌 {self._format_source(news)}
    🔗 <a href="{news.news_item.link}">원문</a>"""
             items.append(item)
         
         return header + "\n".join(items)
     
-    def send_message(self, text: str, disable_preview: bool = True) -> bool:
-        """메시지 전송"""
-        url = f"{self.base_url}/sendMessage"
-        
+    def send_message(
+        self,
+        text: str,
+        disable_preview: bool = True,
+        news_ids: Optional[List[str]] = None,
+        mode: Optional[str] = None
+    ) -> bool:
+        """메시지 전송 (재시도 한도를 넘기면 outbox에 보관 후 다음 실행에서 전송)"""
         payload = {
             "chat_id": self.chat_id,
             "text": text,
@@ -80,30 +113,21 @@ class TelegramBot:
             "disable_web_page_preview": disable_preview
         }
         
-        try:
-            response = requests.post(url, json=payload, timeout=30)
-            result = response.json()
-            
-            if result.get("ok"):
-                print("✅ 메시지 전송 성공")
-                return True
-            else:
-                print(f"❌ 전송 실패: {result.get('description')}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ 전송 오류: {e}")
-            return False
+        status = self.queue.submit(payload, news_ids=news_ids, mode=mode)
+        
+        # outbox에 보관된 메시지는 반드시 전송되므로 성공으로 취급 (중복 알림 방지)
+        return status in (SENT, QUEUED)
     
     def send_single_news(self, news: AnalyzedNews) -> bool:
         """단일 뉴스 전송 (실시간용)"""
         message = self._format_single_news(news)
-        return self.send_message(message)
+        return self.send_message(message, news_ids=[news.news_item.id], mode="realtime")
     
     def send_batch_news(
         self, 
         news_list: List[AnalyzedNews], 
-        batch_type: str = "6시간 요약"
+        batch_type: str = "6시간 요약",
+        mode: str = "batch"
     ) -> bool:
         """배치 뉴스 전송"""
         if not news_list:
@@ -118,7 +142,7 @@ class TelegramBot:
             title = f"{batch_type} ({i+1}/{len(chunks)})" if len(chunks) > 1 else batch_type
             message = self._format_batch_news(chunk, title)
             
-            if not self.send_message(message):
+            if not self.send_message(message, news_ids=[n.news_item.id for n in chunk], mode=mode):
                 success = False
         
         return success
@@ -143,7 +167,7 @@ class TelegramBot:
         url = f"{self.base_url}/getMe"
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             result = response.json()
             
             if result.get("ok"):
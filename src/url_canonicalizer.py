@@ -0,0 +1,109 @@
+"""
+URL Canonicalizer - 같은 기사의 여러 URL 변형을 하나로 정규화
+"""
+import re
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 추적용 쿼리 파라미터 (접두사 매칭은 끝에 *)
+TRACKING_PARAMS = [
+    "utm_*", "ref", "ref_src", "ref_url", "referrer", "source", "src",
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "_hsenc", "_hsmi", "mkt_tok", "cmpid", "sr_share", "share", "smid",
+    "rss", "feed", "at_medium", "at_campaign", "guccounter",
+]
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    for pattern in TRACKING_PARAMS:
+        if pattern.endswith("*"):
+            if name.startswith(pattern[:-1]):
+                return True
+        elif name == pattern:
+            return True
+    return False
+
+
+def _reddit(host: str, path: str, query: List[Tuple[str, str]]):
+    # old.reddit.com, np.reddit.com 등 → reddit.com, 댓글 링크의 슬러그 제거
+    match = re.match(r"(/r/[^/]+/comments/[^/]+)", path)
+    if match:
+        path = match.group(1)
+    return "reddit.com", path, []
+
+
+def _arxiv(host: str, path: str, query: List[Tuple[str, str]]):
+    # /abs/2401.01234v2, /pdf/2401.01234v2.pdf, export.arxiv.org → /abs/2401.01234
+    match = re.match(r"/(?:abs|pdf|html)/(.+?)(?:v\d+)?(?:\.pdf)?$", path)
+    if match:
+        path = f"/abs/{match.group(1)}"
+    return "arxiv.org", path, []
+
+
+def _youtube(host: str, path: str, query: List[Tuple[str, str]]):
+    # youtu.be/ID, youtube.com/shorts/ID, watch?v=ID&feature=... → youtube.com/watch?v=ID
+    video_id = None
+    if host == "youtu.be":
+        video_id = path.strip("/")
+    elif path.startswith("/shorts/"):
+        video_id = path.split("/")[2]
+    else:
+        video_id = dict(query).get("v")
+    if video_id:
+        return "youtube.com", "/watch", [("v", video_id)]
+    return "youtube.com", path, query
+
+
+def _hacker_news(host: str, path: str, query: List[Tuple[str, str]]):
+    return "news.ycombinator.com", path, [(k, v) for k, v in query if k == "id"]
+
+
+# 호스트(서브도메인 포함) → 규칙
+HOST_RULES: Dict[str, Callable] = {
+    "reddit.com": _reddit,
+    "arxiv.org": _arxiv,
+    "youtube.com": _youtube,
+    "youtu.be": _youtube,
+    "news.ycombinator.com": _hacker_news,
+}
+
+
+def _find_host_rule(host: str):
+    for domain, rule in HOST_RULES.items():
+        if host == domain or host.endswith("." + domain):
+            return rule
+    return None
+
+
+def canonicalize_url(url: str) -> str:
+    """ID 생성과 seen 조회에 쓰는 정규화 URL"""
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+    
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    ]
+    
+    rule = _find_host_rule(host)
+    if rule:
+        host, path, query = rule(host, path, query)
+    
+    if len(path) > 1:
+        path = path.rstrip("/")
+    
+    # http/https 차이와 fragment는 무시
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
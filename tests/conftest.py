@@ -0,0 +1,68 @@
+"""
+테스트 공통 설정 - src/ 모듈 경로와 가짜 비밀 값 (config는 import 시점에 환경 변수를 읽음)
+"""
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+os.environ["GEMINI_API_KEY"] = "test-gemini-key"
+os.environ["TELEGRAM_BOT_TOKEN"] = "123456:test-bot-token"
+os.environ["TELEGRAM_CHAT_ID"] = "1"
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """빈 data/ 디렉토리가 있는 임시 작업 디렉토리"""
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def telegram_stub(monkeypatch):
+    """보낸 메시지를 세는 로컬 텔레그램 Bot API (benchmarks/stub_servers.py)"""
+    import telegram_bot
+    from stub_servers import TelegramStub
+    
+    stub = TelegramStub(latency_ms=0).start()
+    monkeypatch.setattr(telegram_bot, "TELEGRAM_API_BASE", stub.base_url)
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def gemini_stub(monkeypatch):
+    """id별로 결정적인 점수를 돌려주는 로컬 Gemini generateContent"""
+    import ai_analyzer
+    from stub_servers import GeminiStub
+    
+    stub = GeminiStub(latency_ms=0).start()
+    monkeypatch.setattr(ai_analyzer, "GEMINI_API_BASE", stub.base_url)
+    yield stub
+    stub.stop()
+
+
+def make_news(news_id: str, source_trust: int = 5, title: str = "", summary: str = ""):
+    """테스트용 NewsItem"""
+    from news_collector import NewsItem
+    
+    now = datetime.now(timezone.utc)
+    return NewsItem(
+        id=news_id,
+        title=title or f"OpenAI releases a new model {news_id}",
+        link=f"https://example.com/{news_id}",
+        summary=summary or f"OpenAI released a new model today with better reasoning ({news_id}).",
+        source_name=f"Source {source_trust}",
+        source_trust=source_trust,
+        category="official",
+        published=now.isoformat(),
+        published_dt=now,
+        collected_at=now.isoformat(),
+    )
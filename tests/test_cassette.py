@@ -0,0 +1,74 @@
+"""
+Cassette - 기록한 카세트에 API 키/봇 토큰이 남지 않는지, 재생이 대기 없이 끝나는지 확인
+"""
+import base64
+import gzip
+import json
+import socket
+import time
+
+import pytest
+import requests
+
+from cassette import Cassette
+from config import GEMINI_API_KEY, TELEGRAM_BOT_TOKEN
+from http_client import get_session
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_recorded_connection_error_is_redacted(workdir):
+    port = _closed_port()
+    urls = [
+        f"http://127.0.0.1:{port}/v1beta/models/gemini-2.5-flash:generateContent?key={GEMINI_API_KEY}",
+        f"http://127.0.0.1:{port}/bot{TELEGRAM_BOT_TOKEN}/sendMessage",
+    ]
+    
+    with Cassette("data/cassette.json.gz", "record", "realtime") as cassette:
+        for url in urls:
+            with pytest.raises(requests.ConnectionError):
+                get_session().post(url, json={"text": "hi"}, timeout=1)
+    
+    errors = [record["error"] for record in cassette.interactions]
+    assert [e["type"] for e in errors] == ["ConnectionError", "ConnectionError"]
+    
+    with gzip.open(workdir / "data" / "cassette.json.gz", "rt", encoding="utf-8") as f:
+        raw = f.read()
+    assert str(port) in raw
+    assert GEMINI_API_KEY not in raw
+    assert TELEGRAM_BOT_TOKEN not in raw
+    assert "<redacted>" in raw
+
+
+def _record(url: str, status: int, body: dict) -> dict:
+    return {
+        "method": "POST", "url": url, "body_sha1": "", "request_body": None,
+        "status": status, "reason": "", "headers": {"Content-Type": "application/json"},
+        "body": base64.b64encode(json.dumps(body).encode()).decode("ascii"),
+    }
+
+
+def test_replay_skips_flood_wait_and_rate_limits(workdir):
+    from datetime import datetime, timezone
+    from cassette import _normalize_url
+    from delivery_queue import DeliveryQueue, SENT
+    
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    flood = {"ok": False, "description": "Too Many Requests", "parameters": {"retry_after": 60}}
+    with gzip.open(workdir / "data" / "cassette.json.gz", "wt", encoding="utf-8") as f:
+        json.dump({
+            "version": 1, "mode": "realtime", "recorded_at": datetime.now(timezone.utc).isoformat(), "state": {},
+            "interactions": [_record(_normalize_url(url), 429, flood)] + [_record(_normalize_url(url), 200, {"ok": True})] * 3,
+        }, f)
+    
+    started = time.monotonic()
+    with Cassette(str(workdir / "data" / "cassette.json.gz"), "replay", "realtime"):
+        queue = DeliveryQueue(get_session(), url, cache_dir="data")
+        assert [queue.submit({"chat_id": "1", "text": str(i)}) for i in range(3)] == [SENT] * 3
+    
+    # 60초 flood wait와 채팅별 전송 간격을 실제로 기다리지 않음
+    assert time.monotonic() - started < 5
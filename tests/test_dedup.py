@@ -0,0 +1,136 @@
+"""
+Near-Duplicate Detector - 여러 소스의 같은 발표를 묶고, 이전 실행 사본은 처리된 경우에만 제외하는지 확인
+"""
+from datetime import datetime, timedelta, timezone
+
+from conftest import make_news
+from dedup import NearDuplicateIndex, cluster_near_duplicates, title_signature
+from news_collector import NewsCollector
+
+BLOG_SUMMARY = (
+    "Today we're releasing Gemma 3, a collection of lightweight open models built from the same research "
+    "and technology that powers Gemini 2.0, designed to run fast directly on devices."
+)
+
+
+def _copies():
+    """같은 출시 소식의 블로그/HN/Reddit 2개/TechCrunch 사본 (요약이 모두 다름)"""
+    copies = [
+        ("blog", 10, "Introducing Gemma 3: the most capable model you can run on a single GPU", BLOG_SUMMARY),
+        ("hn", 7, "Introducing Gemma 3: The most capable model you can run on a single GPU",
+         "Article URL: https://blog.google/gemma-3 Comments URL: https://news.ycombinator.com/item?id=1 Points: 412"),
+        ("reddit-ml", 6, "[N] Google releases Gemma 3, the most capable model you can run on a single GPU",
+         "submitted by /u/someone [link] [comments]"),
+        ("reddit-local", 5, "Google just released Gemma 3 - most capable model that runs on a single GPU",
+         "submitted by /u/other [link] [comments]"),
+        ("techcrunch", 8, "Google launches Gemma 3, its most capable open model that runs on a single GPU - TechCrunch",
+         "Google on Wednesday released Gemma 3, the successor to its open-weight models, claiming it beats larger rivals."),
+    ]
+    items = []
+    for source, trust, title, summary in copies:
+        item = make_news(source, source_trust=trust, title=title, summary=summary)
+        item.source_name = source
+        items.append(item)
+    return items
+
+
+def test_multi_source_copies_cluster_to_highest_trust(workdir):
+    index = NearDuplicateIndex(cache_dir="data")
+    index.start_run()
+    unrelated = make_news("other", title="Meta releases Llama 3.2 vision models for edge devices")
+    
+    kept = cluster_near_duplicates(_copies() + [unrelated], index)
+    
+    assert [item.id for item in kept] == ["blog", "other"]
+    assert sorted(kept[0].also_reported_by) == ["hn", "reddit-local", "reddit-ml", "techcrunch"]
+
+
+def test_unhandled_previous_copy_does_not_suppress(workdir):
+    index = NearDuplicateIndex(cache_dir="data")
+    copies = _copies()
+    high, low = copies[0], copies[3]
+    
+    # 이전 실행: 낮은 신뢰도 사본만 수집, 사전 선별로 분석되지 않음
+    index.start_run()
+    cluster_near_duplicates([low], index)
+    index.start_run()
+    
+    stages = {low.id: "seen"}
+    kept = cluster_near_duplicates([high], index, stage_of=stages.get)
+    assert [item.id for item in kept] == [high.id]
+    assert low.id not in index.entries
+
+
+def test_analyzed_previous_copy_suppresses_lower_trust_only(workdir):
+    index = NearDuplicateIndex(cache_dir="data")
+    copies = {item.id: item for item in _copies()}
+    
+    index.start_run()
+    cluster_near_duplicates([copies["hn"]], index)
+    index.start_run()
+    
+    stages = {"hn": "analyzed"}
+    assert cluster_near_duplicates([copies["reddit-ml"]], index, stage_of=stages.get) == []
+    assert [i.id for i in cluster_near_duplicates([copies["blog"]], index, stage_of=stages.get)] == ["blog"]
+    
+    # 이미 전송된 기사는 신뢰도와 관계없이 다시 보내지 않음
+    index.start_run()
+    stages = {"blog": "delivered"}
+    assert cluster_near_duplicates([copies["techcrunch"]], index, stage_of=stages.get) == []
+
+
+def test_start_run_prunes_expired_entries(workdir):
+    index = NearDuplicateIndex(cache_dir="data")
+    index.start_run()
+    cluster_near_duplicates(_copies()[:1], index)
+    index.entries["blog"]["seen_at"] = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    
+    index.start_run()
+    
+    assert index.entries == {}
+    assert not any(index.buckets.values())
+
+
+def test_different_stories_with_similar_titles_stay_apart(workdir):
+    index = NearDuplicateIndex(cache_dir="data")
+    index.start_run()
+    titles = [
+        "Google releases Gemini 3 Pro",
+        "Google delays Gemini 3 Pro",
+        "Meta releases Llama 4 Scout",
+        "Meta releases Llama 4 Maverick",
+        "OpenAI releases GPT-5 for ChatGPT users",
+        "OpenAI releases GPT-4.5 for ChatGPT users",
+    ]
+    items = [make_news(f"story-{i}", title=title, summary=f"{title}. Details follow.") for i, title in enumerate(titles)]
+    
+    assert len(cluster_near_duplicates(items, index)) == len(titles)
+
+
+def test_common_title_words_do_not_widen_lookups(workdir):
+    index = NearDuplicateIndex(cache_dir="data")
+    index.start_run()
+    items = [
+        make_news(f"common-{i}", title=f"OpenAI Google model agent topic{i} detail{i}", summary=f"body {i}")
+        for i in range(1000)
+    ]
+    cluster_near_duplicates(items, index)
+    
+    tokens, _ = title_signature("OpenAI Google model agent topic5 other")
+    assert len(index._title_candidates(tokens)) <= 1
+
+
+def test_dropped_copies_are_marked_seen(workdir, monkeypatch):
+    copies = {item.id: item for item in _copies()}
+    collector = NewsCollector(cache_dir="data")
+    
+    def collect(items):
+        monkeypatch.setattr(collector, "_iter_source_results", lambda sources: iter([(0, items)]))
+        return collector.collect_all(sources=[None])
+    
+    assert [item.id for item in collect([copies["blog"]])] == ["blog"]
+    collector.freshness.delivered(["blog"], mode="realtime")
+    
+    assert collect([copies["hn"], copies["reddit-ml"]]) == []
+    assert collector.state.contains("hn") and collector.state.contains("reddit-ml")
+    collector.close()
@@ -0,0 +1,45 @@
+"""
+Delivery Queue - outbox에 남은 메시지가 다음 실행에서 전송되는지 확인
+"""
+import json
+import time
+
+import main
+import news_collector
+
+
+def test_outbox_is_drained_on_run_without_new_items(workdir, telegram_stub, monkeypatch):
+    outbox = workdir / "data" / "outbox.json"
+    outbox.write_text(json.dumps([
+        {"id": "queued-alert", "payload": {"chat_id": "1", "text": "지난 실행의 알림"}, "attempts": 3},
+    ]), encoding="utf-8")
+    monkeypatch.setattr(news_collector, "NEWS_SOURCES", [])
+    
+    main.run_realtime()
+    
+    assert telegram_stub.messages == 1
+    assert json.loads(outbox.read_text(encoding="utf-8")) == []
+
+
+def test_long_flood_wait_is_persisted_and_honored(workdir, monkeypatch):
+    from delivery_queue import DeliveryQueue, QUEUED
+    
+    calls = []
+    
+    def flooded(self, payload):
+        calls.append(payload)
+        return "retry", 3600.0, "Too Many Requests: retry after 3600"
+    
+    monkeypatch.setattr(DeliveryQueue, "_post_once", flooded)
+    queue = DeliveryQueue(session=None, url="http://telegram.invalid", cache_dir="data")
+    
+    assert queue.submit({"chat_id": "1", "text": "첫 알림"}) == QUEUED
+    assert queue.submit({"chat_id": "1", "text": "둘째 알림"}) == QUEUED
+    assert len(calls) == 1
+    
+    # 다음 실행도 not_before 전에는 다시 보내지 않음
+    outbox = json.loads((workdir / "data" / "outbox.json").read_text(encoding="utf-8"))
+    assert len(outbox) == 2
+    assert outbox[0]["not_before"] > time.time() + 3000
+    DeliveryQueue(session=None, url="http://telegram.invalid", cache_dir="data").flush()
+    assert len(calls) == 1
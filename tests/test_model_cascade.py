@@ -0,0 +1,66 @@
+"""
+Model Cascade - 점수만 평가된 뉴스가 요약 없이 일일/배치 요약으로 전송되지 않는지 확인
+"""
+import ai_analyzer
+import main
+from ai_analyzer import AIAnalyzer
+from conftest import make_news
+
+
+class RecordingBot:
+    """send_batch_news로 받은 뉴스만 기록"""
+    
+    def __init__(self):
+        self.sent = []
+    
+    def send_batch_news(self, news_list, title, mode="batch"):
+        self.sent.extend(news_list)
+    
+    def send_message(self, text, **kwargs):
+        return True
+
+
+class SeenCollector:
+    def mark_multiple_as_seen(self, ids):
+        pass
+
+
+def test_daily_digest_sends_full_analysis_only(workdir, gemini_stub, monkeypatch):
+    # 모든 뉴스가 기준 미달 → 점수 전용 단계에서 끝남
+    monkeypatch.setattr(ai_analyzer, "MODEL_CASCADE", True)
+    monkeypatch.setattr(ai_analyzer, "CASCADE_MIN_SCORE", 99)
+    analyzer = AIAnalyzer(cache_dir="data", mode="daily")
+    news = [make_news(f"cascade-{i}") for i in range(6)]
+    
+    analyzed = analyzer.analyze_batch(news)
+    assert all(a.reason == "점수만 평가 (요약 생략)" for a in analyzed)
+    
+    bot = RecordingBot()
+    main.deliver_daily(SeenCollector(), analyzer, bot, analyzed)
+    
+    assert len(bot.sent) == len(news)
+    for result in bot.sent:
+        assert result.reason == "벤치마크"
+        assert result.korean_title.startswith("합성 제목")
+    assert not analyzer.score_only
+
+
+def test_cascade_pools_contenders_before_full_calls(workdir, gemini_stub, monkeypatch):
+    monkeypatch.setattr(ai_analyzer, "MODEL_CASCADE", True)
+    monkeypatch.setattr(ai_analyzer, "ANALYSIS_BATCH_SIZE", 8)
+    monkeypatch.setattr(ai_analyzer, "CASCADE_SCORE_BATCH_SIZE", 40)
+    monkeypatch.setattr(ai_analyzer, "GEMINI_REQUESTS_PER_MINUTE", 10_000)
+    monkeypatch.setattr(ai_analyzer, "GEMINI_SCORE_REQUESTS_PER_MINUTE", 10_000)
+    analyzer = AIAnalyzer(cache_dir="data", mode="batch")
+    news = [make_news(f"pool-{i}") for i in range(48)]
+    
+    analyzer.analyze_batch(news)
+    
+    contenders = len(news) - len(analyzer.score_only)
+    assert analyzer.stats["score_calls"] == 2
+    assert analyzer.stats["full_calls"] == -(-contenders // 8) <= 6
+    assert gemini_stub.requests == analyzer.stats["score_calls"] + analyzer.stats["full_calls"]
+    
+    # 점수 전용 모델 호출은 전체 분석 모델의 일일 한도/호출 예산에 잡히지 않음
+    assert analyzer.budget.daily_calls() == analyzer.stats["full_calls"]
+    assert analyzer.budget.daily_calls("score") == 2
@@ -0,0 +1,92 @@
+"""
+News Collector - 느린 소비자 때문에 받은 피드를 버리거나, 넘기지 못한 피드의 검증자를 저장하지 않는지 확인
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import news_collector
+from config import NewsSource
+from news_collector import NewsCollector
+from run_benchmark import make_sources
+from stub_servers import FeedServer
+
+
+@pytest.fixture
+def feeds():
+    server = FeedServer(items_per_feed=1, latency_ms=10, jitter_ms=0).start()
+    yield server
+    server.stop()
+
+
+def test_slow_consumer_does_not_drop_finished_feeds(workdir, feeds, monkeypatch):
+    monkeypatch.setattr(news_collector, "COLLECTION_DEADLINE", 0.5)
+    sources = make_sources(feeds, 20, hosts=1)
+    collector = NewsCollector(cache_dir="data")
+    
+    streamed = []
+    for item in collector.collect_stream(sources):
+        streamed.append(item)
+        time.sleep(0.1)
+    
+    assert collector.missed_sources == []
+    assert len({item.source_name for item in streamed}) == 20
+    assert len(collector.feed_cache) == 20
+
+
+def test_validators_saved_only_for_yielded_feeds(workdir, feeds):
+    sources = make_sources(feeds, 20, hosts=1)
+    collector = NewsCollector(cache_dir="data")
+    
+    # 5개만 받고 중단 (분석 단계 오류 등)
+    stream = collector.collect_stream(sources)
+    taken = [next(stream) for _ in range(5)]
+    stream.close()
+    
+    # 넘기지 못한 피드는 다음 실행에 304/변경 없음으로 건너뛰지 않음 (데몬처럼 같은 인스턴스로)
+    time.sleep(0.5)
+    rest = collector.collect_all(sources)
+    assert {item.id for item in taken} | {item.id for item in rest} == {
+        item.id for item in NewsCollector(cache_dir="fresh").collect_all(sources)
+    }
+
+
+class _DripHandler(BaseHTTPRequestHandler):
+    """헤더는 바로 보내고 본문은 0.1초마다 1바이트씩 흘려보냄 (읽기 타임아웃에는 걸리지 않음)"""
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        try:
+            for _ in range(1000):
+                self.wfile.write(b" ")
+                self.wfile.flush()
+                time.sleep(0.1)
+        except OSError:
+            pass
+    
+    def log_message(self, *args):
+        pass
+
+
+def test_slow_drip_body_is_cut_at_fetch_deadline(workdir, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DripHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(news_collector, "FEED_FETCH_DEADLINE", 0.5)
+    source = NewsSource(
+        name="Drip", url=f"http://127.0.0.1:{server.server_address[1]}/feed.xml",
+        source_type="rss", base_trust=5, category="media",
+    )
+    
+    try:
+        started = time.monotonic()
+        assert NewsCollector(cache_dir="data").collect_from_source(source) == []
+        assert time.monotonic() - started < 3
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,123 @@
+"""
+Streaming Pipeline - 단계 하나가 실패해도 멈추지 않고, 전송 실패한 알림은 seen 처리하지 않으며, 예산 초과로 이월된 뉴스는 다음 실행에서 분석되는지 확인
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ai_analyzer
+import news_collector
+import pipeline
+from ai_analyzer import AIAnalyzer, AnalyzedNews
+from config import Priority
+from news_collector import NewsCollector
+from run_benchmark import make_sources
+from stub_servers import FeedServer
+
+
+class FailingBot:
+    def send_single_news(self, analyzed):
+        return False
+
+
+class SendingBot:
+    def send_single_news(self, analyzed):
+        return True
+
+
+@pytest.fixture
+def collector(workdir, monkeypatch):
+    server = FeedServer(items_per_feed=10, latency_ms=0, jitter_ms=0).start()
+    monkeypatch.setattr(news_collector, "NEWS_SOURCES", make_sources(server, 10, hosts=1))
+    monkeypatch.setattr(news_collector, "NEAR_DUPLICATE_DETECTION", False)
+    monkeypatch.setattr(pipeline, "PIPELINE_QUEUE_SIZE", 2)
+    yield NewsCollector(cache_dir="data")
+    server.stop()
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    analyzer = AIAnalyzer(cache_dir="data", mode="realtime")
+    monkeypatch.setattr(analyzer, "should_analyze", lambda news: True)
+    return analyzer
+
+
+def _run(collector, analyzer, bot):
+    """제한 시간 안에 끝나지 않으면 실패 (큐에서 영원히 막히는 경우)"""
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.setdefault("remaining", pipeline.run_streaming_realtime(collector, analyzer, bot)),
+        daemon=True
+    )
+    thread.start()
+    thread.join(timeout=20)
+    assert not thread.is_alive(), "pipeline blocked"
+    return result["remaining"]
+
+
+class BrokenExecutor(ThreadPoolExecutor):
+    def submit(self, *args, **kwargs):
+        raise RuntimeError("analysis stage down")
+
+
+def test_analyze_stage_failure_does_not_block_collection(collector, analyzer, monkeypatch):
+    monkeypatch.setattr(pipeline, "ThreadPoolExecutor", BrokenExecutor)
+    
+    assert _run(collector, analyzer, FailingBot()) == []
+
+
+def test_failed_realtime_alert_is_not_marked_seen(collector, analyzer, monkeypatch):
+    def realtime(chunk):
+        return [AnalyzedNews(news, news.title, news.summary, 9, Priority.REALTIME, "테스트") for news in chunk]
+    monkeypatch.setattr(analyzer, "analyze_chunk", realtime)
+    
+    remaining = _run(collector, analyzer, FailingBot())
+    
+    assert remaining == []
+    assert collector.freshness.records
+    assert not any(collector.state.contains(news_id) for news_id in collector.freshness.records)
+
+
+def test_streaming_applies_budget_and_carries_over(collector, analyzer, gemini_stub, monkeypatch):
+    monkeypatch.setattr(ai_analyzer, "ANALYSIS_TIME_BUDGET", 0)
+    monkeypatch.setattr(ai_analyzer, "ANALYSIS_CALL_BUDGET", 1)
+    
+    _run(collector, analyzer, SendingBot())
+    
+    assert analyzer.deferred
+    
+    # 이월된 뉴스는 다음 스트리밍 수집에서 먼저 나옴 (피드는 변경 없음)
+    deferred_ids = [news.id for news in analyzer.deferred]
+    streamed = [news.id for news in NewsCollector(cache_dir="data").collect_stream()]
+    assert streamed == deferred_ids
+
+
+def test_streaming_deferred_news_is_analyzed_next_run(gemini_stub, collector, analyzer, monkeypatch):
+    monkeypatch.setattr(ai_analyzer, "ANALYSIS_TIME_BUDGET", 0)
+    monkeypatch.setattr(ai_analyzer, "ANALYSIS_CALL_BUDGET", 1)
+    _run(collector, analyzer, SendingBot())
+    
+    deferred_ids = {news.id for news in analyzer.deferred}
+    assert deferred_ids
+    assert not any(collector.state.contains(news_id) for news_id in deferred_ids)
+    
+    # 다음 실행은 예산이 남아 이월된 뉴스까지 분석하고 seen 처리
+    monkeypatch.setattr(ai_analyzer, "ANALYSIS_CALL_BUDGET", 0)
+    next_collector = NewsCollector(cache_dir="data")
+    next_analyzer = AIAnalyzer(cache_dir="data", mode="realtime")
+    monkeypatch.setattr(next_analyzer, "should_analyze", lambda news: True)
+    analyzed = []
+    analyze_chunk = next_analyzer.analyze_chunk
+    
+    def tracking(chunk):
+        results = analyze_chunk(chunk)
+        analyzed.extend(result.news_item.id for result in results)
+        return results
+    monkeypatch.setattr(next_analyzer, "analyze_chunk", tracking)
+    
+    _run(next_collector, next_analyzer, SendingBot())
+    
+    assert deferred_ids <= set(analyzed)
+    assert next_analyzer.deferred == []
+    assert all(next_collector.state.contains(news_id) for news_id in deferred_ids)
@@ -0,0 +1,43 @@
+"""
+Quota Budget - 예약분은 실시간 알림 후보의 호출에만 쓰이는지 확인 (개별 재분석/번역 경로 포함)
+"""
+import pytest
+
+import quota_budget
+from ai_analyzer import AIAnalyzer
+from conftest import make_news
+
+
+@pytest.fixture
+def analyzer(workdir, gemini_stub, monkeypatch):
+    # 일일 10회 중 20% 예약 → 8회부터는 고신뢰 소스만 호출 가능
+    monkeypatch.setattr(quota_budget, "GEMINI_DAILY_CALL_CAP", 10)
+    monkeypatch.setattr(quota_budget, "GEMINI_WEEKLY_CALL_CAP", 0)
+    monkeypatch.setattr(quota_budget, "GEMINI_DAILY_TOKEN_CAP", 0)
+    monkeypatch.setattr(quota_budget, "QUOTA_REALTIME_RESERVE", 0.2)
+    
+    analyzer = AIAnalyzer(cache_dir="data", mode="batch")
+    day = analyzer.budget._today().strftime("%Y-%m-%d")
+    analyzer.budget.usage = {day: {"batch": {"calls": 8, "prompt_tokens": 0, "output_tokens": 0, "tokens": 0}}}
+    return analyzer
+
+
+def test_single_and_translate_paths_do_not_use_reserve(analyzer, gemini_stub):
+    low = make_news("low-trust", source_trust=5)
+    
+    single = analyzer.analyze_single(low)
+    fallback = analyzer._create_fallback(low)
+    title, summary = analyzer._translate_to_korean(low.title, low.summary, low.id)
+    
+    assert gemini_stub.requests == 0
+    assert single.reason == fallback.reason == "로컬 추정 (할당량 절약)"
+    assert (title, summary) == (low.title[:50], low.summary[:200])
+
+
+def test_realtime_candidates_can_use_reserve(analyzer, gemini_stub):
+    high = make_news("high-trust", source_trust=10)
+    
+    result = analyzer.analyze_single(high)
+    
+    assert gemini_stub.requests == 1
+    assert result.reason == "벤치마크"
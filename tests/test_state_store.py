@@ -0,0 +1,25 @@
+"""
+State Store - 백엔드 인터페이스와 JSON/SQLite 저장소 동작 확인
+"""
+import pytest
+
+from state_store import JsonStateStore, SqliteStateStore, StateStore
+
+
+def test_incomplete_backend_fails_at_creation():
+    class Partial(StateStore):
+        def contains(self, news_id):
+            return False
+    
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.parametrize("backend", [JsonStateStore, SqliteStateStore])
+def test_backends_remember_seen_ids(workdir, backend):
+    store = backend(workdir / "data" / "seen")
+    store.mark_seen(["a", "b"])
+    
+    assert store.contains("a") and not store.contains("c")
+    assert sorted(store.all_ids()) == ["a", "b"]
+    store.close()